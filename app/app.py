@@ -3,13 +3,16 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from config import Config
 from blueprints.web import web_bp
 from blueprints.api import api_bp
-from core.logic import MarketingLogic
+from core.services import init_services
 
 def create_app():
     """Flask 애플리케이션 생성"""
     app = Flask(__name__)
     app.config.from_object(Config)
     
+    # 공유 서비스 (LLM, 벡터 저장소, DB 접근자 등) 초기화
+    services = init_services(app)
+    
     # Blueprint 등록
     app.register_blueprint(web_bp)
     app.register_blueprint(api_bp)
@@ -20,7 +23,7 @@ def create_app():
     def weekly_trend_update():
         """매주 월요일 실행되는 트렌드 업데이트 작업"""
         print("🔄 주간 트렌드 업데이트 시작...")
-        logic = MarketingLogic()
+        logic = services.logic
         
         # TODO: 실제 Google Search API 호출 및 데이터 수집
         # 현재는 더미 데이터로 테스트
@@ -42,6 +45,8 @@ def create_app():
     )
     
     scheduler.start()
+    services.register('scheduler', lambda r: scheduler, close=lambda s: s.shutdown(wait=False))
+    services.get('scheduler')
     print(f"⏰ 스케줄러 시작: 매주 {Config.TREND_UPDATE_DAY}요일 {Config.TREND_UPDATE_HOUR}시에 트렌드 업데이트")
     
     return app
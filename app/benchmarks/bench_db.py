@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+SQLite 연결 벤치마크 (호출마다 새 연결 vs 스레드별 연결 재사용 + PRAGMA 튜닝)
+
+임시 디렉토리에 스키마만 같은 문구 DB를 만들고 MarketingLogic의 아카이브 경로를 그대로 실행해
+- 쓰기: add_marketing_copy 반복 (문구마다 커밋) / add_marketing_copies (한 트랜잭션)
+- 읽기: get_team_style (아카이브 조회) 여러 스레드 동시 실행
+의 초당 처리량을 비교합니다. legacy는 변경 전 db.py와 같이 호출마다 sqlite3.connect만 하는 방식입니다.
+
+사용법:
+    python benchmarks/bench_db.py
+    python benchmarks/bench_db.py --rows 5000 --reads 2000 --threads 8
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+from config import Config
+from core.logic import MarketingLogic
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAMS = [1, 2, 3, 4]
+
+
+def legacy_connect(path):
+    """변경 전 연결 방식 (호출마다 새 연결, PRAGMA 없음, transaction() 중첩 수만 추적)"""
+    conn = sqlite3.connect(path, factory=db.Connection)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def make_copies(count):
+    return [{
+        'team_id': TEAMS[i % len(TEAMS)],
+        'channel': 'APP_PUSH' if i % 2 else 'RCS',
+        'content_data': f'{{"title": "제목 {i}", "message": "롯데ON 할인 쿠폰 {i}"}}',
+        'keywords': f'쿠폰 {i % 50}',
+        'target_audience': '전체',
+        'ctr': (i % 100) / 1000,
+        'conversion_rate': (i % 37) / 1000
+    } for i in range(count)]
+
+
+def prepare(workdir, name):
+    path = os.path.join(workdir, f'{name}.db')
+    conn = sqlite3.connect(path)
+    with open(os.path.join(APP_DIR, 'schema', 'phrases.sql'), 'r', encoding='utf-8') as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def timed(label, count, func):
+    started = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - started
+    print(f"   {label:<42} {count / seconds:>10.0f} ops/s ({seconds:.2f}s)")
+    return count / seconds
+
+
+def run(mode, workdir, args):
+    """mode: legacy | pooled → {시나리오: ops/s}"""
+    original = db._pooled
+    if mode == 'legacy':
+        db._pooled = legacy_connect
+    Config.DB_PHRASES_PATH = prepare(workdir, mode)
+    logic = MarketingLogic(llm=object(), vector_store=object())  # DB 경로만 사용
+    copies = make_copies(args.rows)
+    results = {}
+    try:
+        print(f"\n🗄️ {mode}")
+        results['insert'] = timed('add_marketing_copy × rows (문구마다 커밋)', args.rows,
+                                  lambda: [logic.add_marketing_copy(copy) for copy in copies])
+        if mode == 'pooled':
+            # 읽기 측정 데이터 양이 같도록 별도 DB에 추가
+            Config.DB_PHRASES_PATH, read_path = prepare(workdir, 'bulk'), Config.DB_PHRASES_PATH
+            results['bulk_insert'] = timed('add_marketing_copies (한 트랜잭션)', args.rows,
+                                           lambda: logic.add_marketing_copies(copies))
+            Config.DB_PHRASES_PATH = read_path
+
+        sorts = ['conversion_rate', 'ctr', 'latest']
+
+        def read(i):
+            return logic.get_team_style(TEAMS[i % len(TEAMS)], sorts[i % len(sorts)], 50,
+                                        'RCS' if i % 3 == 0 else None)
+
+        def read_all():
+            with ThreadPoolExecutor(max_workers=args.threads) as executor:
+                list(executor.map(read, range(args.reads)))
+
+        results['read'] = timed(f'get_team_style × reads ({args.threads}스레드)', args.reads, read_all)
+    finally:
+        db._pooled = original
+        db.close_connections()
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='SQLite 연결 재사용/PRAGMA 튜닝 벤치마크')
+    arg_parser.add_argument('--rows', type=int, default=2000, help='추가할 문구 수')
+    arg_parser.add_argument('--reads', type=int, default=2000, help='아카이브 조회 횟수')
+    arg_parser.add_argument('--threads', type=int, default=4, help='동시 조회 스레드 수')
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_db_')
+    try:
+        legacy = run('legacy', workdir, args)
+        pooled = run('pooled', workdir, args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n🏁 쓰기 {pooled['insert'] / legacy['insert']:.1f}배 "
+          f"(한 트랜잭션 {pooled['bulk_insert'] / legacy['insert']:.1f}배), "
+          f"읽기 {pooled['read'] / legacy['read']:.1f}배")
+    print(f"📊 연결 통계: {db.connection_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+임베딩 엔진 처리량 벤치마크 (엔진 / 추론 스레드 수 / 배치 크기 조합)
+
+같은 텍스트 목록을 조합마다 새로 만든 엔진으로 임베딩해
+- 처리량 (texts/sec)
+- 배치 지연 시간 p50/p95 (ms)
+- 모델 로드 시간
+을 비교합니다. 캐시를 거치지 않고 엔진을 직접 호출하므로 동기화 시 임베딩 CPU 비용을 조정할 때 사용합니다.
+
+사용법:
+    python benchmarks/bench_embedding.py                                   # DB 문구 텍스트, 현재 설정 엔진
+    python benchmarks/bench_embedding.py --engines onnx chroma --threads 1 2 4 --batch-sizes 16 32 64
+    python benchmarks/bench_embedding.py --model /models/ko-sroberta-onnx --synthetic 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.embedding import ENGINES, default_model
+
+SAMPLE_WORDS = ['롯데ON', '신규고객', '30%', '할인', '쿠폰', '블랙프라이데이', '세일', '무료배송', '20대', '전체',
+                '주말', '한정', '특가', '적립', '앱 전용', '첫 구매', '혜택', '이벤트', '오늘만', '회원']
+
+
+def load_texts(synthetic, seed):
+    """DB 문구의 유사도 계산용 텍스트 (벡터 저장소와 같은 형식) 또는 무작위 한국어 마케팅 문구"""
+    if synthetic:
+        import random
+
+        rng = random.Random(seed)
+        return [" ".join(rng.choices(SAMPLE_WORDS, k=rng.randint(2, 12))) for _ in range(synthetic)]
+
+    from core.vector_store import VectorStore, PHRASE_COLUMNS
+    from db import get_phrases_db
+
+    conn = get_phrases_db()
+    try:
+        rows = conn.execute(f"""
+            SELECT {PHRASE_COLUMNS}
+            FROM marketing_copies m
+            WHERE m.content_data IS NOT NULL
+        """).fetchall()
+    finally:
+        conn.close()
+    texts = [VectorStore._phrase_text(VectorStore._row_to_phrase(row)) for row in rows]
+    return [text for text in texts if text]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='임베딩 엔진 처리량 벤치마크')
+    arg_parser.add_argument('--engines', nargs='+', default=[Config.EMBEDDING_ENGINE], choices=list(ENGINES))
+    arg_parser.add_argument('--model', default=Config.EMBEDDING_MODEL, help='모델 이름/경로 (비우면 엔진 기본 모델)')
+    arg_parser.add_argument('--threads', nargs='+', type=int, default=[Config.EMBEDDING_THREADS],
+                            help='추론 스레드 수 목록 (0이면 라이브러리 기본값)')
+    arg_parser.add_argument('--batch-sizes', nargs='+', type=int, default=[Config.EMBEDDING_BATCH_SIZE])
+    arg_parser.add_argument('--limit', type=int, default=2000, help='최대 텍스트 수')
+    arg_parser.add_argument('--synthetic', type=int, default=0, help='무작위 문구 개수 (0이면 DB 문구 사용)')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    texts = load_texts(args.synthetic, args.seed)[:args.limit]
+    if not texts:
+        print("❌ 벤치마크할 문구가 없습니다. --synthetic N 옵션을 사용하세요.")
+        return 1
+    print(f"🔍 텍스트 {len(texts)}개 (평균 {sum(map(len, texts)) / len(texts):.0f}자)\n")
+
+    print(f"   {'엔진':<22} {'스레드':>6} {'배치':>5} {'로드':>8} {'texts/sec':>10} {'p50':>10} {'p95':>10}")
+    for name in args.engines:
+        for threads in args.threads:
+            for batch_size in args.batch_sizes:
+                # 프로세스 공유 엔진(get_embedding_engine)이 아닌 새 인스턴스로 측정
+                engine = ENGINES[name](args.model or default_model(name), threads=threads, batch_size=batch_size,
+                                       max_length=Config.EMBEDDING_MAX_LENGTH)
+                try:
+                    engine.load()
+                    engine(texts[:batch_size])  # 워밍업
+                except Exception as e:
+                    print(f"   {name:<22} ❌ 로드 실패: {e}")
+                    break
+                engine.reset_stats()
+
+                started = time.perf_counter()
+                engine(texts)
+                wall = time.perf_counter() - started
+                stats = engine.stats()
+                print(f"   {name:<22} {threads or '기본':>6} {batch_size:>5} {stats['load_seconds']:>7.2f}s "
+                      f"{len(texts) / wall:>10.1f} {stats['batch_latency_ms']['p50']:>7.2f} ms "
+                      f"{stats['batch_latency_ms']['p95']:>7.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
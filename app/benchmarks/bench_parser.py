@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+LLM 출력 파서 정확도 검증 + 성능 벤치마크
+
+코퍼스: parser_corpus/{app_push|rcs}_*.txt (LLM 원본 출력) + 같은 이름의 .json (기대 결과)
+- 전체 파싱 / 청크 단위 스트리밍 파싱 결과가 모두 기대 결과와 같은지 확인
+- 문서당 파싱 시간과 처리량(MB/s) 측정
+
+사용법:
+    python benchmarks/bench_parser.py                  # 검증 + 벤치마크
+    python benchmarks/bench_parser.py --update         # 현재 파서 결과로 .json 갱신 (새 코퍼스 추가 시)
+    python benchmarks/bench_parser.py --corpus DIR     # PARSER_CORPUS_CAPTURE_DIR로 수집한 출력 사용
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parser import CopyParser, parse_copies
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_corpus')
+CHUNK_SIZES = [1, 7, 64]
+
+
+def load_corpus(corpus_dir):
+    """코퍼스 파일 로드 (파일명 접두어로 채널 결정)"""
+    corpus = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if not name.endswith('.txt'):
+            continue
+        channel = 'RCS' if name.lower().startswith('rcs') else 'APP_PUSH'
+        path = os.path.join(corpus_dir, name)
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        corpus.append((name, channel, text, path[:-4] + '.json'))
+    return corpus
+
+
+def parse_streaming(text, channel, chunk_size):
+    parser = CopyParser(channel)
+    copies = []
+    for i in range(0, len(text), chunk_size):
+        copies.extend(parser.feed(text[i:i + chunk_size]))
+    copies.extend(parser.close())
+    return copies
+
+
+def verify(corpus, update=False):
+    """기대 결과와 비교 (실패 개수 반환)"""
+    failures = 0
+    for name, channel, text, expected_path in corpus:
+        copies = parse_copies(text, channel)
+
+        if update or not os.path.exists(expected_path):
+            with open(expected_path, 'w', encoding='utf-8') as f:
+                json.dump(copies, f, ensure_ascii=False, indent=2)
+                f.write('\n')
+            print(f"📝 {name}: 기대 결과 저장 ({len(copies)}개 문구)")
+            continue
+
+        with open(expected_path, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+
+        results = {'full': copies}
+        for chunk_size in CHUNK_SIZES:
+            results[f'chunk={chunk_size}'] = parse_streaming(text, channel, chunk_size)
+
+        mismatched = [mode for mode, result in results.items() if result != expected]
+        if mismatched:
+            failures += 1
+            print(f"❌ {name}: 불일치 ({', '.join(mismatched)})")
+        else:
+            print(f"✅ {name}: {len(expected)}개 문구")
+    return failures
+
+
+def benchmark(corpus, iterations):
+    """전체 / 스트리밍 파싱 성능 측정"""
+    total_bytes = sum(len(text.encode('utf-8')) for _, _, text, _ in corpus)
+
+    for mode, func in [
+        ('full', lambda text, channel: parse_copies(text, channel)),
+        ('stream(16)', lambda text, channel: parse_streaming(text, channel, 16)),
+    ]:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for _, channel, text, _ in corpus:
+                func(text, channel)
+        elapsed = time.perf_counter() - started
+
+        docs = iterations * len(corpus)
+        print(f"⏱️ {mode:<11} {elapsed / docs * 1e6:8.1f} µs/doc, "
+              f"{total_bytes * iterations / elapsed / 1e6:6.2f} MB/s ({docs}회)")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='LLM 출력 파서 검증 및 벤치마크')
+    arg_parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='코퍼스 디렉토리')
+    arg_parser.add_argument('--iterations', type=int, default=2000, help='벤치마크 반복 횟수')
+    arg_parser.add_argument('--update', action='store_true', help='기대 결과(.json) 갱신')
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ 코퍼스가 비어 있습니다: {args.corpus}")
+        return 1
+
+    print(f"🔍 파서 검증 ({len(corpus)}개 문서)")
+    failures = verify(corpus, update=args.update)
+
+    print(f"\n🏁 파서 벤치마크")
+    benchmark(corpus, args.iterations)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+벡터 양자화 벤치마크 (float32 정확 검색 vs float16 / int8 저장)
+
+같은 벡터/메타데이터로 정밀도별 NumPy 백엔드를 만들고, 같은 필터 조건의 쿼리를 실행해
+- 벡터 색인 메모리 (bytes, 문구당 bytes)
+- 쿼리 지연 시간 p50/p95 (ms)
+- recall@k (float32 정확 검색 top-k 대비)
+를 비교합니다. 양자화 방식마다 float32 재계산(rescore, 상위 k × factor개 후보) 결과도 함께 출력합니다.
+
+사용법:
+    python benchmarks/bench_quantization.py                    # DB의 문구(marketing_copies)를 임베딩해서 사용
+    python benchmarks/bench_quantization.py --synthetic 50000  # 무작위 벡터 5만 개 (임베딩 모델 불필요)
+    python benchmarks/bench_quantization.py --k 5 --rescore-factor 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vector_backends import build, load_database, load_synthetic, make_filters
+from core.vector_backends import NumpyBackend
+
+
+def run_queries(backend, queries, filters, k, exact_vectors=None, rescore_factor=1):
+    """
+    쿼리 실행 → (지연 시간 배열, 쿼리별 id 목록)
+
+    exact_vectors가 있으면 k × rescore_factor개를 가져와 float32 벡터로 다시 정렬 (VectorStore._query_backend와 같은 방식)
+    """
+    latencies, results = [], []
+    for query, where in zip(queries, filters):
+        started = time.perf_counter()
+        if exact_vectors is None:
+            hits = backend.query(query, k, **where)
+            ids = [hit['id'] for hit in hits]
+        else:
+            hits = backend.query(query, k * rescore_factor, **where)
+            normalized = query / (np.linalg.norm(query) or 1.0)
+            scores = [float(exact_vectors[hit['id']] @ normalized) for hit in hits]
+            ids = [hits[i]['id'] for i in np.argsort(scores)[::-1][:k]]
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append(ids)
+    return np.asarray(latencies), results
+
+
+def recall(results, baseline):
+    values = [len(set(found) & set(exact)) / len(exact) for found, exact in zip(results, baseline) if exact]
+    return float(np.mean(values)) if values else 0.0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='벡터 양자화(float16 / int8) 메모리·지연·recall 벤치마크')
+    arg_parser.add_argument('--synthetic', type=int, default=0, help='무작위 벡터 개수 (0이면 DB 문구 사용)')
+    arg_parser.add_argument('--dim', type=int, default=384, help='무작위 벡터 차원')
+    arg_parser.add_argument('--queries', type=int, default=200, help='쿼리 수')
+    arg_parser.add_argument('--k', type=int, default=10, help='쿼리당 결과 수 (recall@k)')
+    arg_parser.add_argument('--rescore-factor', type=int, default=4, help='재계산할 후보 배수 (VECTOR_RESCORE_FACTOR)')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    if args.synthetic:
+        ids, vectors, documents, metadatas, queries = load_synthetic(args.synthetic, args.dim, args.seed)
+    else:
+        ids, vectors, documents, metadatas, queries = load_database(args.seed)
+    if not ids:
+        print("❌ 벤치마크할 문구가 없습니다. --synthetic N 옵션을 사용하세요.")
+        return 1
+
+    rng = np.random.default_rng(args.seed)
+    queries = np.asarray(queries, dtype=np.float32)[rng.integers(len(queries), size=args.queries)]
+    filters = make_filters(args.queries, args.seed)
+    exact_vectors = dict(zip(ids, NumpyBackend._normalize(vectors)))
+    print(f"🔍 벡터 {len(ids)}개, 쿼리 {args.queries}개, k={args.k}, rescore ×{args.rescore_factor}\n")
+
+    print(f"   {'정밀도':<16} {'메모리':>12} {'문구당':>9} {'적재':>8} {'p50':>9} {'p95':>9} {'recall@k':>9}")
+    baseline = None
+    for quantization in ('float32', 'float16', 'int8'):
+        backend = NumpyBackend(quantization=quantization)
+        build_seconds = build(backend, ids, vectors, documents, metadatas)
+        stats = backend.stats()
+
+        variants = [(quantization, None)]
+        if quantization != 'float32':
+            variants.append((f"{quantization}+rescore", exact_vectors))
+        for label, rescore_vectors in variants:
+            run_queries(backend, queries[:10], filters[:10], args.k, rescore_vectors, args.rescore_factor)  # 워밍업
+            latencies, results = run_queries(backend, queries, filters, args.k, rescore_vectors, args.rescore_factor)
+            if baseline is None:
+                baseline = results
+            print(f"   {label:<16} {stats['memory_bytes']:>12,} {stats['memory_bytes'] / len(ids):>9.0f} "
+                  f"{build_seconds:>7.2f}s {np.percentile(latencies, 50):>6.2f} ms {np.percentile(latencies, 95):>6.2f} ms "
+                  f"{recall(results, baseline) * 100:>8.1f}%")
+        backend.close()
+
+    print("\n💡 메모리는 파티션 용량(2배씩 증가) 기준, 재계산 지연 시간에는 임베딩 캐시 조회 시간이 포함되지 않습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
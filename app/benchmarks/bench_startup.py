@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+앱 시작 시간 벤치마크 (python -X importtime + create_app 소요 시간)
+
+새 인터프리터에서 `from app import create_app; create_app()`를 반복 실행해
+- import 단계 / create_app 단계 소요 시간 (중앙값, ms)
+- -X importtime 기준 import 시간이 큰 최상위 패키지 (하위 모듈 self 시간 합계)
+를 출력합니다. --output을 주면 실행 결과를 JSON Lines로 누적 기록해 변경 전후를 비교할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_startup.py                    # 지연 로딩 (기본 설정)
+    python benchmarks/bench_startup.py --eager            # SERVICES_EAGER=true (모든 서비스 즉시 생성)
+    python benchmarks/bench_startup.py --repeat 10 --top 20 --output startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 워밍업 스레드는 측정 대상이 아니므로 끄고, 측정 결과는 마지막 줄에 JSON으로 출력
+PROBE = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'create_app_ms': (created - imported) * 1000}))
+"""
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → {최상위 패키지: ms} (모듈별 self 시간을 최상위 패키지 단위로 합산)"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        root = name.strip().split('.')[0]
+        packages[root] = packages.get(root, 0.0) + int(self_us) / 1000
+    return packages
+
+
+def run_once(eager):
+    env = dict(os.environ)
+    env['SERVICES_EAGER'] = 'true' if eager else 'false'
+    env['SERVICES_WARMUP'] = 'false'
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process_ms'] = wall_ms
+    return timings, parse_importtime(result.stderr)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='앱 시작 시간 벤치마크')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (중앙값 사용)')
+    arg_parser.add_argument('--top', type=int, default=15, help='출력할 최상위 패키지 수')
+    arg_parser.add_argument('--eager', action='store_true', help='SERVICES_EAGER=true로 측정')
+    arg_parser.add_argument('--output', help='결과를 누적 기록할 JSON Lines 파일')
+    args = arg_parser.parse_args()
+
+    runs, packages = [], {}
+    for i in range(args.repeat):
+        try:
+            timings, packages = run_once(args.eager)
+        except RuntimeError as e:
+            print(f"❌ create_app 실행 실패:\n{e}")
+            return 1
+        runs.append(timings)
+        print(f"⏱️ #{i + 1}: import {timings['import_ms']:7.1f} ms, create_app {timings['create_app_ms']:7.1f} ms, "
+              f"프로세스 {timings['process_ms']:7.1f} ms")
+
+    summary = {key: round(statistics.median(run[key] for run in runs), 1)
+               for key in ('import_ms', 'create_app_ms', 'process_ms')}
+    mode = 'eager' if args.eager else 'lazy'
+    print(f"\n🏁 {mode} 중앙값: import {summary['import_ms']} ms, create_app {summary['create_app_ms']} ms, "
+          f"프로세스 {summary['process_ms']} ms")
+
+    print(f"\n📦 import 시간 상위 {args.top}개 패키지 (마지막 실행)")
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    for name, ms in top:
+        print(f"   {name:<28} {ms:8.1f} ms")
+
+    if args.output:
+        record = dict(summary, mode=mode, repeat=args.repeat, timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                      packages={name: round(ms, 1) for name, ms in top})
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"\n💾 결과 기록: {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
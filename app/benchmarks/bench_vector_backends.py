@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+벡터 백엔드 비교 벤치마크 (ChromaDB vs NumPy 파티션 색인)
+
+같은 벡터/메타데이터로 두 백엔드를 임시 디렉토리에 만들고, 같은 필터 조건의 쿼리를 실행해
+- 쿼리 지연 시간 p50/p95 (ms)
+- 적재 시간
+- top-k 결과 겹침 비율 (Chroma HNSW 근사 검색 vs NumPy 정확 검색)
+을 비교합니다.
+
+사용법:
+    python benchmarks/bench_vector_backends.py                    # DB의 문구를 임베딩해서 사용
+    python benchmarks/bench_vector_backends.py --synthetic 20000  # 무작위 벡터 2만 개 (임베딩 모델 불필요)
+    python benchmarks/bench_vector_backends.py --queries 500 --k 10
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vector_backends import ChromaBackend, NumpyBackend
+
+TEAMS = [1, 2, 3, 4]
+CHANNELS = ['APP_PUSH', 'RCS']
+
+
+def load_synthetic(count, dim, seed):
+    """무작위 벡터 + 팀/채널/성과 메타데이터"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    ids, documents, metadatas = [], [], []
+    for i in range(count):
+        ids.append(f"phrase_{i}")
+        documents.append(f"문구 {i}")
+        metadatas.append({
+            'team_id': TEAMS[i % len(TEAMS)],
+            'channel': CHANNELS[(i // len(TEAMS)) % len(CHANNELS)],
+            'ctr': float(rng.uniform(0, 0.1)),
+            'conversion_rate': float(rng.uniform(0, 0.05))
+        })
+    queries = rng.standard_normal((count, dim)).astype(np.float32)
+    return ids, vectors.tolist(), documents, metadatas, queries
+
+
+def load_database(seed):
+    """DB의 성과 문구를 벡터 저장소와 같은 방식으로 임베딩"""
+    from core.vector_store import VectorStore, SYNC_COLUMNS
+
+    store = VectorStore()
+    try:
+        conn = store._open_sync_db()
+        try:
+            rows = conn.execute(f"""
+                SELECT {SYNC_COLUMNS}
+                FROM marketing_copies m
+                WHERE m.content_data IS NOT NULL
+                ORDER BY m.copy_id
+            """).fetchall()
+        finally:
+            conn.close()
+        phrases = [store._row_to_phrase(row) for row in rows]
+        phrases = [phrase for phrase in phrases if store._phrase_text(phrase)]
+        texts = [store._phrase_text(phrase) for phrase in phrases]
+        metadatas = [store._phrase_metadata(phrase) for phrase in phrases]
+        vectors = store.embed_texts(texts)
+    finally:
+        store.close()
+
+    ids = [f"phrase_{phrase.get('copy_id')}" for phrase in phrases]
+    # 쿼리는 저장된 벡터에 약간의 잡음을 섞어 사용
+    rng = np.random.default_rng(seed)
+    base = np.asarray(vectors, dtype=np.float32)
+    queries = base + rng.normal(0, 0.05, base.shape).astype(np.float32)
+    return ids, vectors, texts, metadatas, queries
+
+
+def build(backend, ids, vectors, documents, metadatas, batch_size=1000):
+    started = time.perf_counter()
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        backend.upsert(ids[start:end], vectors[start:end], documents[start:end], metadatas[start:end])
+    backend.flush()
+    return time.perf_counter() - started
+
+
+def make_filters(count, seed):
+    """쿼리별 필터 조합 (필터 없음 / 팀 / 팀+채널 / 팀+채널+최소 CTR)"""
+    rng = np.random.default_rng(seed)
+    filters = []
+    for i in range(count):
+        team = TEAMS[int(rng.integers(len(TEAMS)))]
+        channel = CHANNELS[int(rng.integers(len(CHANNELS)))]
+        filters.append([
+            {},
+            {'team_id': team},
+            {'team_id': team, 'channel': channel},
+            {'team_id': team, 'channel': channel, 'min_ctr': 0.03},
+        ][i % 4])
+    return filters
+
+
+def run_queries(backend, queries, filters, k):
+    latencies, results = [], []
+    for query, where in zip(queries, filters):
+        started = time.perf_counter()
+        hits = backend.query(query.tolist(), k, **where)
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append([hit['id'] for hit in hits])
+    return np.asarray(latencies), results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='ChromaDB / NumPy 벡터 백엔드 벤치마크')
+    arg_parser.add_argument('--synthetic', type=int, default=0, help='무작위 벡터 개수 (0이면 DB 문구 사용)')
+    arg_parser.add_argument('--dim', type=int, default=384, help='무작위 벡터 차원')
+    arg_parser.add_argument('--queries', type=int, default=200, help='쿼리 수')
+    arg_parser.add_argument('--k', type=int, default=10, help='쿼리당 결과 수')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    if args.synthetic:
+        ids, vectors, documents, metadatas, queries = load_synthetic(args.synthetic, args.dim, args.seed)
+    else:
+        ids, vectors, documents, metadatas, queries = load_database(args.seed)
+    if not ids:
+        print("❌ 벤치마크할 문구가 없습니다. --synthetic N 옵션을 사용하세요.")
+        return 1
+
+    rng = np.random.default_rng(args.seed)
+    queries = queries[rng.integers(len(queries), size=args.queries)]
+    filters = make_filters(args.queries, args.seed)
+    print(f"🔍 벡터 {len(ids)}개, 쿼리 {args.queries}개, k={args.k}\n")
+
+    workdir = tempfile.mkdtemp(prefix='bench_vector_')
+    try:
+        backends = [
+            ChromaBackend(os.path.join(workdir, 'chroma')),
+            NumpyBackend(os.path.join(workdir, 'numpy')),
+        ]
+        results = {}
+        for backend in backends:
+            build_seconds = build(backend, ids, vectors, documents, metadatas)
+            run_queries(backend, queries[:10], filters[:10], args.k)  # 워밍업
+            latencies, results[backend.name] = run_queries(backend, queries, filters, args.k)
+            print(f"⏱️ {backend.name:<7} 적재 {build_seconds:7.2f}s, "
+                  f"쿼리 p50 {np.percentile(latencies, 50):7.2f} ms, p95 {np.percentile(latencies, 95):7.2f} ms")
+            backend.close()
+
+        # NumPy(정확 검색) 기준 Chroma top-k 겹침 비율
+        overlaps = [
+            len(set(chroma) & set(exact)) / len(exact)
+            for chroma, exact in zip(results['chroma'], results['numpy']) if exact
+        ]
+        if overlaps:
+            print(f"\n🎯 top-{args.k} 겹침 (chroma ∩ numpy / numpy): {np.mean(overlaps) * 100:.1f}%")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,17 +1,19 @@
-from flask import Blueprint, request, jsonify
-from core.logic import MarketingLogic
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from core.services import get_services
+from core.rate_limit import gemini_rate_limiter
+from config import Config
 from db import get_phrases_db
 import json
-import pandas as pd
 import io
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
-logic = MarketingLogic()
 
 @api_bp.route('/generate', methods=['POST'])
 def generate_copy():
     """마케팅 문구 생성 API"""
     try:
+        logic = get_services().logic
+        
         data = request.get_json()
         
         # 필수 파라미터 검증
@@ -39,7 +41,124 @@ def generate_copy():
             'success': True,
             'copies': copies,
             'count': len(copies),
-            'referenced_phrases': referenced_phrases
+            'referenced_phrases': referenced_phrases,
+            'cached': result.get('cached', False) if isinstance(result, dict) else False,
+            'cache_type': result.get('cache_type') if isinstance(result, dict) else None,
+            'prompt_stats': result.get('prompt_stats') if isinstance(result, dict) else None,
+            'retrieval_stats': result.get('retrieval_stats') if isinstance(result, dict) else None
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/generate/stream', methods=['POST'])
+def generate_copy_stream():
+    """마케팅 문구 스트리밍 생성 API (Server-Sent Events)"""
+    logic = get_services().logic
+    
+    data = request.get_json()
+    
+    # 필수 파라미터 검증
+    if not data or not data.get('topic'):
+        return jsonify({'error': '주제(topic)는 필수입니다'}), 400
+    
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    
+    def events():
+        copies = []
+        try:
+            for event, payload in logic.generate_marketing_copy_stream(data):
+                if event == 'copy':
+                    copies.append(payload['copy'])
+                yield sse(event, payload)
+            
+            # 생성된 문구 DB 저장 (선택사항)
+            team_id = data.get('team_id')
+            if team_id:
+                for copy in copies:
+                    logic.save_generated_copy(team_id, copy, data)
+        except Exception as e:
+            yield sse('error', {'error': str(e)})
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api_bp.route('/generate/batch', methods=['POST'])
+def generate_copy_batch():
+    """여러 브리프 일괄 생성 API (wait=true면 완료 후 응답, 아니면 job_id 반환)"""
+    try:
+        batch_jobs = get_services().batch_jobs
+        
+        data = request.get_json() or {}
+        briefs = data.get('briefs')
+        
+        # 필수 파라미터 검증
+        if not isinstance(briefs, list) or not briefs:
+            return jsonify({'error': 'briefs는 비어 있지 않은 배열이어야 합니다'}), 400
+        if len(briefs) > Config.BATCH_MAX_BRIEFS:
+            return jsonify({'error': f'한 번에 최대 {Config.BATCH_MAX_BRIEFS}개 브리프만 처리할 수 있습니다'}), 400
+        if not all(isinstance(brief, dict) for brief in briefs):
+            return jsonify({'error': '각 브리프는 객체 형태여야 합니다'}), 400
+        
+        concurrency = data.get('concurrency')
+        wait = str(data.get('wait', 'false')).lower() == 'true'
+        
+        if wait:
+            job = batch_jobs.run(batch_jobs.create(briefs, concurrency))
+            return jsonify(dict(job.to_dict(), success=True))
+        
+        job = batch_jobs.submit(briefs, concurrency)
+        return jsonify({
+            'success': True,
+            'job_id': job.job_id,
+            'status': job.status,
+            'total': len(briefs)
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/generate/batch/<job_id>', methods=['GET'])
+def get_batch_job(job_id):
+    """배치 생성 작업 상태 및 (부분) 결과 조회"""
+    batch_jobs = get_services().batch_jobs
+    
+    job = batch_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '존재하지 않는 작업입니다'}), 404
+    
+    return jsonify(dict(job.to_dict(), success=True, rate_limiter=gemini_rate_limiter.stats()))
+
+@api_bp.route('/llm-health', methods=['GET'])
+def get_llm_health():
+    """LLM 클라이언트 상태 조회 (서킷 브레이커, 지연 시간, 재시도/헤지 통계, 프롬프트 크기)"""
+    try:
+        services = get_services()
+        return jsonify({
+            'success': True,
+            'llm': services.llm.health(),
+            'rate_limiter': gemini_rate_limiter.stats(),
+            'prompt_stats': services.logic.prompt_builder.stats()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """생성 캐시 통계 정보 조회"""
+    try:
+        logic = get_services().logic
+        
+        return jsonify({
+            'success': True,
+            'stats': logic.generation_cache.stats(),
+            'semantic_stats': logic.semantic_cache.stats(),
+            'coalescing_stats': logic.flights.stats()
         })
     
     except Exception as e:
@@ -49,6 +168,8 @@ def generate_copy():
 def get_trends():
     """최신 트렌드 조회 API"""
     try:
+        logic = get_services().logic
+        
         limit = request.args.get('limit', 10, type=int)
         trends = logic.get_recent_trends(limit)
         
@@ -64,6 +185,8 @@ def get_trends():
 def get_archive():
     """문구 아카이브 조회 API"""
     try:
+        logic = get_services().logic
+        
         team_id = request.args.get('team_id')
         sort_by = request.args.get('sort_by', 'conversion_rate')
         limit = request.args.get('limit', 50, type=int)
@@ -85,7 +208,12 @@ def get_archive():
 @api_bp.route('/upload-csv', methods=['POST'])
 def upload_csv():
     """CSV 파일 업로드 및 데이터베이스 저장"""
+    # pandas는 import 비용이 커서 CSV 업로드 때만 로드 (앱 시작 시간에 포함되지 않도록)
+    import pandas as pd
+    
     try:
+        logic = get_services().logic
+        
         if 'file' not in request.files:
             return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
         
@@ -123,8 +251,8 @@ def upload_csv():
                     '명품잡화팀': 14, '브랜드패션팀': 15, 'B2B팀': 16, '디지털가전팀': 17
                 }
                 
-                # 데이터 변환 및 저장
-                success_count = 0
+                # 데이터 변환 후 한 트랜잭션으로 저장
+                copies = []
                 error_count = 0
                 
                 for _, row in df.iterrows():
@@ -149,16 +277,15 @@ def upload_csv():
                             'trend_keywords': None,
                             'is_ai_generated': bool(row.get('is_ai_generated', False)),
                         }
-                        
-                        if logic.add_marketing_copy(copy_data):
-                            success_count += 1
-                        else:
-                            error_count += 1
+                        copies.append(copy_data)
                             
                     except Exception as e:
                         error_count += 1
                         continue
                 
+                success_count, insert_errors = logic.add_marketing_copies(copies)
+                error_count += insert_errors
+                
                 return jsonify({
                     'success': True,
                     'count': success_count,
@@ -199,8 +326,8 @@ def upload_csv():
             '디지털가전팀': 17
         }
         
-        # 데이터 변환 및 저장
-        success_count = 0
+        # 데이터 변환 후 한 트랜잭션으로 저장
+        copies = []
         error_count = 0
         
         for _, row in df.iterrows():
@@ -280,16 +407,16 @@ def upload_csv():
                     'is_ai_generated': False,
                 }
                 
-                # 데이터베이스에 저장
-                if logic.add_marketing_copy(copy_data):
-                    success_count += 1
-                else:
-                    error_count += 1
+                copies.append(copy_data)
                     
             except Exception as e:
                 error_count += 1
                 continue
         
+        # 데이터베이스에 저장 (문구마다 커밋하지 않고 한 번에)
+        success_count, insert_errors = logic.add_marketing_copies(copies)
+        error_count += insert_errors
+        
         return jsonify({
             'success': True,
             'count': success_count,
@@ -302,21 +429,24 @@ def upload_csv():
 
 @api_bp.route('/sync-vector-store', methods=['POST'])
 def sync_vector_store():
-    """벡터 저장소를 DB와 동기화"""
+    """벡터 저장소를 DB와 동기화 (기본 증분, full=true면 전체 재구축)"""
     try:
-        from core.logic import MarketingLogic
-        logic = MarketingLogic()
+        vector_store = get_services().vector_store
+        
+        data = request.get_json(silent=True) or {}
+        full = str(data.get('full', request.args.get('full', 'false'))).lower() == 'true'
         
         # 벡터 저장소 동기화
-        logic.vector_store.sync_from_database()
+        sync_result = vector_store.sync_from_database(full=full)
         
         # 통계 정보 반환
-        stats = logic.vector_store.get_collection_stats()
+        stats = vector_store.get_collection_stats()
         
         return jsonify({
             'success': True,
             'message': '벡터 저장소 동기화가 완료되었습니다.',
-            'stats': stats
+            'stats': stats,
+            'sync': sync_result
         })
     
     except Exception as e:
@@ -324,16 +454,13 @@ def sync_vector_store():
 
 @api_bp.route('/vector-store-stats', methods=['GET'])
 def get_vector_store_stats():
-    """벡터 저장소 통계 정보 조회"""
+    """벡터 저장소 통계 정보 조회 (동기화 진행 상황 포함)"""
     try:
-        from core.logic import MarketingLogic
-        logic = MarketingLogic()
-        
-        stats = logic.vector_store.get_collection_stats()
+        vector_store = get_services().vector_store
         
         return jsonify({
             'success': True,
-            'stats': stats
+            **vector_store.stats()
         })
     
     except Exception as e:
@@ -10,6 +10,15 @@ class Config:
     # 데이터베이스 경로
     DB_TRENDS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'trends.db')
     DB_PHRASES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'marketing_phrases.db')
+    EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', os.path.join(os.path.dirname(__file__), 'data', 'embedding_cache.db'))
+    
+    # SQLite 연결 (스레드별 연결 재사용, WAL + 동기화 수준/페이지 캐시/메모리 맵/잠금 대기 PRAGMA, 준비된 문장 캐시 크기)
+    SQLITE_POOL_ENABLED = os.getenv('SQLITE_POOL_ENABLED', 'true').lower() == 'true'
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 16384))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 268435456))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_STATEMENT_CACHE = int(os.getenv('SQLITE_STATEMENT_CACHE', 256))
     
     # API 키
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
@@ -19,4 +28,115 @@ class Config:
     # 스케줄러 설정 (주 1회 트렌드 업데이트)
     TREND_UPDATE_DAY = 'mon'  # 월요일
     TREND_UPDATE_HOUR = 10     # 오전 9시
-    TREND_UPDATE_MINUTE = 15
\ No newline at end of file
+    TREND_UPDATE_MINUTE = 15
+    
+    # 생성 결과 캐시 설정 (LRU + TTL)
+    GENERATION_CACHE_SIZE = int(os.getenv('GENERATION_CACHE_SIZE', 256))
+    GENERATION_CACHE_TTL = int(os.getenv('GENERATION_CACHE_TTL', 600))  # 초 단위
+    
+    # 생성 파이프라인 동시 실행 설정
+    PIPELINE_CONCURRENT = os.getenv('PIPELINE_CONCURRENT', 'true').lower() == 'true'
+    PIPELINE_MAX_WORKERS = int(os.getenv('PIPELINE_MAX_WORKERS', 8))
+    PIPELINE_STAGE_TIMEOUT = float(os.getenv('PIPELINE_STAGE_TIMEOUT', 10))  # 검색/트렌드 단계 (초)
+    LLM_STAGE_TIMEOUT = float(os.getenv('LLM_STAGE_TIMEOUT', 60))  # LLM 분할 호출 단계 (초)
+    LLM_SPLIT_THRESHOLD = int(os.getenv('LLM_SPLIT_THRESHOLD', 5))  # 이 개수를 넘으면 LLM 호출 분할
+    LLM_SPLIT_SIZE = int(os.getenv('LLM_SPLIT_SIZE', 5))  # 분할 시 호출당 최대 생성 개수
+    
+    # Gemini 쿼터 (토큰 버킷 레이트 리미터)
+    GEMINI_RPM = float(os.getenv('GEMINI_RPM', 60))  # 분당 요청 수
+    GEMINI_BURST = float(os.getenv('GEMINI_BURST', 10))  # 순간 최대 요청 수
+    GEMINI_RATE_LIMIT_TIMEOUT = float(os.getenv('GEMINI_RATE_LIMIT_TIMEOUT', 120))  # 토큰 대기 최대 시간 (초)
+    
+    # 배치 생성 설정
+    BATCH_MAX_BRIEFS = int(os.getenv('BATCH_MAX_BRIEFS', 100))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', 4))
+    BATCH_JOB_RETENTION = int(os.getenv('BATCH_JOB_RETENTION', 50))  # 보관할 완료 작업 수
+    
+    # 파서 코퍼스 수집 (설정 시 LLM 원본 출력을 이 디렉토리에 저장)
+    PARSER_CORPUS_CAPTURE_DIR = os.getenv('PARSER_CORPUS_CAPTURE_DIR')
+    
+    # 시맨틱 캐시 설정 (유사 브리프 결과 재사용, 실제 브리프로 임계값을 검증하기 전까지 기본 비활성화)
+    SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true'
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.92))  # 코사인 유사도
+    SEMANTIC_CACHE_SIZE = int(os.getenv('SEMANTIC_CACHE_SIZE', 512))
+    SEMANTIC_CACHE_TTL = int(os.getenv('SEMANTIC_CACHE_TTL', 1800))  # 초 단위
+    
+    # LLM 호출 안정성 설정 (데드라인, 재시도, 헤지 요청, 서킷 브레이커)
+    LLM_DEADLINE = float(os.getenv('LLM_DEADLINE', 30))  # 호출 1건의 전체 제한 시간 (초, 재시도 포함)
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 2))
+    LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', 0.5))
+    LLM_RETRY_MAX_DELAY = float(os.getenv('LLM_RETRY_MAX_DELAY', 4))
+    LLM_HEDGE_ENABLED = os.getenv('LLM_HEDGE_ENABLED', 'false').lower() == 'true'
+    LLM_HEDGE_MIN_DELAY = float(os.getenv('LLM_HEDGE_MIN_DELAY', 2))  # p95가 이보다 짧아도 최소 이만큼 대기 후 헤지
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', 20))  # p95 계산에 필요한 최소 샘플 수
+    LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', 5))
+    LLM_BREAKER_RECOVERY_TIMEOUT = float(os.getenv('LLM_BREAKER_RECOVERY_TIMEOUT', 30))
+    LLM_MAX_WORKERS = int(os.getenv('LLM_MAX_WORKERS', 16))
+    
+    # 프롬프트 토큰 예산 (0이면 제한 없음, 토큰 수는 문자 수 기반 근사치)
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', 1200))
+    PROMPT_REFERENCE_MIN_CHARS = int(os.getenv('PROMPT_REFERENCE_MIN_CHARS', 40))
+    
+    # 벡터 저장소 대량 색인 설정 (청크 크기, 임베딩 워커 수)
+    VECTOR_SYNC_BATCH_SIZE = int(os.getenv('VECTOR_SYNC_BATCH_SIZE', 256))
+    VECTOR_EMBED_WORKERS = int(os.getenv('VECTOR_EMBED_WORKERS', 2))
+    
+    # 임베딩 엔진 (onnx: ONNX Runtime + 동적 패딩, sentence-transformers, chroma: ChromaDB 기본 함수)
+    # 모델을 비워 두면 기존 기본 모델(all-MiniLM-L6-v2) 사용, onnx는 model.onnx + tokenizer.json 디렉토리 경로
+    # 추론 스레드 수는 0이면 라이브러리 기본값 (VECTOR_EMBED_WORKERS × 스레드 수가 코어 수를 넘지 않게 설정)
+    EMBEDDING_ENGINE = os.getenv('EMBEDDING_ENGINE', 'onnx').lower()
+    EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', '')
+    EMBEDDING_THREADS = int(os.getenv('EMBEDDING_THREADS', 0))
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 32))
+    EMBEDDING_MAX_LENGTH = int(os.getenv('EMBEDDING_MAX_LENGTH', 256))
+    
+    # 임베딩 캐시 (영구 캐시 경로는 EMBEDDING_CACHE_PATH)
+    EMBEDDING_CACHE_ENABLED = os.getenv('EMBEDDING_CACHE_ENABLED', 'true').lower() == 'true'
+    QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv('QUERY_EMBEDDING_CACHE_SIZE', 1024))  # 검색 쿼리 임베딩 메모리 LRU
+    
+    # RAG 검색 설정 (유사도 기준을 넘는 목표 후보 수, 첫 조회 배수, 최대 검토 후보 수)
+    RAG_CANDIDATES = int(os.getenv('RAG_CANDIDATES', 10))
+    RAG_OVERFETCH_FACTOR = float(os.getenv('RAG_OVERFETCH_FACTOR', 1.5))
+    RAG_MAX_CANDIDATES = int(os.getenv('RAG_MAX_CANDIDATES', 200))
+    
+    # 벡터 색인 백엔드 (chroma: ChromaDB HNSW, numpy: 팀/채널 파티션별 NumPy 행렬)
+    VECTOR_BACKEND = os.getenv('VECTOR_BACKEND', 'chroma').lower()
+    NUMPY_INDEX_PATH = os.getenv('NUMPY_INDEX_PATH', os.path.join(os.path.dirname(__file__), 'data', 'numpy_index'))
+    
+    # 슬림 메타데이터 (색인에는 copy_id/팀/채널/CTR/전환율만 저장, 검색 결과의 제목/내용/성과 지표는 DB에서 한 번에 조회)
+    VECTOR_SLIM_METADATA = os.getenv('VECTOR_SLIM_METADATA', 'false').lower() == 'true'
+    
+    # 벡터 저장 정밀도 (float32 | float16 | int8, numpy 백엔드와 스냅샷에 적용)
+    # 양자화 색인이면 상위 n × RESCORE_FACTOR개 후보를 임베딩 캐시의 float32 벡터로 다시 계산해 정렬
+    VECTOR_QUANTIZATION = os.getenv('VECTOR_QUANTIZATION', 'float32').lower()
+    VECTOR_RESCORE = os.getenv('VECTOR_RESCORE', 'true').lower() == 'true'
+    VECTOR_RESCORE_FACTOR = int(os.getenv('VECTOR_RESCORE_FACTOR', 4))
+    
+    # 벡터 색인 스냅샷 (VECTOR_BACKEND=snapshot이면 읽기 전용 메모리 맵으로 열기, 열 때 체크섬 검증 여부)
+    VECTOR_SNAPSHOT_PATH = os.getenv('VECTOR_SNAPSHOT_PATH', os.path.join(os.path.dirname(__file__), 'data', 'vector_snapshot'))
+    VECTOR_SNAPSHOT_VERIFY = os.getenv('VECTOR_SNAPSHOT_VERIFY', 'true').lower() == 'true'
+    
+    # 하이브리드 검색 (문자 n-gram BM25 어휘 색인 + 벡터 검색을 RRF로 결합)
+    HYBRID_SEARCH_ENABLED = os.getenv('HYBRID_SEARCH_ENABLED', 'true').lower() == 'true'
+    LEXICAL_NGRAM = int(os.getenv('LEXICAL_NGRAM', 2))
+    LEXICAL_CANDIDATES = int(os.getenv('LEXICAL_CANDIDATES', 20))
+    LEXICAL_MIN_COVERAGE = float(os.getenv('LEXICAL_MIN_COVERAGE', 0.3))
+    RRF_K = int(os.getenv('RRF_K', 60))
+    
+    # RAG 예시 재정렬 (relevance = 유사도/CTR/전환율 가중합, MMR 람다가 작을수록 다양성 우선)
+    RERANK_TOP_N = int(os.getenv('RERANK_TOP_N', 3))
+    RERANK_SIMILARITY_WEIGHT = float(os.getenv('RERANK_SIMILARITY_WEIGHT', 0.5))
+    RERANK_CTR_WEIGHT = float(os.getenv('RERANK_CTR_WEIGHT', 0.3))
+    RERANK_CONVERSION_WEIGHT = float(os.getenv('RERANK_CONVERSION_WEIGHT', 0.2))
+    RERANK_MMR_LAMBDA = float(os.getenv('RERANK_MMR_LAMBDA', 0.5))
+    
+    # 앱 시작 (eager: 앱 생성 중 모든 서비스 생성, warmup: 부팅 후 백그라운드에서 서비스 생성 + 임베딩 모델 로드)
+    SERVICES_EAGER = os.getenv('SERVICES_EAGER', 'false').lower() == 'true'
+    SERVICES_WARMUP = os.getenv('SERVICES_WARMUP', 'true').lower() == 'true'
+    
+    # 검색 사이드카 (소켓 경로를 지정하면 웹 워커는 Unix 소켓으로 공유 검색 프로세스에 접속, 실패 시 프로세스 내 검색)
+    SEARCH_SIDECAR_SOCKET = os.getenv('SEARCH_SIDECAR_SOCKET', '')
+    SEARCH_SIDECAR_TIMEOUT = float(os.getenv('SEARCH_SIDECAR_TIMEOUT', 5.0))
+    SEARCH_SIDECAR_RETRY_INTERVAL = float(os.getenv('SEARCH_SIDECAR_RETRY_INTERVAL', 30.0))
+    SEARCH_BATCH_WINDOW_MS = float(os.getenv('SEARCH_BATCH_WINDOW_MS', 2.0))
+    SEARCH_BATCH_MAX = int(os.getenv('SEARCH_BATCH_MAX', 32))
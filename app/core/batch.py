@@ -0,0 +1,110 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from config import Config
+
+
+class BatchJob:
+    """브리프 여러 개를 묶은 배치 생성 작업"""
+
+    def __init__(self, briefs: List[dict], concurrency: int):
+        self.job_id = uuid.uuid4().hex
+        self.briefs = briefs
+        self.concurrency = concurrency
+        self.status = 'pending'
+        self.created_at = time.time()
+        self.finished_at = None
+        self.results = [{'index': i, 'status': 'pending'} for i in range(len(briefs))]
+        self._lock = threading.Lock()
+
+    def set_result(self, index: int, result: dict) -> None:
+        with self._lock:
+            self.results[index] = dict(result, index=index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """작업 상태 + 브리프별 결과 (진행 중이면 부분 결과)"""
+        with self._lock:
+            results = [dict(r) for r in self.results]
+        completed = sum(1 for r in results if r['status'] in ('success', 'error'))
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'total': len(results),
+            'completed': completed,
+            'failed': sum(1 for r in results if r['status'] == 'error'),
+            'concurrency': self.concurrency,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'results': results
+        }
+
+
+class BatchJobManager:
+    """배치 생성 작업 실행 및 조회 (동시 실행 수 제한)"""
+
+    def __init__(self, worker: Callable[[dict], Any], retention: int = None):
+        self.worker = worker
+        self.retention = retention if retention is not None else Config.BATCH_JOB_RETENTION
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, briefs: List[dict], concurrency: int = None) -> BatchJob:
+        """배치 작업 생성 (동시 실행 수는 BATCH_MAX_CONCURRENCY 이하로 제한)"""
+        concurrency = concurrency or Config.BATCH_MAX_CONCURRENCY
+        concurrency = max(1, min(int(concurrency), Config.BATCH_MAX_CONCURRENCY))
+        job = BatchJob(briefs, concurrency)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict()
+        return job
+
+    def run(self, job: BatchJob) -> BatchJob:
+        """작업을 현재 스레드에서 실행 (브리프 단위로 실패를 격리)"""
+        job.status = 'running'
+        print(f"📦 배치 생성 시작: {job.job_id} ({len(job.briefs)}건, 동시 {job.concurrency})")
+
+        def run_brief(index: int, brief: dict) -> None:
+            job.set_result(index, {'status': 'running'})
+            try:
+                if not brief.get('topic'):
+                    raise ValueError('주제(topic)는 필수입니다')
+                result = self.worker(brief)
+                job.set_result(index, {
+                    'status': 'success',
+                    'copies': result.get('copies', []),
+                    'referenced_phrases': result.get('referenced_phrases', []),
+                    'cached': result.get('cached', False)
+                })
+            except Exception as e:
+                print(f"❌ 배치 브리프 실패 ({job.job_id}#{index}): {e}")
+                job.set_result(index, {'status': 'error', 'error': str(e)})
+
+        # 파이프라인 공유 풀과 분리된 전용 풀 (중첩 대기로 인한 교착 방지)
+        with ThreadPoolExecutor(max_workers=job.concurrency, thread_name_prefix='batch') as executor:
+            for index, brief in enumerate(job.briefs):
+                executor.submit(run_brief, index, brief)
+
+        job.finished_at = time.time()
+        job.status = 'completed'
+        print(f"✅ 배치 생성 완료: {job.job_id}")
+        return job
+
+    def submit(self, briefs: List[dict], concurrency: int = None) -> BatchJob:
+        """작업을 백그라운드 스레드에서 실행하고 즉시 반환 (job_id로 폴링)"""
+        job = self.create(briefs, concurrency)
+        threading.Thread(target=self.run, args=(job,), daemon=True).start()
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _evict(self) -> None:
+        """보관 한도를 넘으면 오래된 완료 작업부터 제거"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status == 'completed']
+        while len(self._jobs) > self.retention and finished:
+            del self._jobs[finished.pop(0)]
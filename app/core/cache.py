@@ -0,0 +1,278 @@
+import copy
+import hashlib
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from config import Config
+
+
+def make_cache_key(params: dict, prompt: str = '') -> str:
+    """브리프 파라미터 + 최종 프롬프트로 정규화된 캐시 키 생성"""
+    normalized = {}
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = " ".join(value.split())
+            if value == '':
+                continue
+        normalized[key] = value
+
+    payload = json.dumps(
+        {'params': normalized, 'prompt': prompt},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """LRU + TTL 기반 생성 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, max_size: int = 256, ttl: float = 600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (만료된 항목은 삭제 후 miss 처리)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """캐시 저장 (용량 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """전체 캐시 무효화 (트렌드 변경 시 호출)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 정보 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+class LRUCache:
+    """
+    크기 제한 LRU 캐시 (스레드 안전, TTL/복사 없음)
+
+    값이 바뀌지 않는 계산 결과(쿼리 임베딩 등)용. 반환값을 수정하지 않는 것을 전제로 함
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 정보 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions
+            }
+
+
+class SemanticCache:
+    """
+    브리프 임베딩 기반 유사 중복 생성 캐시 (스레드 안전)
+
+    - 파티션(팀, 채널, 스타일)별로 저장하고, 같은 파티션에서 코사인 유사도가
+      threshold 이상인 가장 가까운 항목을 반환
+    - 전체 항목 수는 max_size로 제한 (LRU 제거), 항목별 TTL 적용
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 1800, threshold: float = 0.92):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries = OrderedDict()  # entry_id -> (partition, expires_at, vector, value)
+        self._partitions = {}  # partition -> {entry_id: None}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, partition: Tuple, vector) -> Optional[Tuple[Any, float]]:
+        """가장 유사한 캐시 항목 (값, 유사도) 반환, 임계값 미만이면 None"""
+        query = self._normalize(vector)
+        now = time.monotonic()
+
+        with self._lock:
+            entry_ids = list(self._partitions.get(partition, ()))
+            live_ids = []
+            for entry_id in entry_ids:
+                if self._entries[entry_id][1] < now:
+                    self._remove(entry_id)
+                else:
+                    live_ids.append(entry_id)
+
+            if not live_ids:
+                self.misses += 1
+                return None
+
+            matrix = np.stack([self._entries[entry_id][2] for entry_id in live_ids])
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            entry_id = live_ids[best]
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            return copy.deepcopy(self._entries[entry_id][3]), similarity
+
+    def add(self, partition: Tuple, vector, value: Any) -> None:
+        """항목 추가 (용량 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            entry_id = next(self._ids)
+            self._entries[entry_id] = (
+                partition,
+                time.monotonic() + self.ttl,
+                self._normalize(vector),
+                copy.deepcopy(value)
+            )
+            self._partitions.setdefault(partition, {})[entry_id] = None
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, entry_id: int) -> None:
+        partition = self._entries.pop(entry_id)[0]
+        members = self._partitions.get(partition)
+        if members is not None:
+            members.pop(entry_id, None)
+            if not members:
+                del self._partitions[partition]
+
+    def invalidate(self) -> None:
+        """전체 캐시 무효화 (트렌드 변경 시 호출)"""
+        with self._lock:
+            self._entries.clear()
+            self._partitions.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 정보 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'partitions': len(self._partitions),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+# 프로세스 전역 생성 캐시 (MarketingLogic 인스턴스 간 공유)
+generation_cache = GenerationCache(
+    max_size=Config.GENERATION_CACHE_SIZE,
+    ttl=Config.GENERATION_CACHE_TTL
+)
+
+# 프로세스 전역 시맨틱 캐시 (유사한 브리프의 생성 결과 재사용)
+semantic_cache = SemanticCache(
+    max_size=Config.SEMANTIC_CACHE_SIZE,
+    ttl=Config.SEMANTIC_CACHE_TTL,
+    threshold=Config.SEMANTIC_CACHE_THRESHOLD
+)
@@ -0,0 +1,147 @@
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import Config
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """파이프라인 단계 실행용 공유 스레드 풀 (프로세스당 1개)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.PIPELINE_MAX_WORKERS,
+                    thread_name_prefix='pipeline'
+                )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """공유 스레드 풀 종료 (다음 get_executor 호출 시 재생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def run_stages(stages: Dict[str, Callable[[], Any]],
+               timeout: float = None,
+               defaults: Optional[Dict[str, Any]] = None,
+               concurrent: bool = True) -> Dict[str, Any]:
+    """
+    독립적인 파이프라인 단계들을 실행하고 이름별 결과 반환
+
+    - concurrent=True면 공유 스레드 풀에서 동시에 실행
+    - 단계별로 timeout(초)을 넘기거나 예외가 나면 defaults 값으로 대체
+    """
+    defaults = defaults or {}
+    results = {}
+
+    if not concurrent:
+        for name, func in stages.items():
+            started = time.perf_counter()
+            try:
+                results[name] = func()
+            except Exception as e:
+                print(f"❌ 파이프라인 단계 실패 ({name}): {e}")
+                results[name] = defaults.get(name)
+            print(f"⏱️ {name}: {(time.perf_counter() - started) * 1000:.1f}ms")
+        return results
+
+    executor = get_executor()
+    started = time.perf_counter()
+    futures = {name: executor.submit(func) for name, func in stages.items()}
+
+    for name, future in futures.items():
+        # 단계별 타임아웃은 전체 시작 시점 기준으로 계산 (동시 실행이므로)
+        remaining = None
+        if timeout is not None:
+            remaining = max(0.0, timeout - (time.perf_counter() - started))
+        try:
+            results[name] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            print(f"⏰ 파이프라인 단계 타임아웃 ({name}, {timeout}s)")
+            results[name] = defaults.get(name)
+        except Exception as e:
+            print(f"❌ 파이프라인 단계 실패 ({name}): {e}")
+            results[name] = defaults.get(name)
+
+    print(f"⏱️ 동시 실행 {list(stages.keys())}: {(time.perf_counter() - started) * 1000:.1f}ms")
+    return results
+
+
+def split_count(count: int, chunk_size: int) -> List[int]:
+    """생성 개수를 chunk_size 이하의 균등한 묶음으로 분할 (예: 10, 4 → [4, 3, 3])"""
+    if chunk_size <= 0 or count <= chunk_size:
+        return [count]
+
+    chunks = -(-count // chunk_size)
+    base, extra = divmod(count, chunks)
+    return [base + 1 if i < extra else base for i in range(chunks)]
+
+
+class SingleFlight:
+    """
+    동일 키의 동시 작업 병합 (single-flight)
+
+    같은 키로 이미 실행 중인 작업이 있으면 새로 실행하지 않고 그 결과를 기다려 공유
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """작업 실행 또는 대기 → (결과, 다른 요청의 결과를 공유했는지 여부)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                leader = True
+                self.executed += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return copy.deepcopy(call['result']), True
+
+        try:
+            result = func()
+            # 대기 중인 요청에는 호출자와 분리된 스냅샷을 공유
+            call['result'] = copy.deepcopy(result)
+            return result, False
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call['event'].set()
+
+    def stats(self) -> Dict[str, Any]:
+        """병합 통계 정보 반환"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executed': self.executed,
+                'coalesced': self.coalesced
+            }
+
+
+# 프로세스 전역 생성 요청 병합기 (워커 내 스레드 간 공유)
+generation_flights = SingleFlight()
@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List
+import numpy as np
+
+# ChromaDB 기본 임베딩 모델 (EMBEDDING_MODEL을 비워 두면 onnx 엔진이 이 모델을 사용, 기존 색인/캐시와 같은 벡터)
+DEFAULT_ONNX_MODEL = 'all-MiniLM-L6-v2'
+DEFAULT_SENTENCE_TRANSFORMERS_MODEL = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+
+
+class EmbeddingEngine:
+    """
+    배치 임베딩 엔진 (프로세스당 모델 1회 로드, ChromaDB EmbeddingFunction과 같은 호출 형식: engine(input) → 벡터 목록)
+
+    - 입력을 길이순으로 정렬해 batch_size개씩 추론 (배치 안 패딩 최소화) 후 원래 순서로 반환
+    - 모델은 첫 호출(또는 load()) 때 로드, threads > 0이면 추론 스레드 수 고정
+    - 처리량(texts/sec)과 배치 지연 시간(p50/p95)을 stats()로 제공
+    """
+
+    name = 'base'
+
+    def __init__(self, model_name: str, threads: int = 0, batch_size: int = 32, max_length: int = 256):
+        self.model_name = model_name
+        self.threads = threads
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.load_seconds = None
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)  # 최근 배치 지연 시간 (ms)
+        self.texts = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def load(self) -> None:
+        with self._load_lock:
+            if self._loaded:
+                return
+            started = time.perf_counter()
+            self._load()
+            self.load_seconds = time.perf_counter() - started
+            self._loaded = True
+            print(f"🧠 임베딩 모델 로드: {self.name}/{self.model_name} "
+                  f"(스레드 {self.threads or '기본값'}, {self.load_seconds:.1f}s)")
+
+    def _load(self) -> None:
+        raise NotImplementedError
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """배치 1개 → (len(texts), dim) 정규화된 float32 행렬"""
+        raise NotImplementedError
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        if not input:
+            return []
+        self.load()
+        order = sorted(range(len(input)), key=lambda i: len(input[i]), reverse=True)
+        embeddings = [None] * len(input)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            started = time.perf_counter()
+            vectors = self._encode([input[i] for i in batch])
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self._latencies.append(elapsed * 1000)
+                self.texts += len(batch)
+                self.batches += 1
+                self.busy_seconds += elapsed
+            for i, vector in zip(batch, vectors.tolist()):
+                embeddings[i] = vector
+        return embeddings
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._latencies.clear()
+            self.texts = 0
+            self.batches = 0
+            self.busy_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            latencies = np.asarray(self._latencies)
+            texts, batches, busy_seconds = self.texts, self.batches, self.busy_seconds
+        return {
+            'engine': self.name,
+            'model': self.model_name,
+            'threads': self.threads,
+            'batch_size': self.batch_size,
+            'loaded': self._loaded,
+            'load_seconds': round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            'texts': texts,
+            'batches': batches,
+            'texts_per_sec': round(texts / busy_seconds, 1) if busy_seconds else 0.0,
+            'batch_latency_ms': {
+                'p50': round(float(np.percentile(latencies, 50)), 2) if latencies.size else 0.0,
+                'p95': round(float(np.percentile(latencies, 95)), 2) if latencies.size else 0.0
+            }
+        }
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class OnnxEngine(EmbeddingEngine):
+    """
+    ONNX Runtime 엔진 (model.onnx + tokenizer.json 디렉토리, mean pooling)
+
+    - model_name이 DEFAULT_ONNX_MODEL이면 ChromaDB가 내려받는 기본 모델 디렉토리 사용
+    - 배치마다 가장 긴 문장 길이까지만 패딩 (ChromaDB 기본 함수는 항상 256 토큰으로 패딩)
+    """
+
+    name = 'onnx'
+
+    def _model_dir(self) -> str:
+        if self.model_name != DEFAULT_ONNX_MODEL:
+            return self.model_name
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+        # 기본 모델은 ChromaDB 다운로드 경로를 공유 (없으면 내려받음)
+        default = ONNXMiniLM_L6_V2()
+        default._download_model_if_not_exists()
+        return os.path.join(default.DOWNLOAD_PATH, default.EXTRACTED_FOLDER_NAME)
+
+    def _load(self) -> None:
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        model_dir = self._model_dir()
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        pad_token = next((token for token in ('[PAD]', '<pad>') if self.tokenizer.token_to_id(token) is not None), '[PAD]')
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if self.threads > 0:
+            options.intra_op_num_threads = self.threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, 'model.onnx'), sess_options=options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {item.name for item in self.session.get_inputs()}
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([item.ids for item in encoded], dtype=np.int64)
+        attention_mask = np.array([item.attention_mask for item in encoded], dtype=np.int64)
+        feed = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self.input_names:
+            feed['token_type_ids'] = np.zeros_like(input_ids)
+        output = self.session.run(None, {name: value for name, value in feed.items() if name in self.input_names})[0]
+        if output.ndim == 2:
+            # 문장 임베딩을 바로 출력하는 모델
+            return _normalize(output)
+        mask = attention_mask[..., None].astype(output.dtype)
+        pooled = (output * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return _normalize(pooled)
+
+
+class SentenceTransformersEngine(EmbeddingEngine):
+    """sentence-transformers 엔진 (CPU, torch 추론 스레드 수 고정)"""
+
+    name = 'sentence-transformers'
+
+    def _load(self) -> None:
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if self.threads > 0:
+            torch.set_num_threads(self.threads)
+        self.model = SentenceTransformer(self.model_name, device='cpu')
+        self.model.max_seq_length = self.max_length
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True,
+                                    normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class ChromaDefaultEngine(EmbeddingEngine):
+    """ChromaDB 기본 임베딩 함수 래퍼 (이전 동작, 스레드 수 설정 불가)"""
+
+    name = 'chroma'
+
+    def _load(self) -> None:
+        from chromadb.utils import embedding_functions
+
+        self.function = embedding_functions.DefaultEmbeddingFunction()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.function(texts), dtype=np.float32)
+
+
+ENGINES = {
+    OnnxEngine.name: OnnxEngine,
+    SentenceTransformersEngine.name: SentenceTransformersEngine,
+    ChromaDefaultEngine.name: ChromaDefaultEngine,
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def default_model(name: str) -> str:
+    return DEFAULT_SENTENCE_TRANSFORMERS_MODEL if name == SentenceTransformersEngine.name else DEFAULT_ONNX_MODEL
+
+
+def get_embedding_engine(name: str, model_name: str = '', threads: int = 0,
+                         batch_size: int = 32, max_length: int = 256) -> EmbeddingEngine:
+    """설정별 임베딩 엔진 (프로세스당 1개 공유, 모델은 첫 호출 때 로드)"""
+    if name not in ENGINES:
+        raise ValueError(f"지원하지 않는 임베딩 엔진입니다: {name} ({' | '.join(ENGINES)})")
+    model_name = model_name or default_model(name)
+    key = (name, model_name, threads, batch_size, max_length)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = ENGINES[name](model_name, threads=threads, batch_size=batch_size,
+                                                   max_length=max_length)
+        return engine
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+EMBEDDING_CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS embeddings (
+        model_id TEXT NOT NULL,
+        text_hash TEXT NOT NULL,
+        dim INTEGER NOT NULL,
+        vector BLOB NOT NULL,  -- float32 리틀엔디언
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (model_id, text_hash)
+    ) WITHOUT ROWID
+"""
+
+
+def text_hash(text: str) -> str:
+    """임베딩 대상 텍스트 해시 (캐시 키)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    디스크 기반 임베딩 캐시 (SQLite, 스레드 안전)
+
+    - 키: (모델 ID, 텍스트 SHA-256) → 모델을 바꾸면 자연스럽게 별도 공간 사용
+    - 벡터는 float32 BLOB으로 저장, 재구축/재색인 시 바뀌지 않은 텍스트는 임베딩을 다시 계산하지 않음
+    """
+
+    def __init__(self, path: str, model_id: str):
+        self.path = path
+        self.model_id = model_id
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(EMBEDDING_CACHE_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """텍스트별 캐시된 벡터 (없으면 None)"""
+        if not texts:
+            return []
+        hashes = [text_hash(text) for text in texts]
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            # SQLite 바인딩 변수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model_id = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [self.model_id] + chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype='<f4').tolist()
+
+            results = [found.get(key) for key in hashes]
+            hits = sum(1 for vector in results if vector is not None)
+            self.hits += hits
+            self.misses += len(results) - hits
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """계산한 벡터 저장 (이미 있으면 덮어씀)"""
+        if not texts:
+            return
+        rows = []
+        for text, vector in zip(texts, vectors):
+            array = np.asarray(vector, dtype='<f4')
+            rows.append((self.model_id, text_hash(text), int(array.shape[0]), array.tobytes()))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model_id, text_hash, dim, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self.writes += len(rows)
+
+    def clear(self) -> None:
+        """현재 모델의 캐시 항목 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings WHERE model_id = ?", (self.model_id,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 정보 반환"""
+        with self._lock:
+            size = self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE model_id = ?", (self.model_id,)
+            ).fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                'model_id': self.model_id,
+                'path': self.path,
+                'size': size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'writes': self.writes
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
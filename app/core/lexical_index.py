@@ -0,0 +1,154 @@
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+# 한글/영문/숫자 덩어리 + 할인율 표기(30%)를 하나의 토큰으로
+TOKEN_PATTERN = re.compile(r'[\w%]+')
+
+
+def tokenize(text: str, ngram: int = 2) -> List[str]:
+    """
+    형태소 분석기 없이 쓰는 문자 n-gram 토큰화
+
+    - NFKC 정규화 + 소문자 변환 후 공백/문장부호 단위로 나눔 ('롯데ON' → '롯데on')
+    - 덩어리마다 문자 n-gram + 덩어리 전체를 토큰으로 사용 (조사가 붙어도 n-gram은 일치, 전체 일치는 점수가 더 높음)
+    """
+    if not text:
+        return []
+    terms = []
+    for chunk in TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text).lower()):
+        if len(chunk) > ngram:
+            terms.extend(chunk[i:i + ngram] for i in range(len(chunk) - ngram + 1))
+        terms.append(chunk)
+    return terms
+
+
+class LexicalIndex:
+    """
+    BM25 역색인 (메모리, 스레드 안전)
+
+    - 문서 키는 copy_id, 팀/채널/CTR/전환율 필터는 벡터 검색과 같은 의미로 적용
+    - upsert/remove로 증분 갱신 (문서별 용어 빈도를 보관해 역색인에서 정확히 제거)
+    """
+
+    def __init__(self, ngram: int = 2, k1: float = 1.2, b: float = 0.75):
+        self.ngram = ngram
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[Any, int]] = {}
+        self._doc_terms: Dict[Any, Counter] = {}
+        self._doc_lengths: Dict[Any, int] = {}
+        self._filters: Dict[Any, Tuple[Any, str, float, float]] = {}
+        self._total_length = 0
+        self.searches = 0
+
+    @staticmethod
+    def _filter_values(metadata: Dict[str, Any]) -> Tuple[Any, str, float, float]:
+        return (
+            metadata.get('team_id', ''),
+            metadata.get('channel', ''),
+            float(metadata.get('ctr') or 0.0),
+            float(metadata.get('conversion_rate') or 0.0)
+        )
+
+    def _remove(self, doc_id) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        del self._filters[doc_id]
+
+    def upsert(self, doc_id, text: str, metadata: Dict[str, Any]) -> None:
+        """문서 추가 또는 교체"""
+        terms = Counter(tokenize(text, self.ngram))
+        with self._lock:
+            self._remove(doc_id)
+            if not terms:
+                return
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._doc_terms[doc_id] = terms
+            length = sum(terms.values())
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+            self._filters[doc_id] = self._filter_values(metadata)
+
+    def remove(self, doc_id) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._filters.clear()
+            self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def search(self, query: str, n_results: int = 10,
+               team_id: str = None, channel: str = None,
+               min_ctr: float = 0.0, min_conversion_rate: float = 0.0) -> List[Tuple[Any, float, float]]:
+        """
+        BM25 검색 → [(doc_id, 점수, 쿼리 용어 일치 비율)] 점수 내림차순
+
+        일치 비율은 쿼리의 고유 용어 중 문서에 있는 비율 (짧은 n-gram 하나만 겹친 약한 일치를 거르는 용도)
+        """
+        query_terms = set(tokenize(query, self.ngram))
+        if not query_terms or n_results <= 0:
+            return []
+        team_key = int(team_id) if team_id else None
+
+        with self._lock:
+            self.searches += 1
+            doc_count = len(self._doc_terms)
+            if not doc_count:
+                return []
+            average_length = self._total_length / doc_count
+
+            allowed: Dict[Any, bool] = {}
+            scores: Dict[Any, float] = {}
+            matched: Counter = Counter()
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    ok = allowed.get(doc_id)
+                    if ok is None:
+                        team, doc_channel, ctr, conversion_rate = self._filters[doc_id]
+                        ok = ((team_key is None or team == team_key)
+                              and (not channel or doc_channel == channel)
+                              and ctr >= min_ctr
+                              and conversion_rate >= min_conversion_rate)
+                        allowed[doc_id] = ok
+                    if not ok:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[doc_id] += 1
+
+            top = heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+            return [(doc_id, score, matched[doc_id] / len(query_terms)) for doc_id, score in top]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'documents': len(self._doc_terms),
+                'terms': len(self._postings),
+                'postings': sum(len(postings) for postings in self._postings.values()),
+                'searches': self.searches
+            }
@@ -1,12 +1,168 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from config import Config
+from core.rate_limit import gemini_rate_limiter
+from core.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, backoff_delay
+
+# 재시도할 가치가 있는 오류 (429, 5xx, 타임아웃, 네트워크)
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    TimeoutError,
+    ConnectionError,
+)
+
+
+class QuotaWaitTimeout(RuntimeError):
+    """데드라인 안에 Gemini 쿼터 토큰을 확보하지 못함 (호출은 시도하지 않음)"""
 
-# Gemini API 설정
-genai.configure(api_key=Config.GEMINI_API_KEY)
 
 class LLMService:
     def __init__(self):
+        # Gemini API 설정 (모듈 import 시점이 아니라 서비스 생성 시점에 적용)
+        genai.configure(api_key=Config.GEMINI_API_KEY)
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.rate_limiter = gemini_rate_limiter
+        self.breaker = CircuitBreaker(
+            failure_threshold=Config.LLM_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=Config.LLM_BREAKER_RECOVERY_TIMEOUT
+        )
+        self.latency = LatencyTracker()
+        # 데드라인을 넘긴 호출은 이 풀에 남겨두고 요청 스레드는 즉시 반환
+        self._executor = ThreadPoolExecutor(max_workers=Config.LLM_MAX_WORKERS, thread_name_prefix='llm')
+        self._counters = {'calls': 0, 'retries': 0, 'hedged': 0, 'hedge_wins': 0, 'timeouts': 0, 'failures': 0}
+        self._counters_lock = threading.Lock()
+    
+    def _count(self, name: str) -> None:
+        with self._counters_lock:
+            self._counters[name] += 1
+    
+    def _acquire_quota(self, timeout: float = None) -> None:
+        """Gemini 쿼터 토큰 확보 (429 폭주 방지)"""
+        if timeout is None:
+            timeout = Config.GEMINI_RATE_LIMIT_TIMEOUT
+        if not self.rate_limiter.acquire(timeout=min(timeout, Config.GEMINI_RATE_LIMIT_TIMEOUT)):
+            raise QuotaWaitTimeout("Gemini 요청 한도 대기 시간 초과")
+    
+    def _record_outcome(self, error: Exception = None) -> None:
+        """서킷 브레이커에 결과 반영 (제공자 장애성 오류만 실패로 집계)"""
+        if error is None or not isinstance(error, (RETRYABLE_ERRORS, QuotaWaitTimeout)):
+            # 정상 응답 또는 요청 자체의 문제(잘못된 인자, 안전 필터 등) → 제공자는 정상
+            self.breaker.record_success()
+        elif isinstance(error, QuotaWaitTimeout):
+            # 호출을 보내지 않았으므로 상태는 그대로 두고 시험 호출 슬롯만 반납
+            self.breaker.release()
+        else:
+            self.breaker.record_failure()
+    
+    def _generate(self, prompt: str, generation_config: dict = None) -> str:
+        response = self.model.generate_content(prompt, generation_config=generation_config)
+        return response.text
+    
+    def _hedge_delay(self):
+        """헤지 요청 전 대기 시간 (최근 p95 기준, 샘플 부족 시 None)"""
+        if not Config.LLM_HEDGE_ENABLED:
+            return None
+        p95 = self.latency.percentile(95, min_samples=Config.LLM_HEDGE_MIN_SAMPLES)
+        if p95 is None:
+            return None
+        return max(p95, Config.LLM_HEDGE_MIN_DELAY)
+    
+    def _attempt(self, prompt: str, generation_config: dict, deadline: float) -> str:
+        """1회 시도: 데드라인 내 응답 대기 + p95를 넘기면 헤지 요청 추가"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("LLM 데드라인 초과")
+        self._acquire_quota(timeout=remaining)
+        
+        started = time.monotonic()
+        futures = [self._executor.submit(self._generate, prompt, generation_config)]
+        
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is not None and started + hedge_delay < deadline:
+            done, _ = wait(futures, timeout=hedge_delay)
+            # 쿼터 여유가 있을 때만 헤지 (한도를 넘겨가며 중복 호출하지 않음)
+            if not done and self.rate_limiter.acquire(timeout=0):
+                print(f"🪁 LLM 헤지 요청 전송 ({hedge_delay:.1f}s 경과)")
+                self._count('hedged')
+                futures.append(self._executor.submit(self._generate, prompt, generation_config))
+        
+        pending = set(futures)
+        last_error = None
+        while pending:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.latency.record(time.monotonic() - started)
+                    if len(futures) > 1 and future is futures[1]:
+                        self._count('hedge_wins')
+                    return future.result()
+                last_error = future.exception()
+        
+        if pending:
+            for future in pending:
+                future.cancel()
+            self._count('timeouts')
+            raise TimeoutError(f"LLM 데드라인 초과 ({Config.LLM_DEADLINE}s)")
+        raise last_error
+    
+    def _call(self, prompt: str, generation_config: dict = None) -> str:
+        """데드라인 + 지터 재시도 + (선택) 헤지 요청 + 서킷 브레이커를 적용한 Gemini 호출"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Gemini 서킷 브레이커 OPEN - 호출을 건너뜁니다")
+        
+        self._count('calls')
+        deadline = time.monotonic() + Config.LLM_DEADLINE
+        attempt = 0
+        while True:
+            try:
+                text = self._attempt(prompt, generation_config, deadline)
+                self._record_outcome()
+                return text
+            except Exception as e:
+                self._record_outcome(e)
+                
+                delay = backoff_delay(attempt, Config.LLM_RETRY_BASE_DELAY, Config.LLM_RETRY_MAX_DELAY)
+                if (not isinstance(e, RETRYABLE_ERRORS)
+                        or attempt >= Config.LLM_MAX_RETRIES
+                        or self.breaker.state == CircuitBreaker.OPEN
+                        or time.monotonic() + delay >= deadline):
+                    self._count('failures')
+                    raise
+                
+                attempt += 1
+                self._count('retries')
+                print(f"🔁 LLM 재시도 {attempt}/{Config.LLM_MAX_RETRIES} ({delay:.2f}s 후): {e}")
+                time.sleep(delay)
+                # 재시도 전에 브레이커 확인 (half_open 시험 슬롯 재확보)
+                if not self.breaker.allow():
+                    self._count('failures')
+                    raise CircuitOpenError("Gemini 서킷 브레이커 OPEN - 재시도를 중단합니다")
+    
+    def health(self) -> dict:
+        """모니터링용 LLM 클라이언트 상태 (서킷 브레이커, 지연 시간, 호출 통계)"""
+        with self._counters_lock:
+            counters = dict(self._counters)
+        return {
+            'circuit_breaker': self.breaker.stats(),
+            'latency': self.latency.stats(),
+            'counters': counters,
+            'deadline_seconds': Config.LLM_DEADLINE,
+            'hedge_enabled': Config.LLM_HEDGE_ENABLED,
+            'hedge_delay_seconds': self._hedge_delay()
+        }
+    
+    def close(self) -> None:
+        """LLM 호출 스레드 풀 종료"""
+        self._executor.shutdown(wait=False)
     
     def generate_copy(self, prompt: str, temperature: float = 0.7) -> str:
         """
@@ -20,15 +176,91 @@ class LLMService:
             print(prompt)
             
             # 안전한 기본 설정
-            response = self.model.generate_content(
-                prompt,
-                generation_config={"temperature": temperature}
-            )
-            return response.text
+            return self._call(prompt, generation_config={"temperature": temperature})
+        except CircuitOpenError as e:
+            print(f"⛔ {e}")
+            return ""
         except Exception as e:
             print(f"❌ LLM 호출 오류: {e}")
             return ""
     
+    def generate_copy_stream(self, prompt: str, temperature: float = 0.7):
+        """
+        Gemini 스트리밍 응답으로 마케팅 문구 생성 (텍스트 청크 단위 yield)
+        
+        첫 청크를 받기 전의 재시도 가능한 오류만 재시도하고, 청크 사이에 데드라인을 확인
+        """
+        print("=" * 80)
+        print("LLM 문구 생성 (스트리밍)")
+        print(f"Temperature: {temperature}")
+        print("=" * 80)
+        print(prompt)
+        
+        if not self.breaker.allow():
+            print("⛔ Gemini 서킷 브레이커 OPEN - 호출을 건너뜁니다")
+            return
+        
+        self._count('calls')
+        deadline = time.monotonic() + Config.LLM_DEADLINE
+        attempt = 0
+        # allow()로 확보한 슬롯에 결과를 아직 반영하지 않았는지 (클라이언트 연결 종료 시 finally에서 반납)
+        pending = True
+        try:
+            while True:
+                yielded = False
+                try:
+                    self._acquire_quota(timeout=deadline - time.monotonic())
+                    started = time.monotonic()
+                    
+                    response = self.model.generate_content(
+                        prompt,
+                        generation_config={"temperature": temperature},
+                        stream=True
+                    )
+                    for chunk in response:
+                        if time.monotonic() > deadline:
+                            self._count('timeouts')
+                            raise TimeoutError(f"LLM 데드라인 초과 ({Config.LLM_DEADLINE}s)")
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            # 안전 필터 등으로 텍스트가 없는 청크는 건너뜀
+                            continue
+                        if text:
+                            yielded = True
+                            yield text
+                    
+                    self.latency.record(time.monotonic() - started)
+                    self._record_outcome()
+                    pending = False
+                    return
+                except Exception as e:
+                    self._record_outcome(e)
+                    pending = False
+                    
+                    delay = backoff_delay(attempt, Config.LLM_RETRY_BASE_DELAY, Config.LLM_RETRY_MAX_DELAY)
+                    if (yielded
+                            or not isinstance(e, RETRYABLE_ERRORS)
+                            or attempt >= Config.LLM_MAX_RETRIES
+                            or time.monotonic() + delay >= deadline):
+                        self._count('failures')
+                        print(f"❌ LLM 스트리밍 호출 오류: {e}")
+                        return
+                    
+                    attempt += 1
+                    self._count('retries')
+                    print(f"🔁 LLM 스트리밍 재시도 {attempt}/{Config.LLM_MAX_RETRIES} ({delay:.2f}s 후): {e}")
+                    time.sleep(delay)
+                    if not self.breaker.allow():
+                        self._count('failures')
+                        print("⛔ Gemini 서킷 브레이커 OPEN - 재시도를 중단합니다")
+                        return
+                    pending = True
+        finally:
+            # 스트리밍 중 클라이언트가 끊기면 GeneratorExit로 결과 없이 종료 → half_open 시험 슬롯 반납
+            if pending:
+                self.breaker.release()
+    
     def analyze_trends(self, trend_data: list) -> dict:
         """
         트렌드 데이터 분석 및 키워드 추출
@@ -45,8 +277,7 @@ class LLMService:
 JSON 형식으로 응답해주세요.
 """
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._call(prompt)
         except Exception as e:
             print(f"❌ 트렌드 분석 오류: {e}")
             return {}
@@ -1,18 +1,43 @@
-from db import get_trends_db, get_phrases_db
+from db import get_trends_db, connection, transaction
 from core.llm import LLMService
 from core.vector_store import VectorStore
+from core.cache import generation_cache, semantic_cache, make_cache_key
+from core.concurrency import run_stages, split_count, generation_flights
+from core.parser import CopyParser, parse_copies, capture_output
+from core.prompt import prompt_builder
+from config import Config
 import json
+import re
+
+# 브리프의 숫자 값 (할인율, 금액, 기간 등) → 시맨틱 캐시에서 정확히 일치해야 하는 값
+_NUMBER_TOKEN = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(%|퍼센트|만원|천원|원|개|일|시간|대)?')
+_NUMBER_UNITS = {'퍼센트': '%'}
+
+
+def _normalize_fact(value) -> str:
+    return ' '.join(str(value or '').lower().split())
+
+
+def _number_tokens(*texts) -> tuple:
+    """텍스트의 숫자 값을 정규화한 토큰 목록 ('30 %', '30퍼센트' → '30%', '10,000원' → '10000원')"""
+    tokens = set()
+    for text in texts:
+        for number, unit in _NUMBER_TOKEN.findall(str(text or '')):
+            tokens.add(number.replace(',', '') + _NUMBER_UNITS.get(unit, unit))
+    return tuple(sorted(tokens))
 
 class MarketingLogic:
-    def __init__(self):
-        self.llm = LLMService()
-        self.vector_store = VectorStore()
+    def __init__(self, llm: LLMService = None, vector_store: VectorStore = None):
+        # 공유 인스턴스를 주입받으면 재사용 (서비스 레지스트리), 없으면 새로 생성
+        self.llm = llm or LLMService()
+        self.vector_store = vector_store or VectorStore()
+        self.generation_cache = generation_cache
+        self.semantic_cache = semantic_cache
+        self.flights = generation_flights
+        self.prompt_builder = prompt_builder
     
     def get_team_style(self, team_id: str, sort_by: str = 'conversion_rate', limit: int = 50, channel: str = None) -> list:
         """팀별 과거 문구 스타일 가져오기 - 정렬 옵션 및 채널 필터링 지원"""
-        conn = get_phrases_db()
-        cursor = conn.cursor()
-        
         # 정렬 기준 설정
         sort_columns = {
             'latest': 'send_date DESC',
@@ -25,34 +50,35 @@ class MarketingLogic:
         
         order_clause = sort_columns.get(sort_by, 'conversion_rate DESC, ctr DESC')
         
-        # 채널 필터링 조건 추가
+        # 채널 필터링 조건 추가 (값은 바인딩 → 채널과 관계없이 같은 SQL이라 준비된 문장 캐시 재사용)
         channel_condition = ""
+        query_params = [team_id]
         if channel:
-            channel_condition = f"AND channel = '{channel}'"
+            channel_condition = "AND channel = ?"
+            query_params.append(channel)
+        query_params.append(limit)
         
         # 성과가 좋았던 문구 우선 조회
-        cursor.execute(f"""
-            SELECT 
-                copy_id,
-                content_data, 
-                keywords,
-                target_audience, 
-                tone,
-                send_date,
-                ctr, 
-                conversion_rate,
-                impression_count,
-                click_count,
-                conversion_count,
-                channel
-            FROM marketing_copies
-            WHERE team_id = ? {channel_condition}
-            ORDER BY {order_clause}
-            LIMIT ?
-        """, (team_id, limit))
-        
-        results = cursor.fetchall()
-        conn.close()
+        with connection() as conn:
+            results = conn.execute(f"""
+                SELECT 
+                    copy_id,
+                    content_data, 
+                    keywords,
+                    target_audience, 
+                    tone,
+                    send_date,
+                    ctr, 
+                    conversion_rate,
+                    impression_count,
+                    click_count,
+                    conversion_count,
+                    channel
+                FROM marketing_copies
+                WHERE team_id = ? {channel_condition}
+                ORDER BY {order_clause}
+                LIMIT ?
+            """, query_params).fetchall()
         
         # 결과를 프론트엔드가 기대하는 형태로 변환
         copies = []
@@ -94,19 +120,14 @@ class MarketingLogic:
     
     def get_recent_trends(self, limit: int = 10) -> list:
         """최신 트렌드 가져오기"""
-        conn = get_trends_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT keyword, category, mention_count, trend_score
-            FROM trends
-            WHERE is_valid = 1
-            ORDER BY collected_at DESC, trend_score DESC
-            LIMIT ?
-        """, (limit,))
-        
-        results = cursor.fetchall()
-        conn.close()
+        with connection(get_trends_db) as conn:
+            results = conn.execute("""
+                SELECT keyword, category, mention_count, trend_score
+                FROM trends
+                WHERE is_valid = 1
+                ORDER BY collected_at DESC, trend_score DESC
+                LIMIT ?
+            """, (limit,)).fetchall()
         
         return [dict(row) for row in results]
     
@@ -120,26 +141,210 @@ class MarketingLogic:
             'target_audience': '선택',
             'reference_text': '선택',
             'tone': '선택',
-            'count': 5 (기본값)
+            'count': 5 (기본값),
+            'bypass_cache': 'false' (기본값, 'true'면 생성 캐시를 건너뜀),
+            'semantic_cache': SEMANTIC_CACHE_ENABLED (기본값, 'false'면 유사 브리프 캐시만 건너뜀)
+        }
+        
+        동일한 브리프가 동시에 들어오면 하나만 실행하고 나머지는 그 결과를 공유
+        """
+        result, shared = self.flights.do(
+            make_cache_key(params),
+            lambda: self._generate_marketing_copy(params)
+        )
+        if shared:
+            print("🔗 진행 중인 동일 요청 결과 공유")
+            result['coalesced'] = True
+        return result
+    
+    def _generate_marketing_copy(self, params: dict) -> dict:
+        # 유사한 브리프의 결과가 있으면 검색/LLM 호출 없이 바로 반환
+        cached, semantic_key = self._semantic_lookup(params)
+        if cached is not None:
+            return cached
+        
+        ctx = self._prepare_generation(params)
+        
+        if not ctx['bypass_cache']:
+            cached = self.generation_cache.get(ctx['cache_key'])
+            if cached is not None:
+                print(f"⚡ 생성 캐시 적중: {ctx['cache_key'][:12]}")
+                cached['cached'] = True
+                cached['cache_type'] = 'exact'
+                return cached
+        
+        # 4. LLM 호출 (Temperature 설정 가능)
+        if len(ctx['sub_prompts']) > 1:
+            # 분할된 프롬프트를 동시에 호출한 뒤 순서대로 병합
+            llm_results = run_stages(
+                {
+                    f"llm_{i}": (lambda p=p: self.llm.generate_copy(p, temperature=ctx['temperature']))
+                    for i, p in enumerate(ctx['sub_prompts'])
+                },
+                timeout=Config.LLM_STAGE_TIMEOUT,
+                concurrent=True
+            )
+            copies = []
+            seen_copies = set()
+            for i, n in enumerate(ctx['sub_counts']):
+                capture_output(llm_results[f"llm_{i}"], ctx['channel'])
+                for copy in parse_copies(llm_results[f"llm_{i}"], ctx['channel'])[:n]:
+                    # 분할 호출 간 중복 문구 제거
+                    combination = f"{copy.get('title') or copy.get('button', '')}|{copy.get('message', '')}"
+                    if combination not in seen_copies:
+                        seen_copies.add(combination)
+                        copies.append(copy)
+        else:
+            result = self.llm.generate_copy(ctx['prompt'], temperature=ctx['temperature'])
+            
+            capture_output(result, ctx['channel'])
+            
+            # 5. 결과 파싱
+            copies = parse_copies(result, ctx['channel'])
+        
+        copies = self._finalize_copies(copies, ctx['channel'])
+        
+        generated = {
+            'copies': copies[:ctx['count']],
+            'referenced_phrases': ctx['referenced_phrases'],
+            'prompt_stats': ctx['prompt_stats'],
+            'retrieval_stats': ctx['retrieval_stats']
         }
+        
+        # 빈 결과(LLM 오류 등)는 캐시하지 않음
+        if generated['copies']:
+            self.generation_cache.set(ctx['cache_key'], generated)
+            self._semantic_store(semantic_key, generated)
+        
+        generated['cached'] = False
+        return generated
+    
+    def generate_marketing_copy_stream(self, params: dict):
+        """
+        마케팅 문구 스트리밍 생성 (SSE용)
+        
+        번호가 붙은 문구가 완성될 때마다 이벤트를 yield:
+        ('meta', {...}) → ('copy', {...}) × N → ('done', {...})
+        """
+        cached, semantic_key = self._semantic_lookup(params)
+        if cached is not None:
+            yield 'meta', {'referenced_phrases': cached['referenced_phrases']}
+            for index, copy in enumerate(cached['copies']):
+                yield 'copy', {'index': index, 'copy': copy}
+            yield 'done', {'count': len(cached['copies']), 'cached': True, 'cache_type': 'semantic'}
+            return
+        
+        ctx = self._prepare_generation(params)
+        channel = ctx['channel']
+        count = ctx['count']
+        
+        yield 'meta', {
+            'referenced_phrases': ctx['referenced_phrases'],
+            'prompt_stats': ctx['prompt_stats'],
+            'retrieval_stats': ctx['retrieval_stats']
+        }
+        
+        if not ctx['bypass_cache']:
+            cached = self.generation_cache.get(ctx['cache_key'])
+            if cached is not None:
+                print(f"⚡ 생성 캐시 적중: {ctx['cache_key'][:12]}")
+                for index, copy in enumerate(cached['copies']):
+                    yield 'copy', {'index': index, 'copy': copy}
+                yield 'done', {'count': len(cached['copies']), 'cached': True, 'cache_type': 'exact'}
+                return
+        
+        # 4. LLM 스트리밍 호출 (다음 번호가 시작되면 이전 문구가 완성된 것으로 간주)
+        parser = CopyParser(channel)
+        raw_chunks = []
+        copies = []
+        for chunk in self.llm.generate_copy_stream(ctx['prompt'], temperature=ctx['temperature']):
+            raw_chunks.append(chunk)
+            for copy in parser.feed(chunk):
+                if len(copies) < count:
+                    copy = self._finalize_copies([copy], channel)[0]
+                    yield 'copy', {'index': len(copies), 'copy': copy}
+                    copies.append(copy)
+        
+        # 5. 마지막 문구(또는 fallback 결과) 전송
+        capture_output("".join(raw_chunks), channel)
+        for copy in parser.close():
+            if len(copies) < count:
+                copy = self._finalize_copies([copy], channel)[0]
+                yield 'copy', {'index': len(copies), 'copy': copy}
+                copies.append(copy)
+        
+        generated = {
+            'copies': copies,
+            'referenced_phrases': ctx['referenced_phrases'],
+            'prompt_stats': ctx['prompt_stats'],
+            'retrieval_stats': ctx['retrieval_stats']
+        }
+        if copies:
+            self.generation_cache.set(ctx['cache_key'], generated)
+            self._semantic_store(semantic_key, generated)
+        
+        yield 'done', {'count': len(copies), 'cached': False}
+    
+    def _semantic_lookup(self, params: dict):
+        """
+        시맨틱 캐시 조회 → (캐시 결과 또는 None, 저장용 키)
+        
+        같은 팀/채널/스타일 안에서 검색 쿼리 임베딩이 충분히 가까운 브리프의 결과를 재사용
+        브랜드/이벤트명/할인 유형과 브리프의 숫자 값(할인율, 금액 등)은 임베딩으로 구분되지 않으므로 정확히 일치해야 함
         """
+        bypass_cache = str(params.get('bypass_cache', 'false')).lower() == 'true'
+        enabled = str(params.get('semantic_cache', Config.SEMANTIC_CACHE_ENABLED)).lower() == 'true'
+        if bypass_cache or not enabled:
+            return None, None
+        
+        partition = (
+            str(params.get('team_id') or ''),
+            params.get('channel', 'RCS'),
+            params.get('tone', '전문적이고 친근한'),
+            params.get('use_emoji', 'true').lower() == 'true',
+            params.get('reference_text', ''),
+            params.get('count', 5),
+            _normalize_fact(params.get('brand')),
+            _normalize_fact(params.get('event_name')),
+            _normalize_fact(params.get('discount_type')),
+            _number_tokens(params.get('topic'), params.get('discount_type'), params.get('appeal_point'),
+                           params.get('event_name'), params.get('target_audience'))
+        )
+        
+        try:
+            # RAG 검색과 같은 쿼리이므로 쿼리 임베딩 캐시를 공유
+            vector = self.vector_store.embed_query(self._build_search_query(params))
+        except Exception as e:
+            print(f"❌ 시맨틱 캐시 임베딩 실패: {e}")
+            return None, None
+        
+        hit = self.semantic_cache.lookup(partition, vector)
+        if hit is None:
+            return None, (partition, vector)
+        
+        cached, similarity = hit
+        print(f"⚡ 시맨틱 캐시 적중: 유사도 {similarity:.3f}")
+        cached['cached'] = True
+        cached['cache_type'] = 'semantic'
+        cached['similarity'] = similarity
+        return cached, (partition, vector)
+    
+    def _semantic_store(self, semantic_key, generated: dict) -> None:
+        """생성 결과를 시맨틱 캐시에 저장"""
+        if semantic_key is None:
+            return
+        partition, vector = semantic_key
+        self.semantic_cache.add(partition, vector, generated)
+    
+    def _build_search_query(self, params: dict) -> str:
+        """브리프에서 벡터 검색용 쿼리 구성 (키워드 + 타겟)"""
         topic = params.get('topic')
-        team_id = params.get('team_id')
         target_audience = params.get('target_audience', '일반 대중')
-        tone = params.get('tone', '전문적이고 친근한')
-        count = params.get('count', 5)
-        reference_text = params.get('reference_text', '')
         discount_type = params.get('discount_type', '')
         appeal_point = params.get('appeal_point', '')
         brand = params.get('brand', '')
         event_name = params.get('event_name', '')
-        channel = params.get('channel', 'RCS')
-        use_emoji = params.get('use_emoji', 'true').lower() == 'true'
-        
-        # 1. RAG를 통한 관련 문구 검색
-        rag_context = ""
         
-        # 검색 쿼리 구성 (키워드와 타겟으로 유사도 계산)
         search_query_parts = []
         
         # 키워드 관련 요소들
@@ -159,72 +364,89 @@ class MarketingLogic:
             search_query_parts.append(target_audience)
         
         search_query = " ".join(search_query_parts)
+        return search_query
+    
+    def _prepare_generation(self, params: dict) -> dict:
+        """RAG 검색 + 트렌드 조회 + 프롬프트 구성 (LLM 호출 직전까지)"""
+        topic = params.get('topic')
+        team_id = params.get('team_id')
+        target_audience = params.get('target_audience', '일반 대중')
+        tone = params.get('tone', '전문적이고 친근한')
+        count = params.get('count', 5)
+        reference_text = params.get('reference_text', '')
+        discount_type = params.get('discount_type', '')
+        appeal_point = params.get('appeal_point', '')
+        brand = params.get('brand', '')
+        event_name = params.get('event_name', '')
+        channel = params.get('channel', 'RCS')
+        use_emoji = params.get('use_emoji', 'true').lower() == 'true'
+        bypass_cache = str(params.get('bypass_cache', 'false')).lower() == 'true'
+        concurrent = str(params.get('concurrent', Config.PIPELINE_CONCURRENT)).lower() == 'true'
         
-        # 벡터 저장소 상태 확인
-        try:
-            stats = self.vector_store.get_collection_stats()
-            print(f"\n📊 벡터 저장소 상태: {stats}")
-        except Exception as e:
-            print(f"\n❌ 벡터 저장소 상태 확인 실패: {e}")
+        # 1. RAG를 통한 관련 문구 검색
+        # 검색 쿼리 구성 (키워드와 타겟으로 유사도 계산)
+        search_query = self._build_search_query(params)
         
-        # 벡터 검색으로 관련 문구 찾기 (채널/팀 필터링 + 키워드/타겟 유사도)
+        # 벡터 저장소 상태 확인 / 벡터 검색 / 트렌드 조회는 서로 독립적이므로 동시에 실행
         print(f"\n🔍 벡터 검색 시작 (쿼리: '{search_query}')")
         print(f"📋 필터링 조건: team_id={team_id}, channel={channel}")
         print(f"📋 성과 기준: min_ctr=0.01, min_conversion_rate=0.005, min_similarity=0.6")
         
-        try:
-            similar_phrases = self.vector_store.search_similar_phrases(
-                query=search_query,
-                n_results=20,  # 충분한 후보 확보
-                team_id=team_id,
-                channel=channel,  # 동일한 채널만 검색
-                min_ctr=0.01,  # CTR 1% 이상
-                min_conversion_rate=0.005,  # 전환율 0.5% 이상
-                min_similarity=0.6  # 유사도 60% 이상으로 강화
-            )
-            print(f"📊 벡터 검색 결과: {len(similar_phrases)}개 문구 발견 (채널: {channel})")
-        except Exception as e:
-            print(f"❌ 벡터 검색 실패: {e}")
-            similar_phrases = []
+        stage_results = run_stages(
+            {
+                'stats': self.vector_store.get_collection_stats,
+                # 벡터 검색으로 관련 문구 찾기 (모든 필터를 쿼리에 적용, 기준을 넘는 후보가 모일 때까지 확장)
+                'search': lambda: self.vector_store.retrieve(
+                    query=search_query,
+                    n_results=Config.RAG_CANDIDATES,  # 충분한 후보 확보
+                    team_id=team_id,
+                    channel=channel,  # 동일한 채널만 검색
+                    min_ctr=0.01,  # CTR 1% 이상
+                    min_conversion_rate=0.005,  # 전환율 0.5% 이상
+                    min_similarity=0.6  # 유사도 60% 이상으로 강화
+                ),
+                'trends': lambda: self.get_recent_trends(5)
+            },
+            timeout=Config.PIPELINE_STAGE_TIMEOUT,
+            defaults={'stats': None, 'search': None, 'trends': []},
+            concurrent=concurrent
+        )
+        
+        print(f"\n📊 벡터 저장소 상태: {stage_results['stats']}")
+        retrieval = stage_results['search'] or {'results': [], 'scanned': 0, 'rounds': 0, 'exhausted': True, 'lexical': 0}
+        similar_phrases = retrieval['results']
+        retrieval_stats = {key: retrieval[key] for key in ('scanned', 'rounds', 'exhausted', 'lexical')}
+        retrieval_stats['found'] = len(similar_phrases)
+        print(f"📊 벡터 검색 결과: {len(similar_phrases)}개 문구 발견 (채널: {channel}, "
+              f"후보 {retrieval['scanned']}개 검토, {retrieval['rounds']}회 조회, 어휘 검색 추가 {retrieval['lexical']}개)")
         
         # unique_phrases 초기화 (프롬프트에서 사용하기 위해)
         unique_phrases = []
         
         if similar_phrases:
-            # 중복 제거: 동일한 제목+내용 조합 제거
-            unique_phrases = []
-            seen_combinations = set()
-            
-            for phrase in similar_phrases:
-                combination = f"{phrase['title']}|{phrase['message']}"
-                if combination not in seen_combinations:
-                    seen_combinations.add(combination)
-                    unique_phrases.append(phrase)
-            
-            # CTR 순서로 정렬 (높은 CTR 우선)
-            unique_phrases.sort(key=lambda x: x['ctr'], reverse=True)
-            
-            # 상위 3개만 선택
-            unique_phrases = unique_phrases[:3]
+            # 재정렬: 유사도 + CTR + 전환율 가중 점수에 MMR 다양성 반영 (검색 단계에서 제목+내용 중복은 이미 제거)
+            try:
+                unique_phrases = self.vector_store.rerank(search_query, similar_phrases, top_n=Config.RERANK_TOP_N)
+            except Exception as e:
+                print(f"⚠️ 재정렬 실패, CTR 순으로 대체: {e}")
+                unique_phrases = sorted(similar_phrases, key=lambda x: x['ctr'], reverse=True)[:Config.RERANK_TOP_N]
             
             # 디버깅: 참고 문구 콘솔 출력
             print(f"\n🔍 RAG 검색 결과 (쿼리: '{search_query}')")
-            print(f"📊 전체 검색: {len(similar_phrases)}개 → 중복 제거 후: {len(unique_phrases)}개")
+            print(f"📊 전체 검색: {len(similar_phrases)}개 → 재정렬 후: {len(unique_phrases)}개")
             print("=" * 80)
             
-            examples = []
             for i, phrase in enumerate(unique_phrases):
+                ranking = phrase.get('ranking') or {}
                 print(f"📝 참고 문구 {i+1}:")
                 print(f"   유사도: {phrase['similarity_score']:.3f}")
+                if ranking:
+                    print(f"   재정렬: relevance {ranking['relevance']:.3f}, 중복도 {ranking['redundancy']:.3f}, MMR {ranking['mmr_score']:.3f}")
                 print(f"   성과: CTR {phrase['ctr']:.2%}, 전환율 {phrase['conversion_rate']:.2%}")
                 print(f"   제목: {phrase['title']}")
                 print(f"   내용: {phrase['message']}")
                 print(f"   팀: {phrase['team_id']}")
                 print("-" * 60)
-                
-                examples.append(f"- {phrase['title']}: {phrase['message']} (CTR: {phrase['ctr']:.2%}, 전환율: {phrase['conversion_rate']:.2%})")
-            
-            rag_context = f"\n\n### 성과 좋은 유사 문구 참고:\n" + "\n".join(examples)
             print("=" * 80)
         else:
             print(f"\n⚠️ 벡터 검색 결과가 없습니다. 검색 조건을 완화하거나 데이터를 확인해주세요.")
@@ -232,122 +454,59 @@ class MarketingLogic:
             print(f"   팀 ID: {team_id}")
             print("=" * 80)
         
-        # 2. 최신 트렌드 조회
-        trends = self.get_recent_trends(5)
-        trend_keywords = ", ".join([t['keyword'] for t in trends])
-        trend_context = f"\n\n### 최신 트렌드 키워드:\n{trend_keywords}"
-        
-        # 3. LLM 프롬프트 구성
-        discount_context = ""
-        if discount_type:
-            discount_context = f"\n\n### 할인 유형:\n{discount_type}\n(반드시 이 할인 정보를 문구에 포함해주세요)"
+        # 2. 최신 트렌드 (위에서 동시 조회한 결과 사용)
+        trends = stage_results['trends'] or []
+        trend_keywords = [t['keyword'] for t in trends]
+        
+        # 3. LLM 프롬프트 구성 (채널별 템플릿 + 토큰 예산에 맞춰 RAG 예시/참고 텍스트/트렌드 축소)
+        plan = self.prompt_builder.build(
+            channel,
+            count,
+            {
+                'topic': topic,
+                'target_audience': target_audience,
+                'tone': tone,
+                'reference_text': reference_text,
+                'discount_type': discount_type,
+                'appeal_point': appeal_point,
+                'brand': brand,
+                'event_name': event_name,
+                'use_emoji': use_emoji
+            },
+            examples=unique_phrases,
+            trend_keywords=trend_keywords
+        )
+        prompt = plan.prompt
+        
+        # 개수가 많으면 여러 번의 작은 LLM 호출로 나눠서 동시에 실행
+        sub_counts = [count]
+        if concurrent and count > Config.LLM_SPLIT_THRESHOLD:
+            sub_counts = split_count(count, Config.LLM_SPLIT_SIZE)
+        sub_prompts = [plan.render(n) for n in sub_counts] if len(sub_counts) > 1 else [prompt]
         
-        appeal_context = ""
-        if appeal_point:
-            appeal_context = f"\n\n### 소구 포인트:\n{appeal_point}\n(고객에게 어필할 핵심 포인트를 강조해주세요)"
-        
-        brand_context = ""
-        if brand:
-            brand_context = f"\n\n### 브랜드:\n{brand}"
-            
-        event_context = ""
-        if event_name:
-            event_context = f"\n\n### 행사명:\n{event_name}"
-        
-        emoji_instruction = ""
-        if use_emoji:
-            emoji_instruction = "\n- 이모지를 적절히 사용하여 시각적 효과를 높이세요"
-        else:
-            emoji_instruction = "\n- 이모지는 사용하지 마세요"
-        
-        if channel == 'RCS':
-            # 실제 참고 문구를 사용한 예시 생성
-            example_format = ""
-            if unique_phrases and len(unique_phrases) > 0:
-                for i, phrase in enumerate(unique_phrases[:3]):  # 상위 3개 사용
-                    # 안전한 딕셔너리 접근
-                    title = phrase.get('title', '버튼 텍스트')
-                    message = phrase.get('message', '메시지 내용')
-                    example_format += f"""
-{i+1}. 버튼: {title}
-메시지: {message}
-
-"""
-            else:
-                example_format = """
-1. 버튼: 지금 바로 구매하기
-메시지: 롯데ON 뷰티 세일! ✨
-
-신규고객 30% 할인 혜택
-
-봄신상 뷰티템을 특가로 만나보세요! 💖
-
-2. 버튼: 뷰티 혜택 확인하기
-메시지: 롯데ON에서 뷰티 세일 진행중! 🎉
-
-최대 30% 할인에 신규고객 추가 혜택까지!
-
-지금 바로 확인해보세요 ✨
-
-"""
-
-            prompt = f"""
-당신은 전문 마케팅 카피라이터입니다. RCS 메시지용 마케팅 문구를 {count}개 생성해주세요.
-
-### 주제:
-{topic}{brand_context}{event_context}
-
-### 타겟 고객:
-{target_audience}
-
-### 톤앤매너:
-{tone}{discount_context}{appeal_context}
-{rag_context}
-
-### 참고 텍스트:
-{reference_text if reference_text else '없음'}
-
-### RCS 요구사항:
-1. 버튼 텍스트는 15자 이내로 간결하고 매력적인 문구 작성
-2. 메시지는 100자 이내로 작성하며 문단 단위로 줄바꿈을 두 번씩 하여 가독성 향상
-3. 할인 혜택은 숫자와 함께 강조하여 표시 (예: 30% 할인, 최대 50% OFF)
-4. 센스있는 후킹 문구로 고객의 관심을 끌어야 함
-5. 이모지를 적절히 사용하여 시각적 효과를 높이세요(이모지를 사용하는 경우 브랜드 양옆에 동일한 이모지를 넣어 강조)
-6. 타겟 고객의 감성을 자극하는 표현 사용
-7. 최신 트렌드를 자연스럽게 반영
-
-### 출력 형식 (정확히 이 형식을 따라주세요):
-{example_format}
-위와 같은 형식으로 반드시 버튼과 메시지를 모두 포함하여 출력하세요.
-메시지는 문단 단위로 줄바꿈을 두 번씩 하여 가독성을 높이고, 할인 혜택을 강조하세요.
-
-"""
-        else:  # APP_PUSH
-            prompt = f"""
-앱푸시 마케팅 문구를 {count}개 생성해주세요.
-
-주제: {topic}{brand_context}{event_context}
-타겟: {target_audience}
-톤: {tone}{discount_context}{appeal_context}
-{rag_context}
-
-각 문구는 반드시 다음 형식으로 출력하세요:
-1. 타이틀: [15-20자 제목]
-본문: (광고) [40자 이내 내용]{emoji_instruction}
-2. 타이틀: [15-20자 제목]
-본문: (광고) [40자 이내 내용]{emoji_instruction}
-
-타이틀과 본문을 모두 포함해야 합니다.
-"""
-        
-        # 4. LLM 호출 (Temperature 설정 가능)
         temperature = params.get('temperature', 2.0)  # 기본값 0.6
-        result = self.llm.generate_copy(prompt, temperature=temperature)
         
-        # 참고 문구 정보 저장 (API 응답용)
+        # 생성 캐시 키 (정규화된 브리프 + 최종 프롬프트)
+        cache_key = make_cache_key({
+            'topic': topic,
+            'team_id': team_id,
+            'target_audience': target_audience,
+            'tone': tone,
+            'count': count,
+            'reference_text': reference_text,
+            'discount_type': discount_type,
+            'appeal_point': appeal_point,
+            'brand': brand,
+            'event_name': event_name,
+            'channel': channel,
+            'use_emoji': use_emoji,
+            'temperature': temperature
+        }, prompt)
+        
+        # 참고 문구 정보 저장 (API 응답용, 예산 안에서 실제 프롬프트에 들어간 문구만)
         referenced_phrases = []
-        if similar_phrases and unique_phrases and len(unique_phrases) > 0:
-            for phrase in unique_phrases[:3]:  # 상위 3개만
+        if similar_phrases and plan.examples:
+            for phrase in plan.examples:
                 referenced_phrases.append({
                     'title': phrase.get('title', ''),
                     'message': phrase.get('message', ''),
@@ -355,118 +514,27 @@ class MarketingLogic:
                     'ctr': phrase.get('ctr', 0),
                     'conversion_rate': phrase.get('conversion_rate', 0),
                     'team_id': phrase.get('team_id', ''),
-                    'channel': phrase.get('channel', '')
+                    'channel': phrase.get('channel', ''),
+                    'ranking': phrase.get('ranking')
                 })
         
-        # 5. 결과 파싱
-        copies = []
-        if channel == 'APP_PUSH':
-            # 앱푸시 파싱: "타이틀: [내용]\n본문: [내용]" 형식
-            lines = result.split('\n')
-            current_copy = {}
-            
-            for line in lines:
-                line = line.strip()
-
-                # "타이틀:" 또는 "5. 타이틀:" 형태 모두 처리
-                if '타이틀:' in line:
-                    if current_copy and current_copy.get('title'):
-                        # 본문이 없어도 타이틀만으로 문구 생성
-                        if not current_copy.get('message'):
-                            current_copy['message'] = '(광고) ' + current_copy.get('title', '')
-                        copies.append(current_copy)
-
-                    # "타이틀:" 이후의 텍스트만 추출
-                    title_text = line.split('타이틀:', 1)[1].strip()
-                    # 마크다운 형식 제거
-                    title_text = title_text.replace('**', '')
-                    current_copy = {'title': title_text, 'message': ''}
-
-                elif '본문:' in line:
-                    if current_copy:
-                        # "본문:" 이후의 텍스트만 추출
-                        message_text = line.split('본문:', 1)[1].strip()
-                        # 마크다운 형식 제거
-                        message_text = message_text.replace('**', '')
-                        current_copy['message'] = message_text
-            
-            # 마지막 문구 추가
-            if current_copy and current_copy.get('title'):
-                if not current_copy.get('message'):
-                    current_copy['message'] = '(광고) ' + current_copy.get('title', '')
-                copies.append(current_copy)
-                
-            # 파싱 실패 시 전체 텍스트를 메시지로 처리
-            if not copies:
-                for line in result.split('\n'):
-                    line = line.strip()
-                    if line and line[0].isdigit():
-                        copy_text = line.split('.', 1)[1].strip()
-                        copies.append({'message': copy_text})
-        else:
-            # RCS 파싱: 줄바꿈 보존 개선
-            lines = result.split('\n')
-            current_copy = {}
-            
-            for i, line in enumerate(lines):
-                original_line = line  # 원본 줄바꿈 보존
-                line = line.strip()
-                
-                # 번호가 있는 줄인지 확인
-                if line and line[0].isdigit():
-                    # 기존 문구가 있으면 저장
-                    if current_copy and (current_copy.get('button') or current_copy.get('message')):
-                        copies.append(current_copy)
-                    
-                    # 새로운 문구 시작
-                    current_copy = {}
-                    
-                    # "1. " 같은 번호 제거
-                    content = line.split('.', 1)[1].strip()
-                    
-                    # 버튼과 메시지 구분
-                    if '버튼:' in content:
-                        button_text = content.split('버튼:', 1)[1].strip()
-                        button_text = button_text.replace('**', '')
-                        current_copy['button'] = button_text
-                    elif '메시지:' in content:
-                        message_text = content.split('메시지:', 1)[1].strip()
-                        message_text = message_text.replace('**', '')
-                        current_copy['message'] = message_text
-                    else:
-                        # 구분자가 없으면 메시지로 처리 (기존 방식)
-                        content = content.replace('**', '')
-                        current_copy['message'] = content
-                
-                elif line and current_copy and '메시지:' in line:
-                    # 메시지: 로 시작하는 줄 처리
-                    message_text = line.split('메시지:', 1)[1].strip()
-                    message_text = message_text.replace('**', '')
-                    current_copy['message'] = message_text
-                
-                elif current_copy and 'message' in current_copy:
-                    # 메시지 내용의 연속으로 처리 (줄바꿈 보존)
-                    if line == '':
-                        # 빈 줄이면 원본 줄바꿈 그대로 추가
-                        current_copy['message'] += original_line
-                    else:
-                        # 내용이 있는 줄이면 줄바꿈과 함께 추가
-                        current_copy['message'] += '\n' + line.replace('**', '')
-            
-            # 마지막 문구 저장
-            if current_copy and (current_copy.get('button') or current_copy.get('message')):
-                copies.append(current_copy)
-            
-            # 파싱이 실패한 경우 기존 방식으로 fallback
-            if not copies:
-                for line in result.split('\n'):
-                    line = line.strip()
-                    if line and line[0].isdigit():
-                        copy_text = line.split('.', 1)[1].strip()
-                        copy_text = copy_text.replace('**', '')
-                        copies.append({'message': copy_text})
-        
-        # RCS 메시지에 [롯데ON] 자동 추가 (안전한 버전)
+        return {
+            'prompt': prompt,
+            'sub_prompts': sub_prompts,
+            'sub_counts': sub_counts,
+            'concurrent': concurrent,
+            'channel': channel,
+            'count': count,
+            'temperature': temperature,
+            'cache_key': cache_key,
+            'bypass_cache': bypass_cache,
+            'referenced_phrases': referenced_phrases,
+            'prompt_stats': plan.to_dict(),
+            'retrieval_stats': retrieval_stats
+        }
+    
+    def _finalize_copies(self, copies: list, channel: str) -> list:
+        """RCS 메시지에 [롯데ON] 자동 추가 (안전한 버전)"""
         try:
             for copy in copies:
                 if isinstance(copy, dict) and 'message' in copy and channel == 'RCS':
@@ -480,10 +548,7 @@ class MarketingLogic:
             import traceback
             print(f"상세 오류: {traceback.format_exc()}")
         
-        return {
-            'copies': copies[:count],
-            'referenced_phrases': referenced_phrases
-        }
+        return copies
     
     def save_generated_copy(self, team_id: str, copy_text: str, params: dict):
         """생성된 문구를 DB에 저장 (중복 방지) - add_marketing_copy 함수 사용"""
@@ -545,51 +610,67 @@ class MarketingLogic:
         - RCS: {'content': str, 'button_name': str, 'created_by': str, 'metadata': dict}
         - APP_PUSH: {'title': str, 'message': str, 'created_by': str, 'metadata': dict}
         """
-        conn = get_phrases_db()
-        cursor = conn.cursor()
-        
         try:
-            # 필수 필드 검증
-            if not copy_data.get('team_id') or not copy_data.get('channel'):
-                raise ValueError("team_id, channel은 필수 필드입니다.")
-            
-            # 채널 유효성 검증
-            if copy_data.get('channel') not in ['APP_PUSH', 'RCS']:
-                raise ValueError("channel은 'APP_PUSH' 또는 'RCS'여야 합니다.")
-            # 데이터 삽입
-            cursor.execute("""
-                INSERT INTO marketing_copies 
-                (team_id, channel, content_data, keywords, target_audience, tone, 
-                 reference_text, send_date, impression_count, click_count, ctr, conversion_count, 
-                 conversion_rate, trend_keywords, is_ai_generated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                copy_data.get('team_id'),
-                copy_data.get('channel'),
-                copy_data.get('content_data'),
-                copy_data.get('keywords'),
-                copy_data.get('target_audience'),
-                copy_data.get('tone'),
-                copy_data.get('reference_text'),
-                copy_data.get('send_date'),
-                copy_data.get('impression_count', 0),
-                copy_data.get('click_count', 0),
-                copy_data.get('ctr', 0.0),
-                copy_data.get('conversion_count', 0),
-                copy_data.get('conversion_rate', 0.0),
-                copy_data.get('trend_keywords'),
-                copy_data.get('is_ai_generated', False)
-            ))
-            
-            conn.commit()
+            with transaction() as conn:
+                self._insert_copy(conn, copy_data)
             return True
             
         except Exception as e:
-            conn.rollback()
             print(f"Error adding marketing copy: {e}")
             return False
-        finally:
-            conn.close()
+    
+    def add_marketing_copies(self, copies: list) -> tuple:
+        """
+        여러 마케팅 문구를 한 트랜잭션으로 추가 → (성공 수, 실패 수)
+        
+        문구별 형식은 add_marketing_copy와 같음, 검증/삽입에 실패한 문구만 건너뛰고 나머지는 함께 커밋
+        """
+        success_count = 0
+        error_count = 0
+        with transaction() as conn:
+            for copy_data in copies:
+                try:
+                    self._insert_copy(conn, copy_data)
+                    success_count += 1
+                except Exception as e:
+                    print(f"Error adding marketing copy: {e}")
+                    error_count += 1
+        return success_count, error_count
+    
+    @staticmethod
+    def _insert_copy(conn, copy_data: dict) -> None:
+        """문구 1개 검증 후 INSERT (커밋은 호출하는 쪽 트랜잭션에서)"""
+        # 필수 필드 검증
+        if not copy_data.get('team_id') or not copy_data.get('channel'):
+            raise ValueError("team_id, channel은 필수 필드입니다.")
+        
+        # 채널 유효성 검증
+        if copy_data.get('channel') not in ['APP_PUSH', 'RCS']:
+            raise ValueError("channel은 'APP_PUSH' 또는 'RCS'여야 합니다.")
+        # 데이터 삽입
+        conn.execute("""
+            INSERT INTO marketing_copies 
+            (team_id, channel, content_data, keywords, target_audience, tone, 
+             reference_text, send_date, impression_count, click_count, ctr, conversion_count, 
+             conversion_rate, trend_keywords, is_ai_generated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            copy_data.get('team_id'),
+            copy_data.get('channel'),
+            copy_data.get('content_data'),
+            copy_data.get('keywords'),
+            copy_data.get('target_audience'),
+            copy_data.get('tone'),
+            copy_data.get('reference_text'),
+            copy_data.get('send_date'),
+            copy_data.get('impression_count', 0),
+            copy_data.get('click_count', 0),
+            copy_data.get('ctr', 0.0),
+            copy_data.get('conversion_count', 0),
+            copy_data.get('conversion_rate', 0.0),
+            copy_data.get('trend_keywords'),
+            copy_data.get('is_ai_generated', False)
+        ))
     
     def search_trends(self, keyword: str) -> dict:
         """
@@ -606,35 +687,37 @@ class MarketingLogic:
         """
         트렌드 데이터 저장 (중복 제거 및 정규화)
         """
-        conn = get_trends_db()
-        cursor = conn.cursor()
-        
-        for trend in trend_data:
-            # 중복 체크
-            cursor.execute("""
-                SELECT id FROM trends 
-                WHERE keyword = ? AND DATE(collected_at) = DATE('now')
-            """, (trend['keyword'],))
+        # 한 트랜잭션으로 저장 (중간에 실패하면 전체 롤백)
+        with transaction(get_trends_db) as conn:
+            cursor = conn.cursor()
             
-            if cursor.fetchone():
-                # 오늘 이미 저장된 트렌드면 업데이트
+            for trend in trend_data:
+                # 중복 체크
                 cursor.execute("""
-                    UPDATE trends 
-                    SET mention_count = ?, trend_score = ?
+                    SELECT id FROM trends 
                     WHERE keyword = ? AND DATE(collected_at) = DATE('now')
-                """, (trend['mention_count'], trend['trend_score'], trend['keyword']))
-            else:
-                # 새로운 트렌드 저장
-                cursor.execute("""
-                    INSERT INTO trends (keyword, category, mention_count, trend_score, source)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    trend['keyword'],
-                    trend.get('category', 'general'),
-                    trend.get('mention_count', 0),
-                    trend.get('trend_score', 0),
-                    trend.get('source', 'google')
-                ))
-        
-        conn.commit()
-        conn.close()
\ No newline at end of file
+                """, (trend['keyword'],))
+                
+                if cursor.fetchone():
+                    # 오늘 이미 저장된 트렌드면 업데이트
+                    cursor.execute("""
+                        UPDATE trends 
+                        SET mention_count = ?, trend_score = ?
+                        WHERE keyword = ? AND DATE(collected_at) = DATE('now')
+                    """, (trend['mention_count'], trend['trend_score'], trend['keyword']))
+                else:
+                    # 새로운 트렌드 저장
+                    cursor.execute("""
+                        INSERT INTO trends (keyword, category, mention_count, trend_score, source)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (
+                        trend['keyword'],
+                        trend.get('category', 'general'),
+                        trend.get('mention_count', 0),
+                        trend.get('trend_score', 0),
+                        trend.get('source', 'google')
+                    ))
+        
+        # 트렌드가 바뀌면 프롬프트가 달라지므로 생성 캐시 무효화
+        self.generation_cache.invalidate()
+        self.semantic_cache.invalidate()
\ No newline at end of file
@@ -0,0 +1,170 @@
+import os
+import re
+import time
+from typing import Dict, List
+from config import Config
+
+# "1." / "12." 처럼 번호로 시작하는 항목 (마크다운 굵게 표시는 미리 제거한 줄 기준)
+ITEM_NUMBER = re.compile(r'^(\d+)\.\s*')
+
+APP_PUSH_TITLE = '타이틀:'
+APP_PUSH_MESSAGE = '본문:'
+RCS_BUTTON = '버튼:'
+RCS_MESSAGE = '메시지:'
+
+
+def _after(text: str, marker: str, index: int) -> str:
+    """marker 이후의 텍스트 (앞뒤 공백 제거)"""
+    return text[index + len(marker):].strip()
+
+
+class CopyParser:
+    """
+    LLM 출력을 채널 형식(APP_PUSH/RCS)에 맞게 문구 목록으로 파싱하는 단일 패스 파서
+
+    - feed(chunk): 스트리밍 청크를 받아 완성된 문구(다음 번호가 시작된 문구)를 반환
+    - close(): 남은 문구를 반환 (문구를 하나도 찾지 못했으면 번호 줄 fallback 적용)
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._pending = ''
+        self._current = None
+        self._emitted = 0
+        self._fallback = []
+        self._closed = False
+
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """청크 추가 후 완성된 줄까지만 처리"""
+        completed = []
+        if not chunk:
+            return completed
+
+        self._pending += chunk
+        start = 0
+        while True:
+            end = self._pending.find('\n', start)
+            if end == -1:
+                break
+            self._consume(self._pending[start:end], completed)
+            start = end + 1
+        self._pending = self._pending[start:]
+        return completed
+
+    def close(self) -> List[Dict[str, str]]:
+        """입력 종료: 마지막 줄과 작성 중이던 문구 마무리"""
+        if self._closed:
+            return []
+        self._closed = True
+
+        completed = []
+        if self._pending:
+            self._consume(self._pending, completed)
+            self._pending = ''
+        self._flush(completed)
+
+        # 파싱 실패 시 번호가 붙은 줄 전체를 메시지로 처리
+        if not self._emitted and not completed:
+            completed.extend({'message': text} for text in self._fallback)
+        return completed
+
+    def _consume(self, raw_line: str, completed: list) -> None:
+        raw_line = raw_line.rstrip('\r')
+        line = raw_line.strip()
+        plain = line.replace('**', '')
+
+        # fallback 후보는 같은 패스에서 함께 수집
+        number = ITEM_NUMBER.match(plain) if plain and plain[0].isdigit() else None
+        if number:
+            self._fallback.append(plain[number.end():].strip())
+
+        if self.channel == 'APP_PUSH':
+            self._consume_app_push(plain, completed)
+        else:
+            self._consume_rcs(raw_line, plain, number, completed)
+
+    def _consume_app_push(self, plain: str, completed: list) -> None:
+        """앱푸시: "타이틀: [내용]" / "본문: [내용]" (번호 유무 무관)"""
+        index = plain.find(APP_PUSH_TITLE)
+        if index != -1:
+            self._flush(completed)
+            self._current = {'title': _after(plain, APP_PUSH_TITLE, index), 'message': ''}
+            return
+
+        index = plain.find(APP_PUSH_MESSAGE)
+        if index != -1 and self._current:
+            self._current['message'] = _after(plain, APP_PUSH_MESSAGE, index)
+
+    def _consume_rcs(self, raw_line: str, plain: str, number, completed: list) -> None:
+        """RCS: "1. 버튼: [내용]" 다음 "메시지: [내용]" + 여러 줄 본문 (줄바꿈 보존)"""
+        if number:
+            self._flush(completed)
+            content = plain[number.end():].strip()
+            self._current = {}
+
+            index = content.find(RCS_BUTTON)
+            if index != -1:
+                self._current['button'] = _after(content, RCS_BUTTON, index)
+                return
+            index = content.find(RCS_MESSAGE)
+            if index != -1:
+                self._current['message'] = _after(content, RCS_MESSAGE, index)
+                return
+            # 구분자가 없으면 메시지로 처리
+            self._current['message'] = content
+            return
+
+        if not self._current:
+            return
+
+        index = plain.find(RCS_MESSAGE)
+        if index != -1:
+            self._current['message'] = _after(plain, RCS_MESSAGE, index)
+        elif 'message' in self._current:
+            # 메시지 내용의 연속 (빈 줄은 원본 그대로)
+            if not raw_line.strip():
+                self._current['message'] += raw_line
+            else:
+                self._current['message'] += '\n' + plain
+
+    def _flush(self, completed: list) -> None:
+        """작성 중이던 문구를 완성 처리"""
+        current = self._current
+        self._current = None
+        if not current:
+            return
+
+        if self.channel == 'APP_PUSH':
+            if not current.get('title'):
+                return
+            # 본문이 없어도 타이틀만으로 문구 생성
+            if not current.get('message'):
+                current['message'] = '(광고) ' + current['title']
+        elif not (current.get('button') or current.get('message')):
+            return
+
+        completed.append(current)
+        self._emitted += 1
+
+
+def parse_copies(text: str, channel: str) -> List[Dict[str, str]]:
+    """LLM 출력 전체를 한 번에 파싱"""
+    parser = CopyParser(channel)
+    copies = parser.feed(text or '')
+    copies.extend(parser.close())
+    return copies
+
+
+def capture_output(text: str, channel: str) -> None:
+    """파서 코퍼스 확장용 LLM 원본 출력 저장 (PARSER_CORPUS_CAPTURE_DIR 설정 시)"""
+    capture_dir = Config.PARSER_CORPUS_CAPTURE_DIR
+    if not capture_dir or not text:
+        return
+
+    try:
+        os.makedirs(capture_dir, exist_ok=True)
+        path = os.path.join(capture_dir, f"{channel.lower()}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    except OSError as e:
+        print(f"❌ LLM 출력 저장 실패: {e}")
@@ -0,0 +1,311 @@
+import string
+import threading
+from typing import Any, Dict, List, Optional
+from config import Config
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Gemini 토큰 수 근사치 (API 호출 없이 계산)
+
+    영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 1토큰으로 보수적으로 계산
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return (len(text) - ascii_chars) + -(-ascii_chars // 4)
+
+
+class PromptTemplate:
+    """
+    미리 컴파일한 프롬프트 템플릿
+
+    생성 시 한 번만 고정 텍스트 조각과 필드 이름으로 분리하고, 고정 부분의 토큰 수를 미리 계산
+    """
+
+    def __init__(self, source: str):
+        self.parts = []  # (고정 텍스트, 필드 이름 또는 None)
+        self.fields = []
+        for literal, field, _, _ in string.Formatter().parse(source):
+            self.parts.append((literal, field))
+            if field is not None:
+                self.fields.append(field)
+        self.static_tokens = estimate_tokens("".join(literal for literal, _ in self.parts))
+
+    def render(self, values: Dict[str, Any]) -> str:
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(values.get(field, '')))
+        return "".join(out)
+
+    def estimate(self, values: Dict[str, Any]) -> int:
+        """렌더링하지 않고 토큰 수 추정"""
+        return self.static_tokens + sum(estimate_tokens(str(values.get(field, ''))) for field in self.fields)
+
+
+RCS_TEMPLATE = PromptTemplate("""
+당신은 전문 마케팅 카피라이터입니다. RCS 메시지용 마케팅 문구를 {count}개 생성해주세요.
+
+### 주제:
+{topic}{brand_context}{event_context}
+
+### 타겟 고객:
+{target_audience}
+
+### 톤앤매너:
+{tone}{discount_context}{appeal_context}
+{rag_context}{trend_context}
+
+### 참고 텍스트:
+{reference_text}
+
+### RCS 요구사항:
+1. 버튼 텍스트는 15자 이내로 간결하고 매력적인 문구 작성
+2. 메시지는 100자 이내로 작성하며 문단 단위로 줄바꿈을 두 번씩 하여 가독성 향상
+3. 할인 혜택은 숫자와 함께 강조하여 표시 (예: 30% 할인, 최대 50% OFF)
+4. 센스있는 후킹 문구로 고객의 관심을 끌어야 함
+5. 이모지를 적절히 사용하여 시각적 효과를 높이세요(이모지를 사용하는 경우 브랜드 양옆에 동일한 이모지를 넣어 강조)
+6. 타겟 고객의 감성을 자극하는 표현 사용
+7. 최신 트렌드를 자연스럽게 반영
+
+### 출력 형식 (정확히 이 형식을 따라주세요):
+{example_format}
+위와 같은 형식으로 반드시 버튼과 메시지를 모두 포함하여 출력하세요.
+메시지는 문단 단위로 줄바꿈을 두 번씩 하여 가독성을 높이고, 할인 혜택을 강조하세요.
+
+""")
+
+APP_PUSH_TEMPLATE = PromptTemplate("""
+앱푸시 마케팅 문구를 {count}개 생성해주세요.
+
+주제: {topic}{brand_context}{event_context}
+타겟: {target_audience}
+톤: {tone}{discount_context}{appeal_context}
+{rag_context}{trend_context}
+
+각 문구는 반드시 다음 형식으로 출력하세요:
+1. 타이틀: [15-20자 제목]
+본문: (광고) [40자 이내 내용]{emoji_instruction}
+2. 타이틀: [15-20자 제목]
+본문: (광고) [40자 이내 내용]{emoji_instruction}
+
+타이틀과 본문을 모두 포함해야 합니다.
+""")
+
+# 참고 문구가 없을 때 사용하는 RCS 출력 형식 예시
+DEFAULT_RCS_EXAMPLE = """
+1. 버튼: 지금 바로 구매하기
+메시지: 롯데ON 뷰티 세일! ✨
+
+신규고객 30% 할인 혜택
+
+봄신상 뷰티템을 특가로 만나보세요! 💖
+
+2. 버튼: 뷰티 혜택 확인하기
+메시지: 롯데ON에서 뷰티 세일 진행중! 🎉
+
+최대 30% 할인에 신규고객 추가 혜택까지!
+
+지금 바로 확인해보세요 ✨
+
+"""
+
+
+class PromptPlan:
+    """예산에 맞춰 확정된 프롬프트 구성 (생성 개수만 바꿔 여러 번 렌더링 가능)"""
+
+    def __init__(self, template: PromptTemplate, values: Dict[str, Any], examples: list,
+                 tokens: int, budget: int, trimmed: Dict[str, Any]):
+        self.template = template
+        self.values = values
+        self.examples = examples
+        self.tokens = tokens
+        self.budget = budget
+        self.trimmed = trimmed
+        self.prompt = template.render(values)
+
+    def render(self, count: int) -> str:
+        """생성 개수 count에 맞는 프롬프트 (분할 호출용)"""
+        if count == self.values['count']:
+            return self.prompt
+        return self.template.render(dict(self.values, count=count))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'chars': len(self.prompt),
+            'estimated_tokens': self.tokens,
+            'budget': self.budget,
+            'over_budget': bool(self.budget) and self.tokens > self.budget,
+            'trimmed': self.trimmed
+        }
+
+
+class PromptBuilder:
+    """
+    채널별 템플릿 + 토큰 예산 기반 프롬프트 구성
+
+    예산을 넘으면 RAG 예시(순위 낮은 것부터) → 참고 텍스트 → 트렌드 키워드 순으로 줄이거나 제거
+    주제/타겟/톤/요구사항/출력 형식 등 핵심 지시는 줄이지 않음
+    """
+
+    TEMPLATES = {'RCS': RCS_TEMPLATE, 'APP_PUSH': APP_PUSH_TEMPLATE}
+
+    def __init__(self, token_budget: int = 1200, reference_min_chars: int = 40):
+        self.token_budget = token_budget
+        self.reference_min_chars = reference_min_chars
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.trimmed_requests = 0
+        self.over_budget = 0
+        self.section_trims = {'rag_examples': 0, 'reference_text': 0, 'trend_keywords': 0}
+
+    @staticmethod
+    def _rag_context(examples: list) -> str:
+        if not examples:
+            return ""
+        lines = [
+            f"- {phrase['title']}: {phrase['message']} (CTR: {phrase['ctr']:.2%}, 전환율: {phrase['conversion_rate']:.2%})"
+            for phrase in examples
+        ]
+        return f"\n\n### 성과 좋은 유사 문구 참고:\n" + "\n".join(lines)
+
+    @staticmethod
+    def _example_format(examples: list) -> str:
+        """실제 참고 문구를 사용한 RCS 출력 형식 예시"""
+        if not examples:
+            return DEFAULT_RCS_EXAMPLE
+        example_format = ""
+        for i, phrase in enumerate(examples):
+            title = phrase.get('title', '버튼 텍스트')
+            message = phrase.get('message', '메시지 내용')
+            example_format += f"""
+{i+1}. 버튼: {title}
+메시지: {message}
+
+"""
+        return example_format
+
+    @staticmethod
+    def _trend_context(keywords: list) -> str:
+        if not keywords:
+            return ""
+        return f"\n\n### 최신 트렌드 키워드:\n{', '.join(keywords)}"
+
+    def _values(self, channel: str, count: int, brief: dict, examples: list,
+                reference_text: str, keywords: list) -> Dict[str, Any]:
+        discount_type = brief.get('discount_type')
+        appeal_point = brief.get('appeal_point')
+        brand = brief.get('brand')
+        event_name = brief.get('event_name')
+
+        values = {
+            'count': count,
+            'topic': brief.get('topic'),
+            'target_audience': brief.get('target_audience'),
+            'tone': brief.get('tone'),
+            'brand_context': f"\n\n### 브랜드:\n{brand}" if brand else "",
+            'event_context': f"\n\n### 행사명:\n{event_name}" if event_name else "",
+            'discount_context': f"\n\n### 할인 유형:\n{discount_type}\n(반드시 이 할인 정보를 문구에 포함해주세요)" if discount_type else "",
+            'appeal_context': f"\n\n### 소구 포인트:\n{appeal_point}\n(고객에게 어필할 핵심 포인트를 강조해주세요)" if appeal_point else "",
+            'rag_context': self._rag_context(examples),
+            'trend_context': self._trend_context(keywords),
+            'reference_text': reference_text if reference_text else '없음',
+            'emoji_instruction': "\n- 이모지를 적절히 사용하여 시각적 효과를 높이세요" if brief.get('use_emoji', True) else "\n- 이모지는 사용하지 마세요"
+        }
+        if channel == 'RCS':
+            values['example_format'] = self._example_format(examples)
+        return values
+
+    def build(self, channel: str, count: int, brief: dict,
+              examples: Optional[list] = None, trend_keywords: Optional[List[str]] = None,
+              token_budget: Optional[int] = None) -> PromptPlan:
+        """
+        예산 안에 들어오도록 섹션을 줄여 프롬프트 구성
+
+        brief: topic, target_audience, tone, reference_text, discount_type, appeal_point, brand, event_name, use_emoji
+        examples: 우선순위 순으로 정렬된 RAG 참고 문구
+        """
+        template = self.TEMPLATES.get(channel, APP_PUSH_TEMPLATE)
+        budget = self.token_budget if token_budget is None else token_budget
+        examples = list(examples or [])
+        keywords = list(trend_keywords or [])
+        reference_text = brief.get('reference_text') or ''
+        trimmed = {}
+
+        values = self._values(channel, count, brief, examples, reference_text, keywords)
+        tokens = template.estimate(values)
+
+        if budget and tokens > budget:
+            # 1. RAG 예시: 순위가 낮은 것부터 제거
+            while tokens > budget and examples:
+                examples.pop()
+                trimmed['rag_examples'] = trimmed.get('rag_examples', 0) + 1
+                values = self._values(channel, count, brief, examples, reference_text, keywords)
+                tokens = template.estimate(values)
+
+            # 2. 참고 텍스트: 초과분만큼 뒤에서 자르고, 너무 짧아지면 제거
+            original_reference = reference_text
+            keep = len(original_reference)
+            while tokens > budget and reference_text:
+                reference_tokens = estimate_tokens(reference_text)
+                keep = min(keep - 1, int(keep * max(0, reference_tokens - (tokens - budget)) / reference_tokens))
+                if keep >= self.reference_min_chars:
+                    reference_text = original_reference[:keep].rstrip() + '…'
+                    trimmed['reference_text'] = 'truncated'
+                else:
+                    reference_text = ''
+                    trimmed['reference_text'] = 'dropped'
+                values = self._values(channel, count, brief, examples, reference_text, keywords)
+                tokens = template.estimate(values)
+
+            # 3. 트렌드 키워드: 뒤에서부터 제거
+            while tokens > budget and keywords:
+                keywords.pop()
+                trimmed['trend_keywords'] = trimmed.get('trend_keywords', 0) + 1
+                values = self._values(channel, count, brief, examples, reference_text, keywords)
+                tokens = template.estimate(values)
+
+            if tokens > budget:
+                print(f"⚠️ 프롬프트가 토큰 예산을 초과합니다 (~{tokens} > {budget}, 핵심 지시는 유지)")
+
+        plan = PromptPlan(template, values, examples, tokens, budget, trimmed)
+        self._record(plan)
+        print(f"📏 프롬프트 크기: {len(plan.prompt)}자 / ~{tokens}토큰 (예산 {budget or '제한 없음'})"
+              + (f", 축소: {trimmed}" if trimmed else ""))
+        return plan
+
+    def _record(self, plan: PromptPlan) -> None:
+        with self._lock:
+            self.requests += 1
+            self.total_tokens += plan.tokens
+            self.max_tokens = max(self.max_tokens, plan.tokens)
+            if plan.trimmed:
+                self.trimmed_requests += 1
+                for section in plan.trimmed:
+                    self.section_trims[section] += 1
+            if plan.budget and plan.tokens > plan.budget:
+                self.over_budget += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """프롬프트 크기 통계 정보 반환"""
+        with self._lock:
+            return {
+                'token_budget': self.token_budget,
+                'requests': self.requests,
+                'avg_tokens': round(self.total_tokens / self.requests, 1) if self.requests else 0.0,
+                'max_tokens': self.max_tokens,
+                'trimmed_requests': self.trimmed_requests,
+                'over_budget': self.over_budget,
+                'section_trims': dict(self.section_trims)
+            }
+
+
+# 프로세스 전역 프롬프트 빌더 (크기 통계 공유)
+prompt_builder = PromptBuilder(
+    token_budget=Config.PROMPT_TOKEN_BUDGET,
+    reference_min_chars=Config.PROMPT_REFERENCE_MIN_CHARS
+)
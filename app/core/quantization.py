@@ -0,0 +1,64 @@
+from typing import Optional, Tuple
+import numpy as np
+
+# 벡터 저장 정밀도 (행당 바이트: float32 4·dim, float16 2·dim, int8 dim + 스케일 4)
+QUANTIZATION_DTYPES = {
+    'float32': np.float32,
+    'float16': np.float16,
+    'int8': np.int8,
+}
+
+# 양자화 행렬 점수 계산 시 한 번에 float32로 변환할 행 수 (임시 메모리 상한)
+_BLOCK_ROWS = 8192
+
+
+def check_quantization(quantization: str) -> str:
+    if quantization not in QUANTIZATION_DTYPES:
+        raise ValueError(f"지원하지 않는 벡터 양자화 방식입니다: {quantization} (float32 | float16 | int8)")
+    return quantization
+
+
+def quantize(vectors, quantization: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    정규화된 float32 벡터 → (코드 행렬, 행별 스케일)
+
+    - float16: 그대로 반정밀도로 변환 (스케일 없음)
+    - int8: 행별 대칭 양자화 (scale = max|x| / 127, 코드 = round(x / scale))
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    dtype = QUANTIZATION_DTYPES[check_quantization(quantization)]
+    if quantization != 'int8':
+        return vectors.astype(dtype), None
+    scales = np.abs(vectors).max(axis=-1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[..., None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """코드 행렬 → float32 벡터 (근사값)"""
+    vectors = np.asarray(codes, dtype=np.float32)
+    if scales is not None:
+        vectors = vectors * np.asarray(scales, dtype=np.float32)[..., None]
+    return vectors
+
+
+def dot(codes: np.ndarray, scales: Optional[np.ndarray], query: np.ndarray) -> np.ndarray:
+    """
+    코드 행렬 · 쿼리 벡터 → float32 점수
+
+    float32가 아니면 _BLOCK_ROWS행씩 float32로 올려 행렬곱 (BLAS 사용, 임시 메모리는 블록 크기로 고정)
+    int8은 행별 스케일을 곱해 원래 크기로 복원
+    """
+    if codes.dtype == np.float32:
+        scores = codes @ query
+    else:
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        buffer = np.empty((min(_BLOCK_ROWS, codes.shape[0]), codes.shape[1]), dtype=np.float32)
+        for start in range(0, codes.shape[0], _BLOCK_ROWS):
+            block = codes[start:start + _BLOCK_ROWS]
+            np.copyto(buffer[:block.shape[0]], block)
+            scores[start:start + block.shape[0]] = buffer[:block.shape[0]] @ query
+    if scales is not None:
+        scores = scores * scales
+    return scores
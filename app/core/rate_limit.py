@@ -0,0 +1,65 @@
+import threading
+import time
+from typing import Any, Dict
+from config import Config
+
+
+class TokenBucket:
+    """토큰 버킷 레이트 리미터 (초당 rate개 충전, 최대 capacity개 버스트)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+        self.rejected = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, tokens: float = 1, timeout: float = None) -> bool:
+        """토큰 확보까지 대기 (timeout 초과 시 False 반환)"""
+        if self.rate <= 0:
+            return True
+
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.acquired += 1
+                    self.waited_seconds += time.monotonic() - started
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if timeout is not None and time.monotonic() - started + wait > timeout:
+                with self._lock:
+                    self.rejected += 1
+                return False
+            time.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """레이트 리미터 상태 반환"""
+        with self._lock:
+            self._refill()
+            return {
+                'rate_per_second': self.rate,
+                'capacity': self.capacity,
+                'available_tokens': round(self._tokens, 2),
+                'acquired': self.acquired,
+                'rejected': self.rejected,
+                'waited_seconds': round(self.waited_seconds, 3)
+            }
+
+
+# Gemini API 쿼터에 맞춘 프로세스 전역 리미터 (RPM → 초당 충전량)
+gemini_rate_limiter = TokenBucket(
+    rate=Config.GEMINI_RPM / 60.0,
+    capacity=Config.GEMINI_BURST
+)
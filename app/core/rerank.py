@@ -0,0 +1,60 @@
+from typing import Any, Dict, List, Sequence
+import numpy as np
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _scale(values: np.ndarray) -> np.ndarray:
+    """후보 내 최댓값 기준 0~1 스케일 (모두 0이면 0)"""
+    peak = values.max() if values.size else 0.0
+    return values / peak if peak > 0 else np.zeros_like(values)
+
+
+def mmr_rerank(phrases: List[Dict[str, Any]], query_vector: Sequence[float],
+               vectors: Sequence[Sequence[float]], top_n: int,
+               similarity_weight: float = 0.5, ctr_weight: float = 0.3,
+               conversion_weight: float = 0.2, mmr_lambda: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    후보 문구 재정렬 (성과 가중 relevance + MMR 다양성) → 상위 top_n개
+
+    - relevance = 유사도/CTR/전환율 가중합 (후보 전체를 한 번의 행렬 연산으로 계산, CTR/전환율은 후보 내 최댓값 기준 정규화)
+    - 선택할 때마다 mmr = λ·relevance − (1−λ)·이미 선택한 문구와의 최대 유사도 → 거의 같은 발송 문구가 연달아 뽑히지 않음
+    - 각 결과에 ranking(순위 계산에 쓴 특성 값)을 붙여 반환 (입력 문구는 수정하지 않음)
+    """
+    if not phrases or top_n <= 0:
+        return []
+
+    matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(phrases), -1))
+    query = np.asarray(query_vector, dtype=np.float32)
+    query = query / (np.linalg.norm(query) or 1.0)
+
+    similarity = matrix @ query
+    ctr = _scale(np.array([float(phrase.get('ctr') or 0.0) for phrase in phrases], dtype=np.float32))
+    conversion = _scale(np.array([float(phrase.get('conversion_rate') or 0.0) for phrase in phrases], dtype=np.float32))
+    relevance = similarity_weight * similarity + ctr_weight * ctr + conversion_weight * conversion
+    pairwise = matrix @ matrix.T
+
+    # 탐욕적 MMR 선택 (redundancy: 후보별 선택된 문구와의 최대 유사도, 선택마다 한 번의 벡터 연산으로 갱신)
+    redundancy = np.zeros(len(phrases), dtype=np.float32)
+    available = np.ones(len(phrases), dtype=bool)
+    results = []
+    for rank in range(min(top_n, len(phrases))):
+        mmr = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+        mmr[~available] = -np.inf
+        index = int(np.argmax(mmr))
+        results.append(dict(phrases[index], ranking={
+            'rank': rank + 1,
+            'similarity': round(float(similarity[index]), 4),
+            'ctr_score': round(float(ctr[index]), 4),
+            'conversion_score': round(float(conversion[index]), 4),
+            'relevance': round(float(relevance[index]), 4),
+            'redundancy': round(float(redundancy[index]), 4),
+            'mmr_score': round(float(mmr[index]), 4)
+        }))
+        available[index] = False
+        np.maximum(redundancy, pairwise[index], out=redundancy)
+    return results
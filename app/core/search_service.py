@@ -0,0 +1,355 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# 메시지: 4바이트 빅엔디언 길이 + UTF-8 JSON
+_HEADER = struct.Struct('>I')
+
+# 사이드카가 처리하는 VectorStore 메서드 (클라이언트 RemoteVectorStore와 동일한 이름)
+SERVICE_METHODS = (
+    'retrieve', 'retrieve_many', 'rerank', 'embed_query', 'search_similar_phrases',
+    'get_collection_stats', 'get_sync_progress', 'sync_from_database', 'export_snapshot', 'stats'
+)
+
+
+class SearchServiceError(RuntimeError):
+    """사이드카에서 처리 중 발생한 오류 (연결 오류와 달리 로컬 대체 실행하지 않음)"""
+
+
+class SearchServiceUnavailable(ConnectionError):
+    """사이드카에 연결할 수 없음 (소켓 파일 없음 / 연결 거부) → 로컬 대체 실행"""
+
+
+class SearchServiceTimeout(TimeoutError):
+    """사이드카 응답 대기 시간 초과 (사이드카는 동작 중이므로 로컬 대체 실행하지 않고 호출한 쪽에 전달)"""
+
+
+def send_message(sock: socket.socket, payload: Any) -> None:
+    data = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Any:
+    """메시지 1개 수신 (상대가 연결을 닫았으면 None)"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    data = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if data is None:
+        raise ConnectionError("메시지 수신 중 연결이 끊어졌습니다")
+    return json.loads(data.decode('utf-8'))
+
+
+class QueryBatcher:
+    """
+    동시에 들어온 검색 쿼리 임베딩을 모아 한 번에 계산 (마이크로 배치)
+
+    첫 요청 스레드가 window초 동안(또는 max_size개가 모일 때까지) 기다렸다가 모인 쿼리를 한 번에 처리하고,
+    나머지 스레드는 결과가 준비될 때까지 대기
+    """
+
+    def __init__(self, prime: Callable[[List[str]], Any], window: float = 0.002, max_size: int = 32):
+        self.prime = prime
+        self.window = window
+        self.max_size = max_size
+        self._pending = []  # [(쿼리 목록, 완료 이벤트, 오류 보관 dict)]
+        self._condition = threading.Condition()
+        self.batches = 0
+        self.queries = 0
+
+    def submit(self, queries: List[str]) -> None:
+        done = threading.Event()
+        slot = {}
+        with self._condition:
+            self._pending.append((queries, done, slot))
+            leader = len(self._pending) == 1
+            if not leader and sum(len(q) for q, _, _ in self._pending) >= self.max_size:
+                self._condition.notify_all()
+
+        if leader:
+            with self._condition:
+                self._condition.wait_for(lambda: sum(len(q) for q, _, _ in self._pending) >= self.max_size,
+                                         timeout=self.window)
+                batch, self._pending = self._pending, []
+            try:
+                self.prime([query for queries, _, _ in batch for query in queries])
+            except Exception as e:
+                for _, _, waiting_slot in batch:
+                    waiting_slot['error'] = e
+            finally:
+                self.batches += 1
+                self.queries += sum(len(queries) for queries, _, _ in batch)
+                for _, waiting_done, _ in batch:
+                    waiting_done.set()
+
+        done.wait()
+        if 'error' in slot:
+            raise slot['error']
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'queries': self.queries,
+            'avg_batch_size': self.queries / self.batches if self.batches else 0.0
+        }
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            if message is None:
+                return
+            try:
+                response = {'result': self.server.service.dispatch(message['method'], message.get('args') or {})}
+            except Exception as e:
+                response = {'error': str(e), 'type': type(e).__name__}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class SearchService:
+    """
+    검색 사이드카 (Unix 소켓 서버)
+
+    - 노드당 하나의 프로세스가 벡터 색인과 임베딩 모델을 소유하고, 웹 워커들은 RemoteVectorStore로 접속
+    - 검색 쿼리 임베딩은 QueryBatcher로 워커 간 요청을 모아 배치 계산
+    """
+
+    def __init__(self, vector_store, socket_path: str, batch_window: float = 0.002, batch_max: int = 32):
+        self.vector_store = vector_store
+        self.socket_path = socket_path
+        self.batcher = QueryBatcher(vector_store.prime_query_embeddings, window=batch_window, max_size=batch_max)
+        self.requests = 0
+        self.started_at = time.time()
+        self._server = None
+
+    def dispatch(self, method: str, args: Dict[str, Any]) -> Any:
+        if method not in SERVICE_METHODS:
+            raise ValueError(f"지원하지 않는 메서드입니다: {method}")
+        self.requests += 1
+
+        # 검색 쿼리 임베딩은 배치로 먼저 계산 (retrieve/embed_query는 LRU에서 가져감)
+        if method in ('retrieve', 'embed_query', 'search_similar_phrases'):
+            self.batcher.submit([args['query']])
+        elif method == 'retrieve_many':
+            self.batcher.submit([request['query'] for request in args['requests']])
+
+        if method == 'stats':
+            stats = self.vector_store.stats()
+            stats['sidecar'] = self.stats()
+            return stats
+        return getattr(self.vector_store, method)(**args)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'socket': self.socket_path,
+            'pid': os.getpid(),
+            'requests': self.requests,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'query_batches': self.batcher.stats()
+        }
+
+    def serve_forever(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행에서 남은 소켓 파일
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        self._server = _UnixServer(self.socket_path, _Handler)
+        self._server.service = self
+        os.chmod(self.socket_path, 0o660)
+        print(f"🛰️ 검색 사이드카 시작: {self.socket_path} (pid {os.getpid()})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class RemoteVectorStore:
+    """
+    검색 사이드카 클라이언트 (VectorStore와 같은 메서드 제공)
+
+    - 스레드별 연결을 재사용, 연결 실패(소켓 파일 없음 / 연결 거부) 시 retry_interval초 동안 프로세스 내 VectorStore로 대체 실행
+    - 사이드카에서 발생한 처리 오류(SearchServiceError)와 응답 시간 초과(SearchServiceTimeout)는
+      대체 실행하지 않고 그대로 전달 (느린 요청 때문에 워커마다 모델/색인을 올리지 않도록)
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 5.0, retry_interval: float = 30.0,
+                 local_factory: Callable[[], Any] = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._local_factory = local_factory
+        self._local = None
+        self._local_lock = threading.Lock()
+        self._connections = threading.local()
+        self._retry_at = 0.0
+        self.remote_calls = 0
+        self.fallbacks = 0
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._connections, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)  # 연결 단계에도 타임아웃 적용
+            try:
+                sock.connect(self.socket_path)
+            except (ConnectionRefusedError, FileNotFoundError) as e:
+                sock.close()
+                raise SearchServiceUnavailable(str(e)) from e
+            except socket.timeout as e:
+                sock.close()
+                raise SearchServiceTimeout(f"검색 사이드카 연결 시간 초과 ({self.timeout}s)") from e
+            except OSError:
+                sock.close()
+                raise
+            self._connections.sock = sock
+        return sock
+
+    def _drop_connection(self) -> None:
+        sock = getattr(self._connections, 'sock', None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+            self._connections.sock = None
+
+    def _request(self, message: Dict[str, Any], timeout: Optional[float] = -1) -> Dict[str, Any]:
+        """
+        요청 1개 전송 후 응답 대기 (timeout=None이면 무제한, 기본은 self.timeout)
+        
+        재사용한 연결이 끊어져 있으면 (사이드카 재시작 등) 새 연결로 한 번 다시 보냄
+        """
+        for attempt in range(2):
+            reused = getattr(self._connections, 'sock', None) is not None
+            sock = self._connection()
+            sock.settimeout(self.timeout if timeout == -1 else timeout)
+            try:
+                send_message(sock, message)
+                response = recv_message(sock)
+            except socket.timeout as e:
+                # 늦게 도착할 응답이 다음 요청의 응답으로 읽히지 않도록 연결은 버림
+                self._drop_connection()
+                raise SearchServiceTimeout(f"검색 사이드카 응답 시간 초과 ({sock.gettimeout()}s)") from e
+            except (OSError, ValueError):
+                self._drop_connection()
+                if reused and attempt == 0:
+                    continue
+                raise
+            if response is None:
+                self._drop_connection()
+                if reused and attempt == 0:
+                    continue
+                raise ConnectionError("검색 사이드카가 연결을 닫았습니다")
+            break
+        if 'error' in response:
+            raise SearchServiceError(f"{response.get('type')}: {response['error']}")
+        return response
+
+    def local(self):
+        """대체 실행용 프로세스 내 VectorStore (처음 필요할 때 생성)"""
+        with self._local_lock:
+            if self._local is None:
+                if self._local_factory is None:
+                    from core.vector_store import VectorStore
+                    self._local = VectorStore()
+                else:
+                    self._local = self._local_factory()
+            return self._local
+
+    def _call(self, method: str, timeout: Optional[float] = -1, **args) -> Any:
+        if time.monotonic() >= self._retry_at:
+            try:
+                result = self._request({'method': method, 'args': args}, timeout=timeout)['result']
+                self.remote_calls += 1
+                return result
+            except SearchServiceUnavailable as e:
+                self._retry_at = time.monotonic() + self.retry_interval
+                print(f"⚠️ 검색 사이드카 연결 실패, {self.retry_interval:.0f}초 동안 프로세스 내 검색으로 대체: {e}")
+        self.fallbacks += 1
+        return getattr(self.local(), method)(**args)
+
+    def retrieve(self, query: str, **kwargs) -> Dict[str, Any]:
+        return self._call('retrieve', query=query, **kwargs)
+
+    def retrieve_many(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self._call('retrieve_many', requests=requests)
+
+    def rerank(self, query: str, phrases: List[Dict[str, Any]], top_n: int = None) -> List[Dict[str, Any]]:
+        return self._call('rerank', query=query, phrases=phrases, top_n=top_n)
+
+    def embed_query(self, query: str) -> List[float]:
+        return self._call('embed_query', query=query)
+
+    def search_similar_phrases(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        return self._call('search_similar_phrases', query=query, **kwargs)
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        return self._call('get_collection_stats')
+
+    def get_sync_progress(self) -> Dict[str, Any]:
+        return self._call('get_sync_progress')
+
+    def sync_from_database(self, full: bool = False) -> Dict[str, Any]:
+        # 동기화/스냅샷은 오래 걸리므로 타임아웃 없이 대기 (타임아웃 후 로컬에서 다시 실행되지 않도록)
+        return self._call('sync_from_database', timeout=None, full=full)
+
+    def export_snapshot(self, path: str = None) -> Dict[str, Any]:
+        return self._call('export_snapshot', timeout=None, path=path)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._call('stats')
+        stats['client'] = {
+            'socket': self.socket_path,
+            'remote_calls': self.remote_calls,
+            'fallbacks': self.fallbacks,
+            'local_active': self._local is not None
+        }
+        return stats
+
+    def warm_up(self) -> None:
+        """사이드카가 있으면 연결만 확인 (모델은 사이드카가 로드), 없으면 로컬 저장소 워밍업"""
+        try:
+            self._request({'method': 'get_collection_stats', 'args': {}})
+        except SearchServiceUnavailable:
+            self._retry_at = time.monotonic() + self.retry_interval
+            self.local().warm_up()
+        except (OSError, ValueError, SearchServiceError) as e:
+            # 사이드카는 있지만 응답이 늦거나 실패 → 로컬 모델은 올리지 않음
+            print(f"⚠️ 검색 사이드카 워밍업 확인 실패: {e}")
+
+    def close(self) -> None:
+        self._drop_connection()
+        if self._local is not None:
+            self._local.close()
@@ -0,0 +1,207 @@
+import atexit
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from flask import current_app
+
+
+class ServiceRegistry:
+    """
+    프로세스 전역 서비스 컨테이너
+
+    - 서비스는 처음 요청될 때 한 번만 생성 (스레드 안전)
+    - start(): 등록된 서비스 미리 생성, shutdown(): 생성 역순으로 정리
+    - warm_up(): 부팅 후 백그라운드 스레드에서 서비스 생성 + 워밍업 훅 실행 (첫 요청 지연 감소)
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._closers = {}
+        self._warmers = {}
+        self._instances = {}
+        self._order = []
+        self._lock = threading.RLock()
+        self._started = False
+        self._warmup_thread = None
+        self.warmup = {'state': 'idle'}
+
+    def register(self, name: str, factory: Callable[['ServiceRegistry'], Any],
+                 close: Optional[Callable[[Any], None]] = None,
+                 warm: Optional[Callable[[Any], None]] = None) -> None:
+        """서비스 팩토리 등록 (factory는 registry를 받아 인스턴스 반환, warm은 워밍업 때 인스턴스에 실행)"""
+        with self._lock:
+            self._factories[name] = factory
+            if close:
+                self._closers[name] = close
+            if warm:
+                self._warmers[name] = warm
+
+    def get(self, name: str) -> Any:
+        """서비스 인스턴스 반환 (없으면 생성)"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                if name not in self._factories:
+                    raise KeyError(f"등록되지 않은 서비스입니다: {name}")
+                self._instances[name] = self._factories[name](self)
+                self._order.append(name)
+                print(f"🔧 서비스 생성: {name}")
+            return self._instances[name]
+
+    def __getattr__(self, name: str) -> Any:
+        # registry.llm, registry.vector_store 형태 접근 지원
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+    def start(self, eager: bool = True) -> None:
+        """라이프사이클 시작 훅 (eager=True면 모든 서비스 미리 생성)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            if eager:
+                for name in list(self._factories):
+                    self.get(name)
+
+    def warm_up(self, background: bool = True) -> None:
+        """모든 서비스 생성 + 워밍업 훅 실행 (background=True면 데몬 스레드에서, 실패해도 요청 시 다시 생성)"""
+        def run():
+            started = time.perf_counter()
+            self.warmup = {'state': 'running', 'services': {}}
+            for name in list(self._factories):
+                service_started = time.perf_counter()
+                try:
+                    instance = self.get(name)
+                    warmer = self._warmers.get(name)
+                    if warmer:
+                        warmer(instance)
+                    self.warmup['services'][name] = round((time.perf_counter() - service_started) * 1000, 1)
+                except Exception as e:
+                    self.warmup['services'][name] = f"error: {e}"
+                    print(f"❌ 서비스 워밍업 오류 ({name}): {e}")
+            self.warmup['state'] = 'done'
+            self.warmup['elapsed_seconds'] = round(time.perf_counter() - started, 2)
+            print(f"🔥 서비스 워밍업 완료 ({self.warmup['elapsed_seconds']}s)")
+
+        if not background:
+            run()
+            return
+        with self._lock:
+            if self._warmup_thread is not None and self._warmup_thread.is_alive():
+                return
+            self._warmup_thread = threading.Thread(target=run, name='service-warmup', daemon=True)
+            self._warmup_thread.start()
+
+    def shutdown(self) -> None:
+        """라이프사이클 종료 훅 (생성 역순으로 정리)"""
+        with self._lock:
+            for name in reversed(self._order):
+                closer = self._closers.get(name)
+                if closer is None:
+                    continue
+                try:
+                    closer(self._instances[name])
+                except Exception as e:
+                    print(f"❌ 서비스 종료 오류 ({name}): {e}")
+            self._instances.clear()
+            self._order.clear()
+            self._started = False
+
+    def stats(self) -> Dict[str, Any]:
+        """등록/생성된 서비스 목록"""
+        with self._lock:
+            return {
+                'registered': list(self._factories),
+                'initialized': list(self._order),
+                'started': self._started,
+                'warmup': dict(self.warmup)
+            }
+
+
+# 서비스 팩토리 (무거운 모듈은 서비스를 처음 만들 때 import → 앱 시작 시 google.generativeai/chromadb 로드 안 함)
+def _create_llm(registry):
+    from core.llm import LLMService
+    return LLMService()
+
+
+def _create_vector_store(registry):
+    from config import Config
+    if Config.SEARCH_SIDECAR_SOCKET:
+        # 검색 사이드카 사용 (색인/임베딩 모델은 사이드카 프로세스가 소유)
+        from core.search_service import RemoteVectorStore
+        return RemoteVectorStore(
+            Config.SEARCH_SIDECAR_SOCKET,
+            timeout=Config.SEARCH_SIDECAR_TIMEOUT,
+            retry_interval=Config.SEARCH_SIDECAR_RETRY_INTERVAL
+        )
+    from core.vector_store import VectorStore
+    return VectorStore()
+
+
+def _create_logic(registry):
+    from core.logic import MarketingLogic
+    return MarketingLogic(llm=registry.llm, vector_store=registry.vector_store)
+
+
+def _create_batch_jobs(registry):
+    from core.batch import BatchJobManager
+    return BatchJobManager(registry.logic.generate_marketing_copy)
+
+
+def _create_executor(registry):
+    from core.concurrency import get_executor
+    return get_executor()
+
+
+def _shutdown_executor(executor):
+    from core.concurrency import shutdown_executor
+    shutdown_executor()
+
+
+def build_registry() -> ServiceRegistry:
+    """기본 서비스 등록 (DB 접근자, 스레드 풀, LLM, 벡터 저장소, 비즈니스 로직, 배치 작업)"""
+    import db
+
+    registry = ServiceRegistry()
+    registry.register('db', lambda r: db)
+    registry.register('executor', _create_executor, close=_shutdown_executor)
+    registry.register('llm', _create_llm, close=lambda llm: llm.close())
+    registry.register('vector_store', _create_vector_store,
+                      close=lambda vector_store: vector_store.close(),
+                      warm=lambda vector_store: vector_store.warm_up())
+    registry.register('logic', _create_logic)
+    registry.register('batch_jobs', _create_batch_jobs)
+    return registry
+
+
+def init_services(app, eager: bool = None, warm_up: bool = None) -> ServiceRegistry:
+    """
+    앱에 서비스 레지스트리 연결 + 종료 훅 등록
+
+    - eager (기본: SERVICES_EAGER): 앱 생성 중에 모든 서비스 생성
+    - warm_up (기본: SERVICES_WARMUP): eager가 아니면 부팅 후 백그라운드에서 서비스 생성/워밍업
+    """
+    from config import Config
+
+    eager = Config.SERVICES_EAGER if eager is None else eager
+    warm_up = Config.SERVICES_WARMUP if warm_up is None else warm_up
+
+    registry = build_registry()
+    app.extensions['services'] = registry
+    registry.start(eager=eager)
+    if warm_up and not eager:
+        registry.warm_up()
+    atexit.register(registry.shutdown)
+    return registry
+
+
+def get_services() -> ServiceRegistry:
+    """현재 앱의 서비스 레지스트리"""
+    return current_app.extensions['services']
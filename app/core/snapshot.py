@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from core.quantization import check_quantization, quantize
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+VECTORS_FILE = 'vectors.npy'    # (N, dim) float32/float16/int8, 정규화된 벡터 (파티션별로 연속 배치)
+SCALES_FILE = 'scales.npy'      # (N,) float32, int8 양자화 행별 스케일 (int8일 때만)
+METRICS_FILE = 'metrics.npy'    # (N, 2) float64, [ctr, conversion_rate] 필터용
+RECORDS_FILE = 'records.json'   # ids / documents / metadatas
+
+# 스냅샷에 남길 메타데이터 (검색 결과/어휘 색인에 필요한 값만)
+SNAPSHOT_METADATA_KEYS = (
+    'copy_id', 'team_id', 'channel', 'title', 'message', 'keywords', 'target_audience', 'tone',
+    'ctr', 'conversion_rate', 'impression_count', 'click_count', 'conversion_count', 'send_date'
+)
+
+
+class SnapshotError(RuntimeError):
+    """스냅샷 형식/체크섬/모델 불일치"""
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, ids: Sequence[str], vectors, documents: Sequence[str],
+                   metadatas: Sequence[Dict[str, Any]], model_id: str,
+                   source: Dict[str, Any] = None, quantization: str = 'float32') -> Dict[str, Any]:
+    """
+    벡터 색인 스냅샷 저장 → manifest 반환
+
+    - 벡터는 quantization 정밀도로 저장 (float16: 1/2, int8: 약 1/4 크기)
+    - 행은 (team_id, channel) 순으로 정렬해 파티션마다 연속 구간이 되도록 저장 (열 때 슬라이스만으로 파티션 접근)
+    - 임시 디렉토리에 모두 쓴 뒤 교체하므로 읽는 쪽은 이전/새 스냅샷 중 하나만 보게 됨
+    """
+    if not ids:
+        raise SnapshotError("스냅샷으로 내보낼 문구가 없습니다")
+    check_quantization(quantization)
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+
+    metadatas = [{key: metadata.get(key) for key in SNAPSHOT_METADATA_KEYS if key in metadata} for metadata in metadatas]
+    order = sorted(range(len(ids)), key=lambda i: (str(metadatas[i].get('team_id', '')), metadatas[i].get('channel', ''), ids[i]))
+
+    partitions: List[Dict[str, Any]] = []
+    for position, i in enumerate(order):
+        key = (metadatas[i].get('team_id', ''), metadatas[i].get('channel', ''))
+        if not partitions or (partitions[-1]['team_id'], partitions[-1]['channel']) != key:
+            partitions.append({'team_id': key[0], 'channel': key[1], 'start': position, 'end': position})
+        partitions[-1]['end'] = position + 1
+
+    tmp_path = f"{path.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    codes, scales = quantize(vectors[order], quantization)
+    np.save(os.path.join(tmp_path, VECTORS_FILE), codes)
+    files = [VECTORS_FILE, METRICS_FILE, RECORDS_FILE]
+    if scales is not None:
+        np.save(os.path.join(tmp_path, SCALES_FILE), scales)
+        files.append(SCALES_FILE)
+    metrics = np.array([[float(metadatas[i].get('ctr') or 0.0), float(metadatas[i].get('conversion_rate') or 0.0)] for i in order],
+                       dtype=np.float64).reshape(len(order), 2)
+    np.save(os.path.join(tmp_path, METRICS_FILE), metrics)
+    with open(os.path.join(tmp_path, RECORDS_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            'ids': [ids[i] for i in order],
+            'documents': [documents[i] for i in order],
+            'metadatas': [metadatas[i] for i in order]
+        }, f, ensure_ascii=False, separators=(',', ':'))
+
+    created_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'version': f"{time.strftime('%Y%m%d%H%M%S')}-{len(ids)}",
+        'created_at': created_at,
+        'model_id': model_id,
+        'metric': 'cosine',
+        'quantization': quantization,
+        'count': len(ids),
+        'dim': int(vectors.shape[1]),
+        'partitions': partitions,
+        'files': {
+            name: {'sha256': file_sha256(os.path.join(tmp_path, name)), 'bytes': os.path.getsize(os.path.join(tmp_path, name))}
+            for name in files
+        },
+        'source': source or {}
+    }
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 기존 스냅샷은 옆으로 옮긴 뒤 교체 (이미 열어 둔 워커의 메모리 맵은 유지됨)
+    old_path = None
+    if os.path.exists(path):
+        old_path = f"{path.rstrip(os.sep)}.old-{os.getpid()}"
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    if old_path:
+        shutil.rmtree(old_path, ignore_errors=True)
+    return manifest
+
+
+def read_manifest(path: str, verify: bool = True) -> Dict[str, Any]:
+    """manifest 읽기 + 형식 버전 확인 (verify=True면 파일 크기/체크섬까지 검증)"""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise SnapshotError(f"스냅샷 manifest가 없습니다: {manifest_path}")
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"지원하지 않는 스냅샷 형식입니다: {manifest.get('format_version')}")
+
+    for name, info in manifest['files'].items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) != info['bytes']:
+            raise SnapshotError(f"스냅샷 파일이 없거나 크기가 다릅니다: {name}")
+        if verify and file_sha256(file_path) != info['sha256']:
+            raise SnapshotError(f"스냅샷 체크섬이 일치하지 않습니다: {name}")
+    return manifest
+
+
+def open_arrays(path: str):
+    """
+    벡터/스케일/성과 배열을 읽기 전용 메모리 맵으로 열기 (복사 없음, 워커 간 OS 페이지 캐시 공유)
+    → (vectors, scales 또는 None, metrics, records)
+    """
+    vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode='r')
+    scales_path = os.path.join(path, SCALES_FILE)
+    scales = np.load(scales_path, mmap_mode='r') if os.path.exists(scales_path) else None
+    metrics = np.load(os.path.join(path, METRICS_FILE), mmap_mode='r')
+    with open(os.path.join(path, RECORDS_FILE), 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    return vectors, scales, metrics, records
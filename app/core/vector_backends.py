@@ -0,0 +1,600 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from core.quantization import QUANTIZATION_DTYPES, check_quantization, dequantize, dot, quantize
+
+
+class VectorBackend:
+    """
+    문구 벡터 색인 백엔드 인터페이스
+
+    VectorStore는 임베딩 계산/동기화 상태 관리만 담당하고, 벡터 저장과 필터 검색은 백엔드에 위임
+    query()는 유사도 내림차순으로 {'id', 'document', 'metadata', 'similarity'} 목록을 반환
+    """
+
+    name = 'base'
+    read_only = False
+    quantization = 'float32'  # 저장 정밀도 (float32가 아니면 VectorStore가 상위 후보를 원래 정밀도로 재계산)
+
+    def upsert(self, ids: List[str], embeddings: List[List[float]],
+               documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def update_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def delete(self, ids: List[str]) -> None:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """전체 삭제 (전체 재구축 전)"""
+        raise NotImplementedError
+
+    def query(self, embedding: Sequence[float], n_results: int,
+              team_id: str = None, channel: str = None,
+              min_ctr: float = 0.0, min_conversion_rate: float = 0.0) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_vectors(self, ids: List[str]) -> List[Optional[np.ndarray]]:
+        """저장된 벡터 조회 → id 순서대로 float32 벡터 (양자화된 경우 근사값, 없으면 None)"""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """변경 내용 영구 저장 (필요한 백엔드만)"""
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'count': self.count()}
+
+
+class ChromaBackend(VectorBackend):
+    """ChromaDB PersistentClient 기반 백엔드 (HNSW + where 필터)"""
+
+    name = 'chroma'
+    COLLECTION_NAME = 'marketing_phrases'
+
+    def __init__(self, path: str, embedding_function=None):
+        import chromadb
+        from chromadb.config import Settings
+
+        self.client = chromadb.PersistentClient(
+            path=path,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        self.embedding_function = embedding_function
+        self.collection = self.client.get_or_create_collection(
+            name=self.COLLECTION_NAME,
+            metadata={"hnsw:space": "cosine"},
+            embedding_function=embedding_function
+        )
+
+    @staticmethod
+    def _build_where(team_id: str = None, channel: str = None,
+                     min_ctr: float = 0.0, min_conversion_rate: float = 0.0):
+        """팀/채널/성과 기준을 모두 Chroma where 필터로 변환"""
+        conditions = []
+
+        if team_id:
+            conditions.append({'team_id': int(team_id)})
+
+        if channel:
+            conditions.append({'channel': channel})
+
+        if min_ctr > 0:
+            conditions.append({'ctr': {"$gte": min_ctr}})
+
+        if min_conversion_rate > 0:
+            conditions.append({'conversion_rate': {"$gte": min_conversion_rate}})
+
+        # 조건이 있으면 $and로 결합
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+
+    def update_metadata(self, ids, metadatas) -> None:
+        self.collection.update(ids=ids, metadatas=metadatas)
+
+    def delete(self, ids) -> None:
+        self.collection.delete(ids=ids)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def reset(self) -> None:
+        # 기존 컬렉션 삭제 후 재생성
+        try:
+            self.client.delete_collection(self.COLLECTION_NAME)
+        except:
+            pass
+
+        self.collection = self.client.create_collection(
+            name=self.COLLECTION_NAME,
+            metadata={"hnsw:space": "cosine"},
+            embedding_function=self.embedding_function
+        )
+
+    def query(self, embedding, n_results, team_id=None, channel=None,
+              min_ctr=0.0, min_conversion_rate=0.0) -> List[Dict[str, Any]]:
+        results = self.collection.query(
+            query_embeddings=[list(embedding)],
+            n_results=n_results,
+            where=self._build_where(team_id, channel, min_ctr, min_conversion_rate)
+        )
+
+        hits = []
+        if not (results['ids'] and results['ids'][0]):
+            return hits
+        for i, doc_id in enumerate(results['ids'][0]):
+            # 안전한 인덱스 접근
+            if i >= len(results['metadatas'][0]) or i >= len(results['distances'][0]):
+                continue
+            hits.append({
+                'id': doc_id,
+                'document': results['documents'][0][i],
+                'metadata': results['metadatas'][0][i],
+                'similarity': 1 - results['distances'][0][i]
+            })
+        return hits
+
+    def get_vectors(self, ids) -> List[Optional[np.ndarray]]:
+        if not ids:
+            return []
+        results = self.collection.get(ids=list(ids), include=['embeddings'])
+        found = {
+            doc_id: np.asarray(embedding, dtype=np.float32)
+            for doc_id, embedding in zip(results['ids'], results['embeddings'] or [])
+        }
+        return [found.get(doc_id) for doc_id in ids]
+
+
+def search_partitions(partitions, query: np.ndarray, n_results: int,
+                      min_ctr: float = 0.0, min_conversion_rate: float = 0.0) -> List[tuple]:
+    """
+    파티션별 정확 검색 → 유사도 내림차순 [(payload, 행, 유사도)] 최대 n_results개
+
+    partitions: [(정규화된 벡터 행렬, 행별 스케일 또는 None, ctr 배열, 전환율 배열, payload)]
+    (메모리 맵 배열도 복사 없이 사용, 양자화 행렬은 core.quantization.dot으로 점수 계산)
+    """
+    candidates = []  # (점수 배열, payload, 행 인덱스 배열)
+    for vectors, scales, ctr, conversion_rate, payload in partitions:
+        if vectors.shape[0] == 0:
+            continue
+        rows = None
+        if min_ctr > 0 or min_conversion_rate > 0:
+            mask = (ctr >= min_ctr) & (conversion_rate >= min_conversion_rate)
+            rows = np.flatnonzero(mask)
+            if rows.size == 0:
+                continue
+        if rows is None or vectors.dtype == np.float32:
+            scores = dot(vectors, scales, query)
+            if rows is not None:
+                scores = scores[rows]
+        else:
+            # 양자화 행렬은 필터를 통과한 행만 변환
+            scores = dot(vectors[rows], None if scales is None else scales[rows], query)
+
+        # 파티션별 top-k (정렬 없이 선택)
+        k = min(n_results, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k] if k < scores.shape[0] else np.arange(scores.shape[0])
+        candidates.append((scores[top], payload, top if rows is None else rows[top]))
+
+    if not candidates:
+        return []
+
+    # 파티션 간 병합 후 최종 top-k 정렬
+    all_scores = np.concatenate([scores for scores, _, _ in candidates])
+    owners = np.concatenate([np.full(len(scores), i) for i, (scores, _, _) in enumerate(candidates)])
+    positions = np.concatenate([np.arange(len(scores)) for scores, _, _ in candidates])
+    order = np.argsort(-all_scores, kind='stable')[:n_results]
+
+    results = []
+    for index in order:
+        _, payload, rows = candidates[owners[index]]
+        results.append((payload, int(rows[positions[index]]), float(all_scores[index])))
+    return results
+
+
+class _Partition:
+    """
+    (team_id, channel) 파티션: 정규화된 벡터 행렬 + 필터용 성과 배열 (용량 2배씩 증가)
+
+    벡터는 quantization 정밀도로 저장 (int8이면 행별 스케일 배열도 함께 보관)
+    """
+
+    def __init__(self, dim: int, quantization: str = 'float32'):
+        self.dim = dim
+        self.quantization = quantization
+        self.size = 0
+        self.vectors = np.empty((16, dim), dtype=QUANTIZATION_DTYPES[quantization])
+        self.scales = np.empty(16, dtype=np.float32) if quantization == 'int8' else None
+        self.ctr = np.empty(16, dtype=np.float64)
+        self.conversion_rate = np.empty(16, dtype=np.float64)
+        self.ids = []
+        self.documents = []
+        self.metadatas = []
+
+    def _reserve(self, size: int) -> None:
+        capacity = self.vectors.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('vectors', 'scales', 'ctr', 'conversion_rate'):
+            old = getattr(self, name)
+            if old is None:
+                continue
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append(self, doc_id: str, vector: np.ndarray, document: str, metadata: Dict[str, Any]) -> int:
+        self._reserve(self.size + 1)
+        row = self.size
+        codes, scales = quantize(vector[None], self.quantization)
+        self.vectors[row] = codes[0]
+        if self.scales is not None:
+            self.scales[row] = scales[0]
+        self.set_metadata(row, metadata)
+        self.ids.append(doc_id)
+        self.documents.append(document)
+        self.size += 1
+        return row
+
+    def set_metadata(self, row: int, metadata: Dict[str, Any]) -> None:
+        self.ctr[row] = float(metadata.get('ctr') or 0.0)
+        self.conversion_rate[row] = float(metadata.get('conversion_rate') or 0.0)
+        if row < len(self.metadatas):
+            self.metadatas[row] = metadata
+        else:
+            self.metadatas.append(metadata)
+
+    def vector(self, row: int) -> np.ndarray:
+        """저장된 행 → float32 벡터 (양자화된 경우 근사값)"""
+        return dequantize(self.vectors[row:row + 1], None if self.scales is None else self.scales[row:row + 1])[0]
+
+    def matrix(self):
+        """검색용 (벡터 행렬, 스케일) 슬라이스"""
+        return self.vectors[:self.size], None if self.scales is None else self.scales[:self.size]
+
+    def remove(self, row: int) -> Optional[str]:
+        """행 삭제 (마지막 행을 빈자리로 이동) → 이동된 행의 id 반환"""
+        last = self.size - 1
+        moved = None
+        if row != last:
+            self.vectors[row] = self.vectors[last]
+            if self.scales is not None:
+                self.scales[row] = self.scales[last]
+            self.ctr[row] = self.ctr[last]
+            self.conversion_rate[row] = self.conversion_rate[last]
+            self.ids[row] = self.ids[last]
+            self.documents[row] = self.documents[last]
+            self.metadatas[row] = self.metadatas[last]
+            moved = self.ids[row]
+        self.ids.pop()
+        self.documents.pop()
+        self.metadatas.pop()
+        self.size -= 1
+        return moved
+
+
+class NumpyBackend(VectorBackend):
+    """
+    프로세스 내 NumPy 백엔드 (수만 건 규모용)
+
+    - (team_id, channel)별 파티션에 정규화된 행렬 보관 (quantization: float32 | float16 | int8)
+    - 검색: 필터에 맞는 파티션만 골라 행렬곱 1회 + argpartition으로 top-k
+    - flush() 시 path 디렉토리에 저장하고, 시작 시 불러옴 (저장된 정밀도가 다르면 불러오면서 변환)
+    """
+
+    name = 'numpy'
+
+    def __init__(self, path: str = None, quantization: str = 'float32'):
+        self.path = path
+        self.quantization = check_quantization(quantization)
+        self._partitions = {}  # (team_id, channel) -> _Partition
+        self._locations = {}  # id -> (partition key, row)
+        self._lock = threading.RLock()
+        self._dirty = False
+        if path:
+            self._load()
+
+    @staticmethod
+    def _key(metadata: Dict[str, Any]):
+        return (metadata.get('team_id', ''), metadata.get('channel', ''))
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _insert(self, doc_id: str, vector: np.ndarray, document: str, metadata: Dict[str, Any]) -> None:
+        key = self._key(metadata)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition(vector.shape[0], self.quantization)
+        row = partition.append(doc_id, vector, document, metadata)
+        self._locations[doc_id] = (key, row)
+
+    def _remove(self, doc_id: str) -> Optional[tuple]:
+        """id 삭제 → (벡터, 문서) 반환 (없으면 None)"""
+        location = self._locations.pop(doc_id, None)
+        if location is None:
+            return None
+        key, row = location
+        partition = self._partitions[key]
+        removed = (partition.vector(row), partition.documents[row])
+        moved = partition.remove(row)
+        if moved is not None:
+            self._locations[moved] = (key, row)
+        if partition.size == 0:
+            del self._partitions[key]
+        return removed
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        vectors = self._normalize(embeddings)
+        with self._lock:
+            for doc_id, vector, document, metadata in zip(ids, vectors, documents, metadatas):
+                self._remove(doc_id)
+                self._insert(doc_id, vector, document, dict(metadata))
+            self._dirty = True
+
+    def update_metadata(self, ids, metadatas) -> None:
+        with self._lock:
+            for doc_id, metadata in zip(ids, metadatas):
+                location = self._locations.get(doc_id)
+                if location is None:
+                    continue
+                key, row = location
+                if self._key(metadata) == key:
+                    self._partitions[key].set_metadata(row, dict(metadata))
+                else:
+                    # 팀/채널이 바뀌면 파티션 이동
+                    vector, document = self._remove(doc_id)
+                    self._insert(doc_id, vector, document, dict(metadata))
+            self._dirty = True
+
+    def delete(self, ids) -> None:
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+            self._dirty = True
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._locations)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._partitions = {}
+            self._locations = {}
+            self._dirty = True
+
+    def query(self, embedding, n_results, team_id=None, channel=None,
+              min_ctr=0.0, min_conversion_rate=0.0) -> List[Dict[str, Any]]:
+        if n_results <= 0:
+            return []
+        query = self._normalize(embedding)
+        team_key = int(team_id) if team_id else None
+
+        with self._lock:
+            partitions = [
+                partition.matrix() + (partition.ctr[:partition.size], partition.conversion_rate[:partition.size], partition)
+                for (team, part_channel), partition in self._partitions.items()
+                if (team_key is None or team == team_key) and (not channel or part_channel == channel)
+            ]
+            return [
+                {
+                    'id': partition.ids[row],
+                    'document': partition.documents[row],
+                    'metadata': dict(partition.metadatas[row]),
+                    'similarity': score
+                }
+                for partition, row, score in search_partitions(partitions, query, n_results, min_ctr, min_conversion_rate)
+            ]
+
+    def get_vectors(self, ids) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            vectors = []
+            for doc_id in ids:
+                location = self._locations.get(doc_id)
+                if location is None:
+                    vectors.append(None)
+                    continue
+                key, row = location
+                vectors.append(self._partitions[key].vector(row))
+            return vectors
+
+    def _files(self):
+        return (os.path.join(self.path, 'vectors.npy'), os.path.join(self.path, 'scales.npy'),
+                os.path.join(self.path, 'records.json'))
+
+    def flush(self) -> None:
+        """변경 내용을 path에 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            ids, documents, metadatas, blocks, scale_blocks = [], [], [], [], []
+            for partition in self._partitions.values():
+                ids.extend(partition.ids)
+                documents.extend(partition.documents)
+                metadatas.extend(partition.metadatas)
+                vectors, scales = partition.matrix()
+                blocks.append(vectors)
+                if scales is not None:
+                    scale_blocks.append(scales)
+            vectors = np.concatenate(blocks) if blocks else np.empty((0, 0), dtype=np.float32)
+            scales = np.concatenate(scale_blocks) if scale_blocks else None
+            self._dirty = False
+
+        os.makedirs(self.path, exist_ok=True)
+        vectors_path, scales_path, records_path = self._files()
+        with open(vectors_path + '.tmp', 'wb') as f:
+            np.save(f, vectors)
+        if scales is not None:
+            with open(scales_path + '.tmp', 'wb') as f:
+                np.save(f, scales)
+        with open(records_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'ids': ids, 'documents': documents, 'metadatas': metadatas,
+                       'quantization': self.quantization}, f, ensure_ascii=False)
+        os.replace(vectors_path + '.tmp', vectors_path)
+        if scales is not None:
+            os.replace(scales_path + '.tmp', scales_path)
+        elif os.path.exists(scales_path):
+            os.remove(scales_path)
+        os.replace(records_path + '.tmp', records_path)
+        print(f"💾 NumPy 벡터 색인 저장: {len(ids)}개 ({self.path})")
+
+    def _load(self) -> None:
+        vectors_path, scales_path, records_path = self._files()
+        if not (os.path.exists(vectors_path) and os.path.exists(records_path)):
+            return
+        try:
+            vectors = np.load(vectors_path)
+            with open(records_path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+            scales = None
+            if records.get('quantization', 'float32') == 'int8':
+                scales = np.load(scales_path)
+            if len(records['ids']) != vectors.shape[0] or (scales is not None and scales.shape[0] != vectors.shape[0]):
+                raise ValueError("벡터 수와 레코드 수가 다릅니다")
+        except Exception as e:
+            # 손상된 파일은 무시 (동기화 시 전체 재구축)
+            print(f"⚠️ NumPy 벡터 색인 로드 실패: {e}")
+            return
+
+        for i, (doc_id, document, metadata) in enumerate(zip(records['ids'], records['documents'], records['metadatas'])):
+            vector = dequantize(vectors[i:i + 1], None if scales is None else scales[i:i + 1])[0]
+            self._insert(doc_id, vector, document, metadata)
+        print(f"📂 NumPy 벡터 색인 로드: {len(records['ids'])}개")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': self.name,
+                'count': len(self._locations),
+                'partitions': len(self._partitions),
+                'quantization': self.quantization,
+                'memory_bytes': int(sum(p.vectors.nbytes + (p.scales.nbytes if p.scales is not None else 0) +
+                                        p.ctr.nbytes + p.conversion_rate.nbytes
+                                        for p in self._partitions.values()))
+            }
+
+
+class SnapshotBackend(VectorBackend):
+    """
+    읽기 전용 스냅샷 백엔드 (core.snapshot 형식)
+
+    - 벡터/성과 배열은 메모리 맵으로 열어 복사하지 않음 → 같은 노드의 워커들이 OS 페이지 캐시를 공유
+    - 파티션은 manifest의 연속 구간 [start, end) 슬라이스로 접근
+    - 쓰기 작업은 지원하지 않음 (배치 작업에서 export_snapshot으로 다시 만들어 배포)
+    """
+
+    name = 'snapshot'
+    read_only = True
+
+    def __init__(self, path: str, verify: bool = True):
+        from core.snapshot import read_manifest, open_arrays
+
+        self.path = path
+        self.manifest = read_manifest(path, verify=verify)
+        self.model_id = self.manifest['model_id']
+        self.quantization = self.manifest.get('quantization', 'float32')
+        self.vectors, self.scales, self.metrics, records = open_arrays(path)
+        self.ids = records['ids']
+        self.documents = records['documents']
+        self.metadatas = records['metadatas']
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self._partitions = {
+            (partition['team_id'], partition['channel']): (partition['start'], partition['end'])
+            for partition in self.manifest['partitions']
+        }
+        print(f"📂 벡터 색인 스냅샷 열기: {len(self.ids)}개 (버전 {self.manifest['version']}, {path})")
+
+    def _read_only(self, *args, **kwargs):
+        raise RuntimeError("읽기 전용 스냅샷 백엔드는 수정할 수 없습니다")
+
+    upsert = update_metadata = delete = reset = _read_only
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def query(self, embedding, n_results, team_id=None, channel=None,
+              min_ctr=0.0, min_conversion_rate=0.0) -> List[Dict[str, Any]]:
+        if n_results <= 0:
+            return []
+        query = NumpyBackend._normalize(embedding)
+        team_key = int(team_id) if team_id else None
+
+        partitions = [
+            (self.vectors[start:end], None if self.scales is None else self.scales[start:end],
+             self.metrics[start:end, 0], self.metrics[start:end, 1], start)
+            for (team, part_channel), (start, end) in self._partitions.items()
+            if (team_key is None or team == team_key) and (not channel or part_channel == channel)
+        ]
+        return [
+            {
+                'id': self.ids[start + row],
+                'document': self.documents[start + row],
+                'metadata': dict(self.metadatas[start + row]),
+                'similarity': score
+            }
+            for start, row, score in search_partitions(partitions, query, n_results, min_ctr, min_conversion_rate)
+        ]
+
+    def get_vectors(self, ids) -> List[Optional[np.ndarray]]:
+        vectors = []
+        for doc_id in ids:
+            row = self._rows.get(doc_id)
+            if row is None:
+                vectors.append(None)
+                continue
+            scales = None if self.scales is None else self.scales[row:row + 1]
+            vectors.append(dequantize(self.vectors[row:row + 1], scales)[0])
+        return vectors
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': self.name,
+            'count': len(self.ids),
+            'partitions': len(self._partitions),
+            'version': self.manifest['version'],
+            'created_at': self.manifest['created_at'],
+            'quantization': self.quantization,
+            'mapped_bytes': int(self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0) +
+                                self.metrics.nbytes)
+        }
+
+
+def create_backend(name: str, path: str, embedding_function=None, verify_snapshot: bool = True,
+                   quantization: str = 'float32') -> VectorBackend:
+    """
+    Config.VECTOR_BACKEND 이름으로 백엔드 생성
+
+    quantization은 numpy 백엔드에만 적용 (chroma는 항상 float32, snapshot은 만들 때 정한 정밀도 사용)
+    """
+    if name == 'numpy':
+        return NumpyBackend(path, quantization=quantization)
+    if name == 'snapshot':
+        return SnapshotBackend(path, verify=verify_snapshot)
+    if name == 'chroma':
+        return ChromaBackend(path, embedding_function)
+    raise ValueError(f"지원하지 않는 벡터 백엔드입니다: {name}")
@@ -1,235 +1,1009 @@
-import chromadb
-from chromadb.config import Settings
+import hashlib
 import json
 import os
-from typing import List, Dict, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from config import Config
+from core.cache import LRUCache
+from core.embedding import get_embedding_engine
+from core.embedding_cache import EmbeddingCache
+from core.lexical_index import LexicalIndex
+from core.rerank import mmr_rerank
+from core.snapshot import SnapshotError, write_snapshot
+from core.vector_backends import create_backend
 from db import get_phrases_db
 
+# 증분 동기화 상태 (벡터 저장소에 반영된 행별 해시)
+SYNC_STATE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vector_sync_state (
+        copy_id INTEGER PRIMARY KEY,
+        doc_hash TEXT NOT NULL,  -- 임베딩 대상 텍스트 해시 ('' = 텍스트가 없어 색인하지 않음)
+        row_hash TEXT NOT NULL   -- 메타데이터 포함 행 해시 (성과 지표 변경 감지)
+    )
+"""
+
+PHRASE_COLUMNS = """
+    m.copy_id,
+    m.team_id,
+    m.channel,
+    m.content_data,
+    m.keywords,
+    m.target_audience,
+    m.tone,
+    m.send_date,
+    m.ctr,
+    m.conversion_rate,
+    m.impression_count,
+    m.click_count,
+    m.conversion_count
+"""
+
+SYNC_COLUMNS = PHRASE_COLUMNS + """,
+    row_hash(m.team_id, m.channel, m.content_data, m.keywords, m.target_audience, m.tone,
+             m.send_date, m.ctr, m.conversion_rate, m.impression_count, m.click_count,
+             m.conversion_count) AS row_hash
+"""
+
+
+# 슬림 메타데이터 모드에서 색인에 저장하는 값 (필터에 필요한 값만)
+SLIM_METADATA_FIELDS = ('copy_id', 'team_id', 'channel', 'ctr', 'conversion_rate')
+
+# 검색 결과에서 DB 값으로 채우는 항목
+HYDRATED_FIELDS = (
+    'title', 'message', 'team_id', 'channel', 'keywords', 'target_audience', 'tone',
+    'ctr', 'conversion_rate', 'impression_count', 'click_count', 'conversion_count'
+)
+
+
+def _hash(*values) -> str:
+    """동기화 변경 감지용 해시 (SQLite 함수로도 등록해서 사용)"""
+    payload = json.dumps(values, ensure_ascii=False, default=str)
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
 class VectorStore:
     def __init__(self):
         """벡터 저장소 초기화"""
-        # ChromaDB 클라이언트 초기화 (절대 경로 사용)
-        chroma_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'chroma_db')
-        self.client = chromadb.PersistentClient(
-            path=chroma_path,
-            settings=Settings(anonymized_telemetry=False)
+        # 동기화/추가 작업 직렬화 (프로세스 내 공유 인스턴스용)
+        self._write_lock = threading.RLock()
+        
+        # 대량 색인용 임베딩 워커 풀 + 진행 상황
+        self._embed_executor = ThreadPoolExecutor(
+            max_workers=Config.VECTOR_EMBED_WORKERS,
+            thread_name_prefix='embed'
         )
+        self._progress_lock = threading.Lock()
+        self.sync_progress = {'running': False}
         
-        # 컬렉션 초기화 (ChromaDB 기본 임베딩 사용)
-        self.collection = self.client.get_or_create_collection(
-            name="marketing_phrases",
-            metadata={"hnsw:space": "cosine"}
+        # 임베딩 엔진 (색인/쿼리 공통, 프로세스당 모델 1회 로드 - 첫 임베딩 계산 때 로드)
+        self.embedding_function = get_embedding_engine(
+            Config.EMBEDDING_ENGINE,
+            Config.EMBEDDING_MODEL,
+            threads=Config.EMBEDDING_THREADS,
+            batch_size=Config.EMBEDDING_BATCH_SIZE,
+            max_length=Config.EMBEDDING_MAX_LENGTH
         )
+        
+        # 임베딩 영구 캐시 (모델 ID + 텍스트 해시, 바뀌지 않은 문구는 다시 계산하지 않음)
+        self.model_id = self.embedding_function.model_name
+        self.embedding_cache = None
+        if Config.EMBEDDING_CACHE_ENABLED:
+            self.embedding_cache = EmbeddingCache(Config.EMBEDDING_CACHE_PATH, self.model_id)
+        
+        # 검색 쿼리 임베딩 LRU 캐시 (반복되는 주제는 임베딩 모델을 거치지 않음)
+        self.query_embedding_cache = LRUCache(max_size=Config.QUERY_EMBEDDING_CACHE_SIZE)
+        
+        # 벡터 색인 백엔드 (Config.VECTOR_BACKEND: chroma | numpy | snapshot, 절대 경로 사용)
+        backend_paths = {
+            'chroma': os.path.join(os.path.dirname(__file__), '..', 'data', 'chroma_db'),
+            'numpy': Config.NUMPY_INDEX_PATH,
+            'snapshot': Config.VECTOR_SNAPSHOT_PATH
+        }
+        self.backend = create_backend(
+            Config.VECTOR_BACKEND,
+            backend_paths.get(Config.VECTOR_BACKEND),
+            embedding_function=self.embedding_function,
+            verify_snapshot=Config.VECTOR_SNAPSHOT_VERIFY,
+            quantization=Config.VECTOR_QUANTIZATION
+        )
+        
+        # 스냅샷은 만든 임베딩 모델과 쿼리 임베딩 모델이 같아야 함
+        snapshot_model = getattr(self.backend, 'model_id', None)
+        if snapshot_model is not None and snapshot_model != self.model_id:
+            raise SnapshotError(f"스냅샷 임베딩 모델({snapshot_model})이 현재 모델({self.model_id})과 다릅니다")
+        
+        # 브랜드/이벤트명/할인 표기 정확 일치용 문자 n-gram BM25 색인 (첫 검색 때 DB에서 적재, 이후 동기화마다 증분 갱신)
+        self.lexical_index = LexicalIndex(ngram=Config.LEXICAL_NGRAM) if Config.HYBRID_SEARCH_ENABLED else None
+        self._lexical_lock = threading.Lock()
+        self._lexical_loaded = False
+    
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 임베딩 (컬렉션과 동일한 임베딩 함수 사용, 영구 캐시에 없는 텍스트만 계산)"""
+        if not texts:
+            return []
+        if self.embedding_cache is None:
+            return [[float(x) for x in embedding] for embedding in self.embedding_function(texts)]
+        
+        embeddings = self.embedding_cache.get_many(texts)
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        if missing:
+            computed = [[float(x) for x in embedding] for embedding in self.embedding_function(missing)]
+            self.embedding_cache.put_many(missing, computed)
+            by_text = dict(zip(missing, computed))
+            embeddings = [embedding if embedding is not None else by_text[text] for text, embedding in zip(texts, embeddings)]
+        return embeddings
     
-    def add_phrases(self, phrases: List[Dict[str, Any]]) -> None:
-        """문구들을 벡터 저장소에 추가"""
+    def prime_query_embeddings(self, queries: List[str]) -> int:
+        """
+        여러 검색 쿼리 임베딩을 한 번에 계산해 쿼리 임베딩 LRU에 저장 → 새로 계산한 쿼리 수
+        
+        이후 retrieve/embed_query는 LRU에서 바로 가져감 (묶음 검색 / 사이드카 배치용)
+        """
+        missing = list(dict.fromkeys(query for query in queries if self.query_embedding_cache.get(query) is None))
+        for query, embedding in zip(missing, self.embed_texts(missing)):
+            self.query_embedding_cache.set(query, tuple(embedding))
+        return len(missing)
+    
+    def embed_query(self, query: str) -> List[float]:
+        """검색 쿼리 임베딩 (메모리 LRU → 영구 캐시 → 임베딩 함수 순으로 조회)"""
+        cached = self.query_embedding_cache.get(query)
+        if cached is not None:
+            return list(cached)
+        
+        embedding = self.embed_texts([query])[0]
+        self.query_embedding_cache.set(query, tuple(embedding))
+        return embedding
+    
+    @staticmethod
+    def _phrase_text(phrase: Dict[str, Any]) -> str:
+        """키워드와 타겟으로 유사도 계산용 텍스트 생성"""
+        keywords = phrase.get('keywords', '')
+        target_audience = phrase.get('target_audience', '')
+        return f"{keywords} {target_audience}".strip()
+    
+    @staticmethod
+    def _lexical_text(phrase: Dict[str, Any]) -> str:
+        """어휘 색인 대상 텍스트 (제목 + 내용 + 키워드 + 타겟)"""
+        parts = [phrase.get(key) or '' for key in ('title', 'message', 'keywords', 'target_audience')]
+        return " ".join(part for part in parts if part)
+    
+    @staticmethod
+    def _phrase_metadata(phrase: Dict[str, Any]) -> Dict[str, Any]:
+        """메타데이터 준비 (None 값 제거)"""
+        return {
+            'copy_id': phrase.get('copy_id') or '',
+            'team_id': phrase.get('team_id') or '',
+            'channel': phrase.get('channel') or '',
+            'keywords': phrase.get('keywords') or '',
+            'target_audience': phrase.get('target_audience') or '',
+            'tone': phrase.get('tone') or '',
+            'ctr': float(phrase.get('ctr', 0)) if phrase.get('ctr') is not None else 0.0,
+            'conversion_rate': float(phrase.get('conversion_rate', 0)) if phrase.get('conversion_rate') is not None else 0.0,
+            'impression_count': int(phrase.get('impression_count', 0)) if phrase.get('impression_count') is not None else 0,
+            'click_count': int(phrase.get('click_count', 0)) if phrase.get('click_count') is not None else 0,
+            'conversion_count': int(phrase.get('conversion_count', 0)) if phrase.get('conversion_count') is not None else 0,
+            'send_date': phrase.get('send_date') or '',
+            'title': phrase.get('title', ''),
+            'message': phrase.get('message', '')
+        }
+    
+    def _index_metadata(self, phrase: Dict[str, Any]) -> Dict[str, Any]:
+        """벡터 색인에 저장할 메타데이터 (VECTOR_SLIM_METADATA면 필터에 필요한 값만)"""
+        metadata = self._phrase_metadata(phrase)
+        if Config.VECTOR_SLIM_METADATA:
+            return {key: metadata[key] for key in SLIM_METADATA_FIELDS}
+        return metadata
+    
+    def _embed_pipeline(self, batches: Iterable[Tuple[Any, List[str]]]) -> Iterator[Tuple[Any, List[List[float]]]]:
+        """
+        (payload, texts) 묶음을 워커 풀에서 미리 임베딩하고 입력 순서대로 (payload, embeddings) 반환
+        
+        동시에 임베딩하는 묶음은 워커 수의 2배로 제한 (메모리 사용량 고정)
+        """
+        window = max(1, Config.VECTOR_EMBED_WORKERS) * 2
+        pending = deque()
+        try:
+            for payload, texts in batches:
+                future = self._embed_executor.submit(self.embed_texts, texts) if texts else None
+                pending.append((payload, future))
+                if len(pending) >= window:
+                    payload, future = pending.popleft()
+                    yield payload, future.result() if future else []
+            while pending:
+                payload, future = pending.popleft()
+                yield payload, future.result() if future else []
+        finally:
+            for _, future in pending:
+                if future:
+                    future.cancel()
+    
+    def _upsert_chunk(self, phrases: List[Dict[str, Any]], texts: List[str], embeddings: List[List[float]]) -> None:
         if not phrases:
             return
+        self.backend.upsert(
+            ids=[f"phrase_{phrase.get('copy_id')}" for phrase in phrases],
+            embeddings=embeddings,
+            documents=texts,
+            metadatas=[self._index_metadata(phrase) for phrase in phrases]
+        )
+    
+    def add_phrases(self, phrases: List[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        문구들을 벡터 저장소에 추가 (같은 copy_id가 있으면 덮어씀) → 추가한 문구 수 반환
         
-        # 문서와 메타데이터 준비
-        documents = []
-        metadatas = []
-        ids = []
+        batch_size개씩 워커 풀에서 임베딩하고 청크 단위로 upsert
+        """
+        if not phrases:
+            return 0
+        self._check_writable()
+        batch_size = batch_size or Config.VECTOR_SYNC_BATCH_SIZE
         
-        for phrase in phrases:
-            # 키워드와 타겟으로 유사도 계산용 텍스트 생성
-            keywords = phrase.get('keywords', '')
-            target_audience = phrase.get('target_audience', '')
-            text = f"{keywords} {target_audience}".strip()
-            
-            if not text:
-                continue
+        def batches():
+            for start in range(0, len(phrases), batch_size):
+                # 키워드/타겟 텍스트가 없는 문구는 제외
+                chunk = [(phrase, self._phrase_text(phrase)) for phrase in phrases[start:start + batch_size]]
+                chunk = [(phrase, text) for phrase, text in chunk if text]
+                yield chunk, [text for _, text in chunk]
+        
+        added = 0
+        for chunk, embeddings in self._embed_pipeline(batches()):
+            self._upsert_chunk([phrase for phrase, _ in chunk], [text for _, text in chunk], embeddings)
+            self._apply_lexical([phrase for phrase, _ in chunk], [])
+            added += len(chunk)
+        
+        if added:
+            self.backend.flush()
+            print(f"✅ {added}개 문구를 벡터 저장소에 추가했습니다.")
+        return added
+    
+    @staticmethod
+    def _format_results(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """백엔드 검색 결과 → 문구 목록 (유사도 내림차순)"""
+        phrases = []
+        for hit in hits:
+            metadata = hit['metadata']
+            phrases.append({
+                'copy_id': metadata.get('copy_id'),
+                'text': hit['document'],
+                'title': metadata.get('title', ''),
+                'message': metadata.get('message', ''),
+                'team_id': metadata.get('team_id', ''),
+                'channel': metadata.get('channel', ''),
+                'keywords': metadata.get('keywords', ''),
+                'target_audience': metadata.get('target_audience', ''),
+                'tone': metadata.get('tone', ''),
+                'ctr': metadata.get('ctr', 0),
+                'conversion_rate': metadata.get('conversion_rate', 0),
+                'impression_count': metadata.get('impression_count', 0),
+                'click_count': metadata.get('click_count', 0),
+                'conversion_count': metadata.get('conversion_count', 0),
+                'similarity_score': hit['similarity']
+            })
+        return phrases
+    
+    def _cached_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """영구 임베딩 캐시에 있는 텍스트 벡터만 조회 (없으면 None, 임베딩 함수는 호출하지 않음)"""
+        if self.embedding_cache is None or not texts:
+            return [None] * len(texts)
+        return self.embedding_cache.get_many(texts)
+    
+    def _stored_vectors(self, copy_ids: List[Any], texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        문구의 저장된 벡터 (임베딩 캐시의 float32 벡터 → 없으면 백엔드 색인 벡터, 둘 다 없으면 None)
+        
+        검색 경로에서 쓰므로 임베딩 모델은 실행하지 않음
+        """
+        vectors = self._cached_embeddings(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            stored = self.backend.get_vectors([f"phrase_{copy_ids[i]}" for i in missing])
+            for i, vector in zip(missing, stored):
+                vectors[i] = vector
+        return vectors
+    
+    @staticmethod
+    def _cosine(embedding: List[float], vectors: List[Any]) -> np.ndarray:
+        """쿼리 벡터와 벡터 목록의 float32 코사인 유사도"""
+        query_vector = np.asarray(embedding, dtype=np.float32)
+        query_vector = query_vector / (np.linalg.norm(query_vector) or 1.0)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        return (vectors @ query_vector) / norms
+    
+    def _query_backend(self, embedding: List[float], n_results: int, **filters) -> List[Dict[str, Any]]:
+        """
+        백엔드 검색 → 유사도 내림차순 최대 n_results개
+        
+        양자화 색인(float16/int8)이고 VECTOR_RESCORE면 n_results × VECTOR_RESCORE_FACTOR개를 가져와
+        임베딩 캐시에 float32 벡터가 있는 후보만 유사도를 다시 계산해 정렬 (양자화 오차로 인한 순위 뒤바뀜 보정)
+        캐시에 없는 후보는 양자화 점수를 그대로 사용 (검색 경로에서 임베딩 모델을 실행하지 않음)
+        """
+        if self.backend.quantization == 'float32' or not Config.VECTOR_RESCORE:
+            return self.backend.query(embedding, n_results, **filters)
+        
+        hits = self.backend.query(embedding, n_results * max(1, Config.VECTOR_RESCORE_FACTOR), **filters)
+        if not hits:
+            return hits
+        cached = [(hit, vector) for hit, vector in zip(hits, self._cached_embeddings([hit['document'] for hit in hits]))
+                  if vector is not None]
+        if cached:
+            similarities = self._cosine(embedding, [vector for _, vector in cached])
+            for (hit, _), similarity in zip(cached, similarities):
+                hit['similarity'] = float(similarity)
+        hits.sort(key=lambda hit: hit['similarity'], reverse=True)
+        return hits[:n_results]
+    
+    def retrieve(self, query: str, n_results: int = 5,
+                 team_id: str = None, channel: str = None,
+                 min_ctr: float = 0.0,
+                 min_conversion_rate: float = 0.0,
+                 min_similarity: float = 0.0,
+                 max_candidates: int = None,
+                 unique: bool = True,
+                 hybrid: bool = None) -> Dict[str, Any]:
+        """
+        적응형 후보 확장 검색 → {'results', 'scanned', 'rounds', 'exhausted', 'lexical'}
+        
+        - 팀/채널/최소 CTR/최소 전환율 필터를 모두 백엔드 쿼리에 넣어 조회
+        - 유사도 기준을 넘는 결과가 n_results개 모일 때까지 후보 수를 두 배씩 늘려 재조회 (max_candidates까지)
+        - 결과는 유사도 순이므로 기준 미달 후보가 나오거나 필터에 맞는 후보를 모두 본 경우 바로 중단
+        - unique=True면 제목+내용이 같은 문구는 하나만 포함
+        - hybrid(기본: HYBRID_SEARCH_ENABLED)면 같은 필터의 어휘(BM25) 검색 결과를 RRF로 결합
+          ('lexical'은 어휘 검색으로만 찾아 추가된 문구 수)
+        """
+        embedding = self.embed_query(query)
+        max_candidates = max(n_results, max_candidates or Config.RAG_MAX_CANDIDATES)
+        k = min(max_candidates, max(n_results, int(n_results * Config.RAG_OVERFETCH_FACTOR)))
+        
+        rounds = 0
+        while True:
+            rounds += 1
+            hits = self._query_backend(
+                embedding,
+                k,
+                team_id=team_id,
+                channel=channel,
+                min_ctr=min_ctr,
+                min_conversion_rate=min_conversion_rate
+            )
+            candidates = self._format_results(hits)
+            # 슬림 메타데이터 색인이면 제목/내용/현재 성과 지표를 DB에서 채움 (이전 형식 색인과 섞여 있어도 동작)
+            if Config.VECTOR_SLIM_METADATA or any('message' not in hit['metadata'] for hit in hits):
+                candidates = self._hydrate_results(candidates)
             
-            # 메타데이터 준비 (None 값 제거)
-            metadata = {
-                'copy_id': phrase.get('copy_id') or '',
-                'team_id': phrase.get('team_id') or '',
-                'channel': phrase.get('channel') or '',
-                'keywords': phrase.get('keywords') or '',
-                'target_audience': phrase.get('target_audience') or '',
-                'tone': phrase.get('tone') or '',
-                'ctr': float(phrase.get('ctr', 0)) if phrase.get('ctr') is not None else 0.0,
-                'conversion_rate': float(phrase.get('conversion_rate', 0)) if phrase.get('conversion_rate') is not None else 0.0,
-                'impression_count': int(phrase.get('impression_count', 0)) if phrase.get('impression_count') is not None else 0,
-                'click_count': int(phrase.get('click_count', 0)) if phrase.get('click_count') is not None else 0,
-                'conversion_count': int(phrase.get('conversion_count', 0)) if phrase.get('conversion_count') is not None else 0,
-                'send_date': phrase.get('send_date') or '',
-                'title': phrase.get('title', ''),
-                'message': phrase.get('message', '')
-            }
+            matches = []
+            seen_combinations = set()
+            below_threshold = False
+            for phrase in candidates:
+                # 유사도 임계값 확인 (이후 후보는 모두 더 낮음)
+                if phrase['similarity_score'] < min_similarity:
+                    below_threshold = True
+                    break
+                if unique:
+                    combination = f"{phrase['title']}|{phrase['message']}"
+                    if combination in seen_combinations:
+                        continue
+                    seen_combinations.add(combination)
+                matches.append(phrase)
+                if len(matches) >= n_results:
+                    break
             
-            documents.append(text)
-            metadatas.append(metadata)
-            ids.append(f"phrase_{phrase.get('copy_id', len(documents))}")
+            exhausted = len(hits) < k
+            if len(matches) >= n_results or below_threshold or exhausted or k >= max_candidates:
+                break
+            k = min(max_candidates, k * 2)
         
-        # 벡터 저장소에 추가
-        if documents:
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
+        lexical = 0
+        if hybrid is None:
+            hybrid = self.lexical_index is not None
+        if hybrid and self.lexical_index is not None:
+            matches, lexical = self._fuse_lexical(
+                query, embedding, matches, n_results,
+                team_id, channel, min_ctr, min_conversion_rate, min_similarity, unique
             )
-            print(f"✅ {len(documents)}개 문구를 벡터 저장소에 추가했습니다.")
+        
+        return {
+            'results': matches,
+            'scanned': len(hits),
+            'rounds': rounds,
+            'exhausted': exhausted,
+            'lexical': lexical
+        }
+    
+    def rerank(self, query: str, phrases: List[Dict[str, Any]], top_n: int = None) -> List[Dict[str, Any]]:
+        """
+        검색 결과 재정렬 (유사도 + CTR + 전환율 가중 relevance, MMR 다양성) → 상위 top_n개
+        
+        문구 벡터는 저장된 벡터(임베딩 캐시 → 백엔드 색인)를, 쿼리 벡터는 쿼리 임베딩 LRU를 사용
+        (색인에 없는 문구만 임베딩 계산)
+        """
+        if not phrases:
+            return []
+        texts = [phrase['text'] for phrase in phrases]
+        vectors = self._stored_vectors([phrase['copy_id'] for phrase in phrases], texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            for i, vector in zip(missing, self.embed_texts([texts[i] for i in missing])):
+                vectors[i] = vector
+        return mmr_rerank(
+            phrases,
+            self.embed_query(query),
+            vectors,
+            top_n=top_n or Config.RERANK_TOP_N,
+            similarity_weight=Config.RERANK_SIMILARITY_WEIGHT,
+            ctr_weight=Config.RERANK_CTR_WEIGHT,
+            conversion_weight=Config.RERANK_CONVERSION_WEIGHT,
+            mmr_lambda=Config.RERANK_MMR_LAMBDA
+        )
+    
+    def retrieve_many(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 retrieve 요청 묶음 처리 (쿼리 임베딩은 한 번의 배치로 계산) → 요청 순서대로 결과"""
+        self.prime_query_embeddings([request['query'] for request in requests])
+        return [self.retrieve(**request) for request in requests]
     
     def search_similar_phrases(self, query: str, n_results: int = 5, 
                               team_id: str = None, channel: str = None,
                               min_ctr: float = 0.0,
                               min_conversion_rate: float = 0.0, 
                               min_similarity: float = 0.0) -> List[Dict[str, Any]]:
-        """유사한 문구 검색 (채널/팀 필터링 + 키워드/타겟 유사도 계산)"""
-        # 채널과 팀으로 필터링 (둘 다 동시에 적용 가능)
-        where_conditions = None
-        conditions = []
-        
-        if team_id:
-            conditions.append({'team_id': int(team_id)})
-        
-        if channel:
-            conditions.append({'channel': channel})
-        
-        # 성과 기준 추가 필터링 (팀/채널 필터가 없을 때만)
-        if not conditions:
-            if min_ctr > 0:
-                conditions.append({'ctr': {"$gte": min_ctr}})
-            elif min_conversion_rate > 0:
-                conditions.append({'conversion_rate': {"$gte": min_conversion_rate}})
-        
-        # 조건이 있으면 $and로 결합
-        if conditions:
-            if len(conditions) == 1:
-                where_conditions = conditions[0]
-            else:
-                where_conditions = {"$and": conditions}
-        
-        # 벡터 검색 실행
-        results = self.collection.query(
-            query_texts=[query],
+        """유사한 문구 검색 (채널/팀/성과 필터링 + 키워드/타겟 유사도 계산, 후보 n_results개 1회 조회)"""
+        return self.retrieve(
+            query,
             n_results=n_results,
-            where=where_conditions if where_conditions else None
-        )
+            team_id=team_id,
+            channel=channel,
+            min_ctr=min_ctr,
+            min_conversion_rate=min_conversion_rate,
+            min_similarity=min_similarity,
+            max_candidates=n_results,
+            unique=False,
+            hybrid=False
+        )['results']
+    
+    def sync_from_database(self, full: bool = False) -> Dict[str, Any]:
+        """
+        DB 문구를 벡터 저장소에 동기화 → 동기화 결과 통계 반환
         
-        # 결과 포맷팅 및 유사도 필터링
-        similar_phrases = []
-        if (results['documents'] and 
-            len(results['documents']) > 0 and 
-            results['documents'][0] and 
-            len(results['documents'][0]) > 0):
-            
-            for i, doc in enumerate(results['documents'][0]):
-                # 안전한 인덱스 접근
-                if (i < len(results['metadatas'][0]) and 
-                    i < len(results['distances'][0])):
-                    metadata = results['metadatas'][0][i]
-                    distance = results['distances'][0][i]
-                    similarity_score = 1 - distance
-                
-                    # 유사도 임계값 확인
-                    if similarity_score < min_similarity:
-                        continue
-                    
-                    similar_phrases.append({
-                        'text': doc,
-                        'title': metadata.get('title', ''),
-                        'message': metadata.get('message', ''),
-                        'team_id': metadata.get('team_id', ''),
-                        'channel': metadata.get('channel', ''),
-                        'keywords': metadata.get('keywords', ''),
-                        'target_audience': metadata.get('target_audience', ''),
-                        'tone': metadata.get('tone', ''),
-                        'ctr': metadata.get('ctr', 0),
-                        'conversion_rate': metadata.get('conversion_rate', 0),
-                        'impression_count': metadata.get('impression_count', 0),
-                        'click_count': metadata.get('click_count', 0),
-                        'conversion_count': metadata.get('conversion_count', 0),
-                        'similarity_score': similarity_score
-                    })
-        
-        return similar_phrases
-    
-    def sync_from_database(self) -> None:
-        """DB의 모든 문구를 벡터 저장소에 동기화"""
-        print("🔄 DB에서 벡터 저장소로 문구 동기화 중...")
-        
-        # 기존 컬렉션 삭제 후 재생성
+        - 기본(증분): 신규/변경 행만 반영하고 DB에서 삭제된 행은 컬렉션에서도 제거
+        - full=True: 컬렉션을 삭제하고 전체 재구축
+        
+        행은 VECTOR_SYNC_BATCH_SIZE개씩 스트리밍으로 읽어 청크마다 임베딩 → upsert → 동기화 상태를 기록하므로,
+        중간에 실패해도 다시 동기화하면 마지막으로 기록된 청크 다음부터 이어서 진행
+        """
+        self._check_writable()
+        with self._write_lock:
+            try:
+                if full:
+                    return self._sync_full()
+                return self._sync_incremental()
+            except Exception as e:
+                self._update_progress(running=False, last_error=str(e))
+                print(f"❌ 벡터 저장소 동기화 실패 (다음 동기화에서 이어서 진행): {e}")
+                raise
+            finally:
+                # 완료된 청크까지 저장 (동기화 상태와 일치하도록)
+                self.backend.flush()
+    
+    def _check_writable(self) -> None:
+        if self.backend.read_only:
+            raise RuntimeError(f"{self.backend.name} 백엔드는 읽기 전용입니다. 배치 작업에서 스냅샷을 다시 만들어 배포하세요.")
+    
+    def export_snapshot(self, path: str = None) -> Dict[str, Any]:
+        """
+        DB 문구 전체를 벡터 색인 스냅샷으로 내보내기 → manifest 반환
+        
+        백엔드와 관계없이 DB에서 직접 읽고, 임베딩은 영구 캐시를 거쳐 계산 (바뀌지 않은 문구는 재계산하지 않음)
+        """
+        path = path or Config.VECTOR_SNAPSHOT_PATH
+        started = time.perf_counter()
+        print(f"📦 벡터 색인 스냅샷 내보내는 중... ({path})")
+        
+        ids, vectors, documents, metadatas = [], [], [], []
+        high_water_mark = 0
+        conn = self._open_sync_db()
         try:
-            self.client.delete_collection("marketing_phrases")
-        except:
-            pass
+            cursor = conn.execute(f"""
+                SELECT {SYNC_COLUMNS}
+                FROM marketing_copies m
+                WHERE m.content_data IS NOT NULL
+                ORDER BY m.copy_id
+            """)
+            
+            def batches():
+                for rows in self._fetch_batches(cursor):
+                    phrases = [self._row_to_phrase(row) for row in rows]
+                    phrases = [phrase for phrase in phrases if self._phrase_text(phrase)]
+                    yield phrases, [self._phrase_text(phrase) for phrase in phrases]
+            
+            for phrases, embeddings in self._embed_pipeline(batches()):
+                for phrase, embedding in zip(phrases, embeddings):
+                    ids.append(f"phrase_{phrase['copy_id']}")
+                    vectors.append(embedding)
+                    documents.append(self._phrase_text(phrase))
+                    metadatas.append(self._phrase_metadata(phrase))
+                    high_water_mark = max(high_water_mark, phrase['copy_id'])
+        finally:
+            conn.close()
         
-        self.collection = self.client.create_collection(
-            name="marketing_phrases",
-            metadata={"hnsw:space": "cosine"}
+        manifest = write_snapshot(
+            path, ids, vectors, documents, metadatas,
+            model_id=self.model_id,
+            source={'high_water_mark': high_water_mark},
+            quantization=Config.VECTOR_QUANTIZATION
         )
-        
-        # DB에서 모든 문구 조회
+        print(f"✅ 스냅샷 저장 완료: {manifest['count']}개, 버전 {manifest['version']} ({time.perf_counter() - started:.1f}s)")
+        return manifest
+    
+    @staticmethod
+    def _open_sync_db():
         conn = get_phrases_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                copy_id,
-                team_id,
-                channel,
-                content_data,
-                keywords,
-                target_audience,
-                tone,
-                send_date,
-                ctr,
-                conversion_rate,
-                impression_count,
-                click_count,
-                conversion_count
-            FROM marketing_copies
-            WHERE content_data IS NOT NULL
-        """)
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        # 문구 데이터 변환
-        phrases = []
-        for row in results:
-            content_data = json.loads(row['content_data']) if row['content_data'] else {}
-            
-            # 채널별로 title/message 추출 방식 다르게 처리
-            if row['channel'] == 'RCS':
-                # RCS의 경우 button과 message 사용
-                title = content_data.get('button', '')
-                message = content_data.get('message', '')
+        try:
+            conn.create_function('row_hash', -1, _hash, deterministic=True)
+            conn.execute(SYNC_STATE_SCHEMA)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+    
+    @staticmethod
+    def _row_to_phrase(row) -> Dict[str, Any]:
+        """marketing_copies 행 → 벡터 저장소 문구 데이터"""
+        content_data = json.loads(row['content_data']) if row['content_data'] else {}
+        
+        # 채널별로 title/message 추출 방식 다르게 처리
+        if row['channel'] == 'RCS':
+            # RCS의 경우 button과 message 사용
+            title = content_data.get('button', '')
+            message = content_data.get('message', '')
+        else:
+            # APP_PUSH의 경우 title과 message 사용
+            title = content_data.get('title', '')
+            message = content_data.get('message', '')
+        
+        return {
+            'copy_id': row['copy_id'],
+            'team_id': row['team_id'],
+            'channel': row['channel'],
+            'title': title,
+            'message': message,
+            'keywords': row['keywords'],
+            'target_audience': row['target_audience'],
+            'tone': row['tone'],
+            'send_date': row['send_date'],
+            'ctr': row['ctr'],
+            'conversion_rate': row['conversion_rate'],
+            'impression_count': row['impression_count'],
+            'click_count': row['click_count'],
+            'conversion_count': row['conversion_count']
+        }
+    
+    def _plan_chunk(self, rows) -> Dict[str, Any]:
+        """
+        행 묶음을 반영 방식별로 분류
+        
+        synced_doc_hash가 없으면 신규, 텍스트 해시가 다르면 재임베딩, 같으면 메타데이터만 갱신
+        """
+        plan = {'upserts': [], 'texts': [], 'metadata_ids': [], 'metadatas': [],
+                'removed': [], 'indexed': [], 'states': [], 'added': 0, 'rows': len(rows)}
+        for row in rows:
+            phrase = self._row_to_phrase(row)
+            text = self._phrase_text(phrase)
+            doc_hash = _hash(text) if text else ''
+            synced_doc_hash = row['synced_doc_hash']
+            
+            if not doc_hash:
+                if synced_doc_hash:
+                    plan['removed'].append(row['copy_id'])
+            elif doc_hash == synced_doc_hash:
+                plan['metadata_ids'].append(f"phrase_{row['copy_id']}")
+                plan['metadatas'].append(self._index_metadata(phrase))
+                plan['indexed'].append(phrase)
             else:
-                # APP_PUSH의 경우 title과 message 사용
-                title = content_data.get('title', '')
-                message = content_data.get('message', '')
+                if synced_doc_hash is None:
+                    plan['added'] += 1
+                plan['upserts'].append(phrase)
+                plan['texts'].append(text)
+                plan['indexed'].append(phrase)
+            plan['states'].append((row['copy_id'], doc_hash, row['row_hash']))
+        return plan
+    
+    def _ingest(self, conn, row_batches: Iterable[list], totals: Dict[str, int]) -> None:
+        """
+        행 묶음 스트림 반영: 워커 풀 임베딩 → 청크 단위 컬렉션 반영 → 동기화 상태 커밋 (체크포인트)
+        """
+        batches = ((plan, plan['texts']) for plan in map(self._plan_chunk, row_batches))
+        for plan, embeddings in self._embed_pipeline(batches):
+            self._upsert_chunk(plan['upserts'], plan['texts'], embeddings)
+            if plan['metadata_ids']:
+                self.backend.update_metadata(plan['metadata_ids'], plan['metadatas'])
+            if plan['removed']:
+                self.backend.delete([f"phrase_{copy_id}" for copy_id in plan['removed']])
             
-            phrases.append({
-                'copy_id': row['copy_id'],
-                'team_id': row['team_id'],
-                'channel': row['channel'],
-                'title': title,
-                'message': message,
-                'keywords': row['keywords'],
-                'target_audience': row['target_audience'],
-                'tone': row['tone'],
-                'send_date': row['send_date'],
-                'ctr': row['ctr'],
-                'conversion_rate': row['conversion_rate'],
-                'impression_count': row['impression_count'],
-                'click_count': row['click_count'],
-                'conversion_count': row['conversion_count']
-            })
+            # 컬렉션 반영 후 상태 기록 (중간에 실패하면 이 청크부터 다시 처리)
+            conn.executemany("INSERT OR REPLACE INTO vector_sync_state (copy_id, doc_hash, row_hash) VALUES (?, ?, ?)", plan['states'])
+            conn.commit()
+            self._apply_lexical(plan['indexed'], plan['removed'])
+            
+            totals['added'] += plan['added']
+            totals['updated'] += len(plan['upserts']) - plan['added']
+            totals['metadata_updated'] += len(plan['metadata_ids'])
+            totals['deleted'] += len(plan['removed'])
+            self._advance_progress(plan['rows'], plan['states'][-1][0] if plan['states'] else None)
+    
+    def _apply_lexical(self, phrases: List[Dict[str, Any]], removed_ids: List[Any]) -> None:
+        """
+        반영된 청크를 어휘 색인에도 반영
+        
+        아직 적재 전이면 건너뜀 (첫 검색 때 커밋된 동기화 상태 기준으로 적재하므로 누락 없음)
+        """
+        if self.lexical_index is None:
+            return
+        with self._lexical_lock:
+            if not self._lexical_loaded:
+                return
+            for phrase in phrases:
+                self.lexical_index.upsert(phrase.get('copy_id'), self._lexical_text(phrase), self._phrase_metadata(phrase))
+            for copy_id in removed_ids:
+                self.lexical_index.remove(copy_id)
+    
+    def _ensure_lexical(self) -> LexicalIndex:
+        """어휘 색인 지연 적재 (벡터 저장소에 색인된 문구만)"""
+        with self._lexical_lock:
+            if not self._lexical_loaded and self.backend.read_only:
+                # 읽기 전용 스냅샷: 스냅샷 메타데이터(제목/내용/키워드/타겟)로 적재
+                for metadata in self.backend.metadatas:
+                    self.lexical_index.upsert(metadata.get('copy_id'), self._lexical_text(metadata), metadata)
+                self._lexical_loaded = True
+            if not self._lexical_loaded:
+                started = time.perf_counter()
+                conn = self._open_sync_db()
+                try:
+                    cursor = conn.execute(f"""
+                        SELECT {SYNC_COLUMNS}
+                        FROM marketing_copies m
+                        JOIN vector_sync_state s ON s.copy_id = m.copy_id
+                        WHERE s.doc_hash != ''
+                    """)
+                    for rows in self._fetch_batches(cursor):
+                        for row in rows:
+                            phrase = self._row_to_phrase(row)
+                            self.lexical_index.upsert(phrase['copy_id'], self._lexical_text(phrase), self._phrase_metadata(phrase))
+                finally:
+                    conn.close()
+                self._lexical_loaded = True
+                print(f"📚 어휘 색인 적재: {len(self.lexical_index)}개 문구 ({time.perf_counter() - started:.2f}s)")
+        return self.lexical_index
+    
+    def _fetch_phrases(self, copy_ids: List[Any]) -> Dict[Any, Dict[str, Any]]:
+        """copy_id 목록의 현재 문구/성과 지표를 DB에서 한 번에 조회 → {copy_id: 문구} (삭제된 문구는 제외)"""
+        copy_ids = list(dict.fromkeys(copy_id for copy_id in copy_ids if copy_id is not None and copy_id != ''))
+        if not copy_ids:
+            return {}
+        phrases = {}
+        conn = get_phrases_db()
+        try:
+            # SQLite 바인딩 변수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(copy_ids), 500):
+                chunk = copy_ids[start:start + 500]
+                rows = conn.execute(f"""
+                    SELECT {PHRASE_COLUMNS}
+                    FROM marketing_copies m
+                    WHERE m.copy_id IN ({','.join('?' * len(chunk))})
+                """, chunk).fetchall()
+                for row in rows:
+                    phrases[row['copy_id']] = self._row_to_phrase(row)
+        finally:
+            conn.close()
+        return phrases
+    
+    def _hydrate_results(self, phrases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        슬림 메타데이터 검색 결과에 제목/내용/현재 성과 지표 채우기 (DB 조회 1회, 검색 순서/유사도 유지)
+        
+        동기화 이후 DB에서 삭제된 문구는 결과에서 제외
+        """
+        current = self._fetch_phrases([phrase['copy_id'] for phrase in phrases])
+        hydrated = []
+        for phrase in phrases:
+            source = current.get(phrase['copy_id'])
+            if source is None:
+                continue
+            metadata = self._phrase_metadata(source)
+            hydrated.append(dict(phrase, **{key: metadata[key] for key in HYDRATED_FIELDS}))
+        return hydrated
+    
+    def _hydrate_phrases(self, copy_ids: List[Any], embedding: List[float]) -> Dict[Any, Dict[str, Any]]:
+        """
+        어휘 검색에만 걸린 문구를 DB에서 조회 → {copy_id: 문구}
+        
+        유사도는 저장된 문구 벡터(임베딩 캐시 → 백엔드 색인)와 쿼리 벡터의 코사인 값, 색인에 없는 문구는 0
+        """
+        phrases = list(self._fetch_phrases(copy_ids).values())
+        if not phrases:
+            return {}
+        texts = [self._phrase_text(phrase) for phrase in phrases]
+        vectors = self._stored_vectors([phrase['copy_id'] for phrase in phrases], texts)
+        stored = [i for i, vector in enumerate(vectors) if vector is not None]
+        similarities = np.zeros(len(phrases), dtype=np.float32)
+        if stored:
+            similarities[stored] = self._cosine(embedding, [vectors[i] for i in stored])
+        
+        hydrated = {}
+        for phrase, text, similarity in zip(phrases, texts, similarities):
+            metadata = self._phrase_metadata(phrase)
+            hydrated[phrase['copy_id']] = self._format_results([{
+                'document': text,
+                'metadata': metadata,
+                'similarity': float(similarity)
+            }])[0]
+        return hydrated
+    
+    def _fuse_lexical(self, query: str, embedding: List[float], vector_matches: List[Dict[str, Any]],
+                      n_results: int, team_id: str, channel: str,
+                      min_ctr: float, min_conversion_rate: float, min_similarity: float,
+                      unique: bool) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        벡터 결과와 어휘(BM25) 결과를 RRF(reciprocal rank fusion)로 결합 → (결과, 어휘 검색으로만 추가된 문구 수)
+        
+        어휘 결과는 쿼리 용어 일치 비율이 LEXICAL_MIN_COVERAGE 이상인 문구만 사용하고,
+        어휘 검색으로만 찾은 문구도 벡터 결과와 같은 유사도 기준(min_similarity)을 넘어야 포함
+        """
+        lexical_hits = [
+            (copy_id, score) for copy_id, score, coverage in self._ensure_lexical().search(
+                query,
+                n_results=Config.LEXICAL_CANDIDATES,
+                team_id=team_id,
+                channel=channel,
+                min_ctr=min_ctr,
+                min_conversion_rate=min_conversion_rate
+            )
+            if coverage >= Config.LEXICAL_MIN_COVERAGE
+        ]
+        if not lexical_hits:
+            return vector_matches[:n_results], 0
         
-        # 벡터 저장소에 추가
-        self.add_phrases(phrases)
-        print(f"✅ 총 {len(phrases)}개 문구 동기화 완료!")
+        rrf_k = Config.RRF_K
+        fused: Dict[Any, float] = {}
+        phrases = {}
+        vector_ids = {phrase['copy_id'] for phrase in vector_matches}
+        for rank, phrase in enumerate(vector_matches):
+            phrases[phrase['copy_id']] = phrase
+            fused[phrase['copy_id']] = 1.0 / (rrf_k + rank + 1)
+        for rank, (copy_id, _) in enumerate(lexical_hits):
+            fused[copy_id] = fused.get(copy_id, 0.0) + 1.0 / (rrf_k + rank + 1)
+        
+        lexical_only_phrases = self._hydrate_phrases([copy_id for copy_id, _ in lexical_hits if copy_id not in phrases], embedding)
+        phrases.update({
+            copy_id: phrase for copy_id, phrase in lexical_only_phrases.items()
+            if phrase['similarity_score'] >= min_similarity
+        })
+        lexical_scores = dict(lexical_hits)
+        
+        results = []
+        seen_combinations = set()
+        lexical_only = 0
+        for copy_id in sorted(fused, key=fused.get, reverse=True):
+            phrase = phrases.get(copy_id)
+            if phrase is None:
+                continue  # 동기화 이후 DB에서 삭제되었거나 유사도 기준 미달인 문구
+            if unique:
+                combination = f"{phrase['title']}|{phrase['message']}"
+                if combination in seen_combinations:
+                    continue
+                seen_combinations.add(combination)
+            phrase = dict(phrase, rrf_score=fused[copy_id], lexical_score=lexical_scores.get(copy_id, 0.0))
+            results.append(phrase)
+            if copy_id not in vector_ids:
+                lexical_only += 1
+            if len(results) >= n_results:
+                break
+        return results, lexical_only
+    
+    def _fetch_batches(self, cursor) -> Iterator[list]:
+        """커서에서 VECTOR_SYNC_BATCH_SIZE개씩 읽기 (전체를 메모리에 올리지 않음)"""
+        while True:
+            rows = cursor.fetchmany(Config.VECTOR_SYNC_BATCH_SIZE)
+            if not rows:
+                return
+            yield rows
+    
+    def _start_progress(self, mode: str, total: int) -> None:
+        with self._progress_lock:
+            self.sync_progress = {
+                'running': True,
+                'mode': mode,
+                'total': total,
+                'processed': 0,
+                'chunks': 0,
+                'last_copy_id': None,
+                'started_at': time.time(),
+                'elapsed_seconds': 0.0,
+                'rows_per_second': 0.0,
+                'last_error': None
+            }
+    
+    def _advance_progress(self, rows: int, last_copy_id) -> None:
+        with self._progress_lock:
+            progress = self.sync_progress
+            progress['processed'] += rows
+            progress['chunks'] += 1
+            if last_copy_id is not None:
+                progress['last_copy_id'] = last_copy_id
+            elapsed = time.time() - progress['started_at']
+            progress['elapsed_seconds'] = round(elapsed, 1)
+            progress['rows_per_second'] = round(progress['processed'] / elapsed, 1) if elapsed > 0 else 0.0
+            total = progress['total']
+            percent = f" ({progress['processed'] / total:.1%})" if total else ""
+            print(f"📦 벡터 동기화 청크 {progress['chunks']}: {progress['processed']}/{total}{percent}, "
+                  f"{progress['rows_per_second']} rows/s")
+    
+    def _update_progress(self, **fields) -> None:
+        with self._progress_lock:
+            self.sync_progress.update(fields)
+    
+    def get_sync_progress(self) -> Dict[str, Any]:
+        """진행 중(또는 마지막) 동기화 진행 상황"""
+        with self._progress_lock:
+            return dict(self.sync_progress)
+    
+    def _sync_full(self) -> Dict[str, Any]:
+        print("🔄 DB에서 벡터 저장소로 문구 전체 재구축 중...")
+        started = time.perf_counter()
+        
+        # 기존 색인 삭제 후 재생성
+        self.backend.reset()
+        if self.lexical_index is not None:
+            with self._lexical_lock:
+                self.lexical_index.clear()
+                self._lexical_loaded = True
+        
+        conn = self._open_sync_db()
+        try:
+            conn.execute("DELETE FROM vector_sync_state")
+            conn.commit()
+            
+            total = conn.execute("SELECT COUNT(*) FROM marketing_copies WHERE content_data IS NOT NULL").fetchone()[0]
+            self._start_progress('full', total)
+            
+            # DB에서 모든 문구를 copy_id 순서로 스트리밍 조회
+            cursor = conn.execute(f"""
+                SELECT {SYNC_COLUMNS}, NULL AS synced_doc_hash
+                FROM marketing_copies m
+                WHERE m.content_data IS NOT NULL
+                ORDER BY m.copy_id
+            """)
+            totals = {'added': 0, 'updated': 0, 'metadata_updated': 0, 'deleted': 0}
+            self._ingest(conn, self._fetch_batches(cursor), totals)
+        finally:
+            conn.close()
+        
+        elapsed = time.perf_counter() - started
+        self._update_progress(running=False)
+        print(f"✅ 총 {totals['added']}개 문구 동기화 완료! ({elapsed:.1f}s)")
+        return dict(totals, mode='full', elapsed_seconds=round(elapsed, 3))
+    
+    def _sync_incremental(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        conn = self._open_sync_db()
+        try:
+            # 동기화 상태와 컬렉션이 어긋나면 (이전 방식으로 구축된 컬렉션, 컬렉션 삭제 등) 전체 재구축
+            indexed = conn.execute("SELECT COUNT(*) FROM vector_sync_state WHERE doc_hash != ''").fetchone()[0]
+            collection_count = self.backend.count()
+            if indexed != collection_count:
+                print(f"⚠️ 동기화 상태({indexed}개)와 컬렉션({collection_count}개)이 달라 전체 재구축합니다.")
+                return self._sync_full()
+            
+            print("🔄 DB에서 벡터 저장소로 문구 증분 동기화 중...")
+            high_water_mark = conn.execute("SELECT COALESCE(MAX(copy_id), 0) FROM vector_sync_state").fetchone()[0]
+            
+            # 변경 행: 기존 범위에서 행 해시가 달라졌거나 상태가 없는 행 (상태 테이블을 갱신하므로 ID만 먼저 수집)
+            changed_ids = [row[0] for row in conn.execute("""
+                SELECT m.copy_id
+                FROM marketing_copies m
+                LEFT JOIN vector_sync_state s ON s.copy_id = m.copy_id
+                WHERE m.content_data IS NOT NULL
+                  AND m.copy_id <= ?
+                  AND (s.copy_id IS NULL OR s.row_hash != row_hash(
+                      m.team_id, m.channel, m.content_data, m.keywords, m.target_audience, m.tone,
+                      m.send_date, m.ctr, m.conversion_rate, m.impression_count, m.click_count,
+                      m.conversion_count))
+            """, (high_water_mark,))]
+            
+            # 삭제 행: 상태에는 있지만 DB에서 사라진 행
+            deleted_ids = [row[0] for row in conn.execute("""
+                SELECT s.copy_id
+                FROM vector_sync_state s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM marketing_copies m
+                    WHERE m.copy_id = s.copy_id AND m.content_data IS NOT NULL
+                )
+            """)]
+            
+            new_count = conn.execute(
+                "SELECT COUNT(*) FROM marketing_copies WHERE content_data IS NOT NULL AND copy_id > ?",
+                (high_water_mark,)
+            ).fetchone()[0]
+            self._start_progress('incremental', new_count + len(changed_ids))
+            totals = {'added': 0, 'updated': 0, 'metadata_updated': 0, 'deleted': 0}
+            
+            # 1. 변경 행: 수집한 ID를 청크 단위로 조회
+            def changed_batches():
+                batch_size = Config.VECTOR_SYNC_BATCH_SIZE
+                for start in range(0, len(changed_ids), batch_size):
+                    ids = changed_ids[start:start + batch_size]
+                    yield conn.execute(f"""
+                        SELECT {SYNC_COLUMNS}, s.doc_hash AS synced_doc_hash
+                        FROM marketing_copies m
+                        LEFT JOIN vector_sync_state s ON s.copy_id = m.copy_id
+                        WHERE m.copy_id IN ({','.join('?' * len(ids))})
+                    """, ids).fetchall()
+            self._ingest(conn, changed_batches(), totals)
+            
+            # 2. 신규 행: high-water mark 이후 (PK 범위 스트리밍 조회, 비교 불필요)
+            cursor = conn.execute(f"""
+                SELECT {SYNC_COLUMNS}, NULL AS synced_doc_hash
+                FROM marketing_copies m
+                WHERE m.content_data IS NOT NULL AND m.copy_id > ?
+                ORDER BY m.copy_id
+            """, (high_water_mark,))
+            self._ingest(conn, self._fetch_batches(cursor), totals)
+            
+            # 3. 삭제 행 제거
+            batch_size = Config.VECTOR_SYNC_BATCH_SIZE
+            for start in range(0, len(deleted_ids), batch_size):
+                ids = deleted_ids[start:start + batch_size]
+                self.backend.delete([f"phrase_{copy_id}" for copy_id in ids])
+                conn.executemany("DELETE FROM vector_sync_state WHERE copy_id = ?", [(copy_id,) for copy_id in ids])
+                conn.commit()
+                self._apply_lexical([], ids)
+                totals['deleted'] += len(ids)
+        finally:
+            conn.close()
+        
+        elapsed = time.perf_counter() - started
+        self._update_progress(running=False)
+        stats = dict(totals, mode='incremental', high_water_mark=high_water_mark, elapsed_seconds=round(elapsed, 3))
+        print(f"✅ 증분 동기화 완료: 신규 {stats['added']}개, 재임베딩 {stats['updated']}개, "
+              f"지표 갱신 {stats['metadata_updated']}개, 삭제 {stats['deleted']}개 ({elapsed:.1f}s)")
+        return stats
+    
+    def warm_up(self) -> None:
+        """첫 요청 전에 임베딩 모델 / 어휘 색인을 미리 로드 (백그라운드 워밍업용)"""
+        self.embedding_function(['warm-up'])
+        if self.lexical_index is not None:
+            self._ensure_lexical()
+    
+    def close(self) -> None:
+        """임베딩 워커 풀 / 임베딩 캐시 종료 + 색인 저장"""
+        self._embed_executor.shutdown(wait=False)
+        self.backend.close()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        """벡터 저장소 전체 통계 (컬렉션/동기화/백엔드/임베딩 엔진/캐시/어휘 색인)"""
+        return {
+            'stats': self.get_collection_stats(),
+            'sync_progress': self.get_sync_progress(),
+            'backend': self.backend.stats(),
+            'embedding': self.embedding_function.stats(),
+            'embedding_cache': self.embedding_cache.stats() if self.embedding_cache else None,
+            'query_embedding_cache': self.query_embedding_cache.stats(),
+            'lexical_index': self.lexical_index.stats() if self.lexical_index else None
+        }
     
     def get_collection_stats(self) -> Dict[str, Any]:
         """컬렉션 통계 정보 반환"""
         try:
-            count = self.collection.count()
+            count = self.backend.count()
             return {
                 'total_phrases': count,
-                'status': 'active'
+                'status': 'active',
+                'backend': self.backend.name
             }
         except:
             return {
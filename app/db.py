@@ -1,36 +1,149 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from config import Config
 import os
 
-def get_trends_db():
-    """트렌드 DB 연결"""
-    conn = sqlite3.connect(Config.DB_TRENDS_PATH)
+
+class Connection(sqlite3.Connection):
+    """PRAGMA를 설정한 SQLite 연결 (transactions: transaction()으로 연 트랜잭션 중첩 수)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transactions = 0
+
+
+class PooledConnection(Connection):
+    """
+    스레드별로 재사용하는 SQLite 연결
+
+    close()는 연결을 닫지 않고 풀에 반환 (중첩 사용 시 가장 바깥 close()에서만 반환)
+    반환할 때 커밋하지 않은 변경은 롤백 (매번 새 연결을 열던 때와 같은 동작)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.depth = 0
+
+    def close(self):
+        self.depth = max(0, self.depth - 1)
+        if self.depth == 0 and self.in_transaction:
+            self.rollback()
+
+    def dispose(self):
+        """실제로 연결 닫기"""
+        super().close()
+
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {'opened': 0, 'reused': 0}
+
+def _connect(path: str, factory=Connection):
+    """연결 생성 + PRAGMA 설정 (WAL, 동기화 수준, 페이지 캐시, 메모리 맵, 잠금 대기 시간)"""
+    conn = sqlite3.connect(
+        path,
+        timeout=Config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=Config.SQLITE_STATEMENT_CACHE,
+        factory=factory
+    )
     conn.row_factory = sqlite3.Row  # dict처럼 접근 가능
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={Config.SQLITE_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size={-Config.SQLITE_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size={Config.SQLITE_MMAP_SIZE}")
+    conn.execute(f"PRAGMA busy_timeout={Config.SQLITE_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
-def get_phrases_db():
-    """마케팅 문구 DB 연결"""
-    conn = sqlite3.connect(Config.DB_PHRASES_PATH)
-    conn.row_factory = sqlite3.Row
+def _pooled(path: str):
+    """현재 스레드의 path 연결 (없으면 생성, 스레드가 끝나면 함께 정리됨)"""
+    if not Config.SQLITE_POOL_ENABLED:
+        return _connect(path)
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(path)
+    if conn is None:
+        conn = connections[path] = _connect(path, factory=PooledConnection)
+        with _stats_lock:
+            _stats['opened'] += 1
+    else:
+        with _stats_lock:
+            _stats['reused'] += 1
+    conn.depth += 1
     return conn
 
+def get_trends_db():
+    """트렌드 DB 연결 (스레드별 재사용, 사용 후 close()로 반환)"""
+    return _pooled(Config.DB_TRENDS_PATH)
+
+def get_phrases_db():
+    """마케팅 문구 DB 연결 (스레드별 재사용, 사용 후 close()로 반환)"""
+    return _pooled(Config.DB_PHRASES_PATH)
+
+@contextmanager
+def connection(connect=get_phrases_db):
+    """읽기/단순 작업용 연결 (블록을 벗어나면 예외가 나도 close()로 반환)"""
+    conn = connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+@contextmanager
+def transaction(connect=get_phrases_db):
+    """
+    쓰기 트랜잭션 (BEGIN IMMEDIATE → 정상 종료 시 커밋, 예외 시 롤백 후 다시 발생)
+
+    같은 스레드에서 transaction() 안에서 다시 호출하면 바깥 트랜잭션에 합류 (커밋/롤백은 가장 바깥에서)
+    가장 바깥 트랜잭션 시작 시 transaction() 밖에서 커밋하지 않고 남은 변경은 롤백 후 시작
+    """
+    conn = connect()
+    outermost = conn.transactions == 0
+    try:
+        if outermost:
+            if conn.in_transaction:
+                print("⚠️ 커밋되지 않은 이전 변경을 롤백하고 트랜잭션을 시작합니다")
+                conn.rollback()
+            conn.execute("BEGIN IMMEDIATE")
+        conn.transactions += 1
+        try:
+            yield conn
+        finally:
+            conn.transactions -= 1
+        if outermost:
+            conn.commit()
+    except BaseException:
+        if outermost and conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def close_connections():
+    """현재 스레드의 풀 연결 닫기 (스크립트 종료/테스트용)"""
+    for conn in getattr(_local, 'connections', {}).values():
+        conn.dispose()
+    _local.connections = {}
+
+def connection_stats():
+    with _stats_lock:
+        return dict(_stats, pool_enabled=Config.SQLITE_POOL_ENABLED)
+
 def init_databases():
     """데이터베이스 초기화 (테이블 생성)"""
     # data 디렉토리 생성
     os.makedirs('data', exist_ok=True)
     
     # trends.db 초기화
-    conn_trends = get_trends_db()
-    with open('schema/trends.sql', 'r', encoding='utf-8') as f:
+    with connection(get_trends_db) as conn_trends, open('schema/trends.sql', 'r', encoding='utf-8') as f:
         conn_trends.executescript(f.read())
-    conn_trends.commit()
-    conn_trends.close()
+        conn_trends.commit()
     
     # marketing_phrases.db 초기화
-    conn_phrases = get_phrases_db()
-    with open('schema/phrases.sql', 'r', encoding='utf-8') as f:
+    with connection() as conn_phrases, open('schema/phrases.sql', 'r', encoding='utf-8') as f:
         conn_phrases.executescript(f.read())
-    conn_phrases.commit()
-    conn_phrases.close()
+        conn_phrases.commit()
     
     print("✅ 데이터베이스 초기화 완료")
\ No newline at end of file
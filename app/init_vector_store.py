@@ -3,13 +3,33 @@
 벡터 저장소 초기화 스크립트
 """
 
+import argparse
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from config import Config
 from core.vector_store import VectorStore
 
 def main():
+    arg_parser = argparse.ArgumentParser(description='벡터 저장소 초기화')
+    arg_parser.add_argument('--full', action='store_true', help='컬렉션을 삭제하고 전체 재구축 (기본: 증분 동기화)')
+    arg_parser.add_argument('--export-snapshot', nargs='?', const=Config.VECTOR_SNAPSHOT_PATH, metavar='DIR',
+                            help='DB 문구로 읽기 전용 벡터 색인 스냅샷 생성 (기본 경로: VECTOR_SNAPSHOT_PATH)')
+    args = arg_parser.parse_args()
+    
+    if args.export_snapshot:
+        # 배치 작업용: 스냅샷만 만들고 종료 (각 노드는 VECTOR_BACKEND=snapshot으로 열기)
+        try:
+            vector_store = VectorStore()
+            manifest = vector_store.export_snapshot(args.export_snapshot)
+            print(f"📊 문구 수: {manifest['count']}, 차원: {manifest['dim']}, 파티션: {len(manifest['partitions'])}개")
+            vector_store.close()
+        except Exception as e:
+            print(f"❌ 오류 발생: {e}")
+            return 1
+        return 0
+    
     print("🔄 벡터 저장소 초기화 시작...")
     
     try:
@@ -17,7 +37,7 @@ def main():
         vector_store = VectorStore()
         
         # DB에서 벡터 저장소로 동기화
-        vector_store.sync_from_database()
+        vector_store.sync_from_database(full=args.full)
         
         # 통계 정보 출력
         stats = vector_store.get_collection_stats()
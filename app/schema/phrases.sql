@@ -30,4 +30,8 @@ CREATE INDEX IF NOT EXISTS idx_marketing_copies_team_id ON marketing_copies(team
 CREATE INDEX IF NOT EXISTS idx_marketing_copies_channel ON marketing_copies(channel);
 CREATE INDEX IF NOT EXISTS idx_marketing_copies_ctr ON marketing_copies(ctr);
 CREATE INDEX IF NOT EXISTS idx_marketing_copies_conversion_rate ON marketing_copies(conversion_rate);
-CREATE INDEX IF NOT EXISTS idx_marketing_copies_send_date ON marketing_copies(send_date);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_marketing_copies_send_date ON marketing_copies(send_date);
+
+-- 팀별 아카이브 조회 정렬용 (기본: 전환율순, CTR순) - 정렬 없이 인덱스 순서대로 LIMIT
+CREATE INDEX IF NOT EXISTS idx_marketing_copies_team_conversion ON marketing_copies(team_id, conversion_rate DESC, ctr DESC);
+CREATE INDEX IF NOT EXISTS idx_marketing_copies_team_ctr ON marketing_copies(team_id, ctr DESC, conversion_rate DESC);
\ No newline at end of file
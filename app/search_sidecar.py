@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+검색 사이드카 실행 스크립트
+
+노드당 하나 실행해 벡터 색인과 임베딩 모델을 공유하고, 웹 워커는 SEARCH_SIDECAR_SOCKET으로 접속합니다.
+
+사용법:
+    python search_sidecar.py                          # SEARCH_SIDECAR_SOCKET 경로 사용
+    python search_sidecar.py --socket /run/copygen/search.sock --sync
+"""
+
+import argparse
+import signal
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from core.search_service import SearchService
+from core.vector_store import VectorStore
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='검색 사이드카 (Unix 소켓 벡터 검색 서버)')
+    arg_parser.add_argument('--socket', default=Config.SEARCH_SIDECAR_SOCKET or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'search.sock'),
+                            help='Unix 소켓 경로 (기본: SEARCH_SIDECAR_SOCKET)')
+    arg_parser.add_argument('--sync', action='store_true', help='시작 전에 DB에서 증분 동기화')
+    args = arg_parser.parse_args()
+    
+    vector_store = VectorStore()
+    if args.sync:
+        vector_store.sync_from_database()
+    
+    # 첫 요청 전에 임베딩 모델 / 어휘 색인 로드
+    try:
+        vector_store.warm_up()
+    except Exception as e:
+        print(f"⚠️ 워밍업 실패 (첫 요청 때 다시 로드): {e}")
+    
+    service = SearchService(
+        vector_store,
+        args.socket,
+        batch_window=Config.SEARCH_BATCH_WINDOW_MS / 1000,
+        batch_max=Config.SEARCH_BATCH_MAX
+    )
+    
+    # SIGTERM/SIGINT 시 정상 종료 (색인 저장 후 소켓 파일 삭제)
+    def stop(signum, frame):
+        threading.Thread(target=service.shutdown, daemon=True).start()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    try:
+        service.serve_forever()
+    finally:
+        vector_store.close()
+        print("👋 검색 사이드카 종료")
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -26,7 +26,7 @@ document.getElementById('generate-form')?.addEventListener('submit', async (e) =
     resultsDiv.innerHTML = '<div class="loading">🤖 AI가 문구를 생성하고 있습니다...</div>';
     
     try {
-        const response = await fetch('/api/generate', {
+        const response = await fetch('/api/generate/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -34,12 +34,39 @@ document.getElementById('generate-form')?.addEventListener('submit', async (e) =
             body: JSON.stringify(data)
         });
         
-        const result = await response.json();
+        if (!response.ok || !response.body) {
+            // 스트리밍 미지원 시 일반 생성 API 사용
+            await generateAtOnce(data, resultsDiv);
+            return;
+        }
         
-        if (result.success) {
-            displayResults(result.copies);
-        } else {
-            resultsDiv.innerHTML = `<div style="color: red;">오류: ${result.error}</div>`;
+        // SSE 스트림을 읽으면서 완성된 문구부터 바로 표시
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder('utf-8');
+        let buffer = '';
+        let received = 0;
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                const { event, payload } = parseSseEvent(rawEvent);
+                if (event === 'copy') {
+                    if (received === 0) resultsDiv.innerHTML = '';
+                    resultsDiv.appendChild(renderCopy(payload.copy, payload.index));
+                    received++;
+                } else if (event === 'error') {
+                    resultsDiv.innerHTML = `<div style="color: red;">오류: ${payload.error}</div>`;
+                } else if (event === 'done' && received === 0) {
+                    resultsDiv.innerHTML = '<div style="color: red;">생성된 문구가 없습니다.</div>';
+                }
+            }
         }
     } catch (error) {
         resultsDiv.innerHTML = `<div style="color: red;">오류: ${error.message}</div>`;
@@ -49,75 +76,110 @@ document.getElementById('generate-form')?.addEventListener('submit', async (e) =
     }
 });
 
+// 일반(비스트리밍) 문구 생성
+async function generateAtOnce(data, resultsDiv) {
+    const response = await fetch('/api/generate', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(data)
+    });
+    
+    const result = await response.json();
+    
+    if (result.success) {
+        displayResults(result.copies);
+    } else {
+        resultsDiv.innerHTML = `<div style="color: red;">오류: ${result.error}</div>`;
+    }
+}
+
+// SSE 이벤트 블록 파싱 ("event: ...\ndata: ...")
+function parseSseEvent(rawEvent) {
+    let event = 'message';
+    let data = '';
+    rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+    });
+    return { event, payload: data ? JSON.parse(data) : {} };
+}
+
 // 결과 표시 함수
 function displayResults(copies) {
     const resultsDiv = document.getElementById('results');
     resultsDiv.innerHTML = '';
     
     copies.forEach((copy, index) => {
-        const div = document.createElement('div');
-        div.className = 'copy-item';
+        resultsDiv.appendChild(renderCopy(copy, index));
+    });
+}
+
+// 문구 하나를 결과 항목으로 렌더링
+function renderCopy(copy, index) {
+    const div = document.createElement('div');
+    div.className = 'copy-item';
+    
+    // 앱푸시인 경우 타이틀과 본문을 구분하여 표시
+    if (copy.title && copy.message) {
+        div.innerHTML = `
+            <div class="copy-text">
+                <div class="copy-title"><strong>타이틀:</strong> ${copy.title}</div>
+                <div class="copy-message"><strong>본문:</strong> ${copy.message}</div>
+            </div>
+            <button class="btn-copy" onclick="copyToClipboard('타이틀: ${copy.title}\\n본문: ${copy.message}')">
+                📋 복사
+            </button>
+        `;
+    } else if (copy.message && copy.message.includes('타이틀:')) {
+        // "타이틀: ..." 형식의 문자열을 파싱
+        const messageText = copy.message;
+        const titleMatch = messageText.match(/타이틀:\s*(.+)/);
+        const bodyMatch = messageText.match(/본문:\s*(.+)/);
         
-        // 앱푸시인 경우 타이틀과 본문을 구분하여 표시
-        if (copy.title && copy.message) {
+        if (titleMatch) {
+            const title = titleMatch[1].trim();
+            const body = bodyMatch ? bodyMatch[1].trim() : '(광고) ' + title;
+            
             div.innerHTML = `
                 <div class="copy-text">
-                    <div class="copy-title"><strong>타이틀:</strong> ${copy.title}</div>
-                    <div class="copy-message"><strong>본문:</strong> ${copy.message}</div>
+                    <div class="copy-title"><strong>타이틀:</strong> ${title}</div>
+                    <div class="copy-message"><strong>본문:</strong> ${body}</div>
                 </div>
-                <button class="btn-copy" onclick="copyToClipboard('타이틀: ${copy.title}\\n본문: ${copy.message}')">
+                <button class="btn-copy" onclick="copyToClipboard('타이틀: ${title}\\n본문: ${body}')">
                     📋 복사
                 </button>
             `;
-        } else if (copy.message && copy.message.includes('타이틀:')) {
-            // "타이틀: ..." 형식의 문자열을 파싱
-            const messageText = copy.message;
-            const titleMatch = messageText.match(/타이틀:\s*(.+)/);
-            const bodyMatch = messageText.match(/본문:\s*(.+)/);
-            
-            if (titleMatch) {
-                const title = titleMatch[1].trim();
-                const body = bodyMatch ? bodyMatch[1].trim() : '(광고) ' + title;
-                
-                div.innerHTML = `
-                    <div class="copy-text">
-                        <div class="copy-title"><strong>타이틀:</strong> ${title}</div>
-                        <div class="copy-message"><strong>본문:</strong> ${body}</div>
-                    </div>
-                    <button class="btn-copy" onclick="copyToClipboard('타이틀: ${title}\\n본문: ${body}')">
-                        📋 복사
-                    </button>
-                `;
-            } else {
-                // 파싱 실패 시 기존 방식
-                const copyText = copy.message || copy;
-                div.innerHTML = `
-                    <span class="copy-text">${index + 1}. ${copyText}</span>
-                    <button class="btn-copy" onclick="copyToClipboard('${copyText.replace(/'/g, "\\'")}')">
-                        📋 복사
-                    </button>
-                `;
-            }
         } else {
-            // RCS인 경우 버튼과 메시지 분리 표시
-            const button = copy.button || '';
-            const message = (copy.message || copy).replace(/\\n/g, '\n'); // 줄바꿈 변환
-            
-            const messageHtml = message.replace(/\n/g, '<br>'); // HTML 줄바꿈으로 변환
-            
+            // 파싱 실패 시 기존 방식
+            const copyText = copy.message || copy;
             div.innerHTML = `
-                <div class="rcs-copy">
-                    <div class="rcs-button">${index + 1}. <strong>버튼:</strong> ${button}</div>
-                    <div class="rcs-message"><strong>메시지:</strong><br>${messageHtml}</div>
-                </div>
-                <button class="btn-copy" onclick="copyToClipboard('버튼: ${button}\\n메시지: ${message.replace(/\n/g, '\\n')}')">
+                <span class="copy-text">${index + 1}. ${copyText}</span>
+                <button class="btn-copy" onclick="copyToClipboard('${copyText.replace(/'/g, "\\'")}')">
                     📋 복사
                 </button>
             `;
         }
+    } else {
+        // RCS인 경우 버튼과 메시지 분리 표시
+        const button = copy.button || '';
+        const message = (copy.message || copy).replace(/\\n/g, '\n'); // 줄바꿈 변환
         
-        resultsDiv.appendChild(div);
-    });
+        const messageHtml = message.replace(/\n/g, '<br>'); // HTML 줄바꿈으로 변환
+        
+        div.innerHTML = `
+            <div class="rcs-copy">
+                <div class="rcs-button">${index + 1}. <strong>버튼:</strong> ${button}</div>
+                <div class="rcs-message"><strong>메시지:</strong><br>${messageHtml}</div>
+            </div>
+            <button class="btn-copy" onclick="copyToClipboard('버튼: ${button}\\n메시지: ${message.replace(/\n/g, '\\n')}')">
+                📋 복사
+            </button>
+        `;
+    }
+    
+    return div;
 }
 
 // 클립보드 복사 함수